@@ -0,0 +1,320 @@
+"""
+Quantization Benchmark for PlanetPulse
+
+Compares AIService with fp32 models against the same models with dynamic int8
+quantization (AI_QUANTIZE=int8) on a fixed corpus. Each mode runs in a fresh
+interpreter and reports model load time, analysis time, resident memory and
+serialized model size; the parent then reports the speedup and how closely
+the int8 outputs agree with fp32 (sentiment labels, topics and summaries).
+Exits with status 1 if agreement falls below the minimums.
+
+By default it builds small random-weight models (BART summarizer, BERT
+sentiment, NLI and sentence encoder) with a tokenizer trained on the corpus,
+so it runs offline. Their outputs are meaningless, but they measure how much
+quantization perturbs the numbers. The default hidden size of 768 matches
+BERT/BART-base; at 256 quantization brings no speedup.
+Pass --models with a directory holding summarizer/, sentiment/, zero_shot/ and
+encoder/ model folders to measure real models instead.
+
+Usage:
+    python benchmarks/quantization_benchmark.py [--models DIR] [--hidden-size 768]
+                                                [--repeats 3] [--min-agreement 0.8]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+# Fixed evaluation corpus of (title, text) pairs
+CORPUS = [
+    ("Central bank holds interest rates steady",
+     "The central bank kept its benchmark interest rate unchanged on Thursday. Officials said inflation had "
+     "eased but remained above target. Markets had widely expected the decision, and shares rose slightly "
+     "after the announcement. Economists now expect the first cut early next year."),
+    ("Team wins the championship final",
+     "The home team won the championship final after a dramatic penalty shootout. Fans celebrated in the "
+     "streets late into the night. The coach praised the players for their resilience after they came back "
+     "from two goals down. It is the club's first title in twelve years."),
+    ("New smartphone launched with longer battery life",
+     "The technology company launched its latest smartphone at an event on Tuesday. The device has a larger "
+     "battery, a faster processor and an improved camera. Analysts said the price increase could slow sales. "
+     "Pre-orders open next week in most markets."),
+    ("Floods force thousands from their homes",
+     "Heavy rain caused severe flooding across the region, forcing thousands of residents to leave their "
+     "homes. Rescue teams used boats to reach villages cut off by the water. Officials warned that more "
+     "storms are expected. Several roads and bridges were damaged."),
+    ("Researchers discover a new species of frog",
+     "Scientists have discovered a new species of frog in a remote rainforest. The tiny amphibian was found "
+     "during a survey of the area's wildlife. Researchers said the discovery shows how much remains unknown "
+     "about the forest. They called for stronger protection of the habitat."),
+    ("Parliament passes education reform bill",
+     "Parliament passed a bill that changes how schools are funded. The government said the reform would "
+     "give teachers more resources and reduce class sizes. The opposition criticised the plan as "
+     "underfunded. The law takes effect at the start of the next school year."),
+    ("Hospital trial shows promise for new treatment",
+     "A clinical trial at the city hospital found that a new treatment reduced symptoms in most patients. "
+     "Doctors said the results were encouraging but that larger studies are needed. The treatment could be "
+     "available within three years if approved by regulators."),
+    ("Film breaks box office records",
+     "The animated film broke opening weekend records at the box office. Critics praised its story and "
+     "music, and audiences gave it top ratings. The studio has already announced a sequel. The film opens "
+     "in more countries next month."),
+    ("Leaders meet at global climate summit",
+     "World leaders met at a summit to discuss climate change and carbon emissions. Several countries "
+     "announced new targets for renewable energy. Activists said the pledges did not go far enough. The "
+     "talks will continue next year."),
+    ("Company cuts jobs as profits fall",
+     "The manufacturer announced it will cut two thousand jobs after profits fell for the third quarter in "
+     "a row. Executives blamed weak demand and higher costs. Unions said they would protest the layoffs. "
+     "Shares dropped sharply on the news."),
+]
+
+# Model folders inside --models, and the environment variable that points AIService at each
+MODEL_ENV = {
+    'summarizer': 'AI_SUMMARIZER_MODEL',
+    'sentiment': 'AI_SENTIMENT_MODEL',
+    'zero_shot': 'AI_ZERO_SHOT_MODEL',
+    'encoder': 'AI_TOPIC_MODEL'
+}
+
+def build_tiny_models(model_dir, hidden_size):
+    """Create small random-weight models and a corpus tokenizer in model_dir."""
+    import torch
+    from tokenizers import Tokenizer, models, normalizers, pre_tokenizers, trainers
+    from transformers import (
+        BartConfig, BartForConditionalGeneration, BertConfig, BertForSequenceClassification, BertModel,
+        PreTrainedTokenizerFast
+    )
+    from flask_app.ai_service import AIService
+    from flask_app.topic_classifier import TOPIC_DESCRIPTIONS
+
+    torch.manual_seed(0)
+
+    # Word-level vocabulary over everything the models will see
+    special_tokens = ['<s>', '<pad>', '</s>', '<unk>', '<mask>']
+    texts = [f"{title} {text}" for title, text in CORPUS]
+    texts += AIService.CANDIDATE_TOPICS + [phrase for phrases in TOPIC_DESCRIPTIONS.values() for phrase in phrases]
+    texts.append("This example is")
+    word_tokenizer = Tokenizer(models.WordLevel(unk_token='<unk>'))
+    word_tokenizer.normalizer = normalizers.Lowercase()
+    word_tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    word_tokenizer.train_from_iterator(texts, trainers.WordLevelTrainer(special_tokens=special_tokens))
+    tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=word_tokenizer,
+        bos_token='<s>', pad_token='<pad>', eos_token='</s>', unk_token='<unk>', mask_token='<mask>',
+        cls_token='<s>', sep_token='</s>', model_max_length=512,
+        model_input_names=['input_ids', 'attention_mask']
+    )
+    vocab_size = tokenizer.vocab_size
+
+    bert = dict(
+        vocab_size=vocab_size, hidden_size=hidden_size, num_hidden_layers=2, num_attention_heads=4,
+        intermediate_size=4 * hidden_size, max_position_embeddings=512, pad_token_id=1
+    )
+    built = {
+        'summarizer': BartForConditionalGeneration(BartConfig(
+            vocab_size=vocab_size, d_model=hidden_size, encoder_layers=2, decoder_layers=2,
+            encoder_attention_heads=4, decoder_attention_heads=4,
+            encoder_ffn_dim=4 * hidden_size, decoder_ffn_dim=4 * hidden_size, max_position_embeddings=512,
+            pad_token_id=1, bos_token_id=0, eos_token_id=2, decoder_start_token_id=2,
+            forced_bos_token_id=0, forced_eos_token_id=2
+        )),
+        'sentiment': BertForSequenceClassification(BertConfig(
+            id2label={0: 'NEGATIVE', 1: 'POSITIVE'}, label2id={'NEGATIVE': 0, 'POSITIVE': 1}, **bert
+        )),
+        'zero_shot': BertForSequenceClassification(BertConfig(
+            id2label={0: 'contradiction', 1: 'neutral', 2: 'entailment'},
+            label2id={'contradiction': 0, 'neutral': 1, 'entailment': 2}, **bert
+        )),
+        'encoder': BertModel(BertConfig(**bert))
+    }
+    for name, model in built.items():
+        model.save_pretrained(os.path.join(model_dir, name))
+        tokenizer.save_pretrained(os.path.join(model_dir, name))
+
+def current_rss_mb():
+    """Resident memory of this process in MB."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run_worker(args):
+    """Load the models in one mode, analyze the corpus and print the measurements as JSON."""
+    from flask_app.ai_service import AIService
+    from flask_app.utils.quantization import model_size_bytes
+    import torch  # noqa: F401  (load the libraries first so RSS counts only the models)
+    import transformers  # noqa: F401
+
+    rss_before = current_rss_mb()
+    service = AIService(batch_size=args.batch_size, inference_socket='', quantize=args.worker == 'int8')
+    service.topic_method = args.topics
+
+    # Load every model, including the topic method not in use, to measure them all
+    start = time.perf_counter()
+    for name in service.PIPELINE_TASKS:
+        service._get_pipeline(name)
+    service.topic_classifier._load()
+    load_time = time.perf_counter() - start
+
+    sizes = {name: model_size_bytes(pipe.model) for name, pipe in service._pipelines.items() if pipe}
+    if service.topic_classifier._model is not None:
+        sizes['topic_encoder'] = model_size_bytes(service.topic_classifier._model)
+    rss_loaded = current_rss_mb()
+
+    articles = [(f"{title} {text}", title) for title, text in CORPUS]
+    service.analyze_articles(articles[:2], tier='full')  # Warm up kernels and caches
+    times = []
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        results = service.analyze_articles(articles, tier='full')
+        times.append(time.perf_counter() - start)
+
+    print(json.dumps({
+        'loaded': {name: pipe is not None for name, pipe in service._pipelines.items()},
+        'load_time': load_time,
+        'analyze_time': statistics.median(times),
+        # Safetensors weights are memory-mapped and only become resident once touched
+        'rss_models_mb': rss_loaded - rss_before,
+        'rss_after_mb': current_rss_mb() - rss_before,
+        'model_bytes': sizes,
+        'results': results
+    }))
+    return 0
+
+def run_mode(args, mode, model_dir):
+    """Run one mode in a fresh interpreter so memory is measured in isolation."""
+    env = dict(
+        os.environ,
+        API_PROBE_ON_START='false',
+        AI_WARMUP='',
+        AI_TIER='full',
+        AI_INFERENCE_SOCKET='',
+        AI_PROCESS_WORKERS='0',
+        AI_SUMMARY_BYPASS_TOKENS='1',  # Summarize every text, however short
+        HF_HUB_OFFLINE='1',
+        TRANSFORMERS_OFFLINE='1'
+    )
+    env.pop('AI_QUANTIZE', None)
+    for folder, variable in MODEL_ENV.items():
+        env[variable] = os.path.join(model_dir, folder)
+    command = [
+        sys.executable, os.path.abspath(__file__), '--worker', mode, '--repeats', str(args.repeats),
+        '--batch-size', str(args.batch_size), '--topics', args.topics
+    ]
+    output = subprocess.run(command, cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    if output.returncode != 0:
+        raise RuntimeError(f"{mode} run failed:\n{output.stderr[-2000:]}")
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def token_f1(reference, candidate):
+    """Token overlap F1 between two texts."""
+    reference, candidate = reference.lower().split(), candidate.lower().split()
+    if not reference and not candidate:
+        return 1.0
+    remaining = list(reference)
+    common = 0
+    for token in candidate:
+        if token in remaining:
+            remaining.remove(token)
+            common += 1
+    if not common:
+        return 0.0
+    precision, recall = common / len(candidate), common / len(reference)
+    return 2 * precision * recall / (precision + recall)
+
+def agreement(reference, candidate):
+    """How closely int8 analyses match fp32 analyses."""
+    pairs = [(r, c) for r, c in zip(reference, candidate) if r and c]
+    if not pairs:
+        return {'sentiment': 0.0, 'topics': 0.0, 'summary_f1': 0.0, 'summary_exact': 0.0}
+
+    def jaccard(a, b):
+        a, b = set(a), set(b)
+        return len(a & b) / len(a | b) if a | b else 1.0
+
+    return {
+        'sentiment': statistics.mean(r['sentiment'].get('label') == c['sentiment'].get('label') for r, c in pairs),
+        'topics': statistics.mean(jaccard(r['topics'], c['topics']) for r, c in pairs),
+        'summary_f1': statistics.mean(token_f1(r['summary'], c['summary']) for r, c in pairs),
+        'summary_exact': statistics.mean(r['summary'] == c['summary'] for r, c in pairs)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare fp32 and int8 dynamic-quantized AI models')
+    parser.add_argument('--models', help='Directory with summarizer/, sentiment/, zero_shot/ and encoder/ models')
+    parser.add_argument('--hidden-size', type=int, default=768, help='Hidden size of the generated test models')
+    parser.add_argument('--repeats', type=int, default=3, help='Timed passes over the corpus per mode')
+    parser.add_argument('--batch-size', type=int, default=8, help='Articles per pipeline call')
+    parser.add_argument('--topics', choices=['embedding', 'zero-shot'], default='zero-shot',
+                        help='Topic classifier used for the analysis')
+    parser.add_argument('--min-agreement', type=float, default=0.8,
+                        help='Fail below this sentiment agreement or mean topic Jaccard')
+    parser.add_argument('--min-summary-f1', type=float, default=0.5, help='Fail below this mean summary token F1')
+    parser.add_argument('--worker', choices=['fp32', 'int8'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return run_worker(args)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        model_dir = args.models
+        if not model_dir:
+            model_dir = scratch
+            try:
+                build_tiny_models(model_dir, args.hidden_size)
+            except ImportError as e:
+                print(f"Building test models needs torch, transformers and tokenizers: {str(e)}")
+                return 1
+        fp32 = run_mode(args, 'fp32', model_dir)
+        int8 = run_mode(args, 'int8', model_dir)
+
+    if not all(fp32['loaded'].values()):
+        print(f"Some models failed to load: {fp32['loaded']}")
+        return 1
+    scores = agreement(fp32['results'], int8['results'])
+    size_fp32 = sum(fp32['model_bytes'].values()) / 2 ** 20
+    size_int8 = sum(int8['model_bytes'].values()) / 2 ** 20
+
+    print(f"Articles:             {len(CORPUS)} x {args.repeats} passes")
+    print(f"Analyze time:         fp32 {fp32['analyze_time']:.2f}s, int8 {int8['analyze_time']:.2f}s "
+          f"({fp32['analyze_time'] / int8['analyze_time']:.2f}x speedup)")
+    print(f"Load time:            fp32 {fp32['load_time']:.2f}s, int8 {int8['load_time']:.2f}s")
+    print(f"RSS after loading:    fp32 {fp32['rss_models_mb']:.0f} MB, int8 {int8['rss_models_mb']:.0f} MB")
+    print(f"RSS after analysis:   fp32 {fp32['rss_after_mb']:.0f} MB, int8 {int8['rss_after_mb']:.0f} MB")
+    print(f"Model weights:        fp32 {size_fp32:.1f} MB, int8 {size_int8:.1f} MB")
+    for name in sorted(fp32['model_bytes']):
+        print(f"  {name:<22} {fp32['model_bytes'][name] / 2 ** 20:8.1f} MB -> "
+              f"{int8['model_bytes'].get(name, 0) / 2 ** 20:.1f} MB")
+    print(f"Sentiment agreement:  {scores['sentiment']:.3f}")
+    print(f"Topic Jaccard:        {scores['topics']:.3f}")
+    print(f"Summary token F1:     {scores['summary_f1']:.3f} (exact match {scores['summary_exact']:.3f})")
+
+    failures = []
+    if scores['sentiment'] < args.min_agreement:
+        failures.append('sentiment labels diverge')
+    if scores['topics'] < args.min_agreement:
+        failures.append('topics diverge')
+    if scores['summary_f1'] < args.min_summary_f1:
+        failures.append('summaries diverge')
+    if failures:
+        print(f"FAIL: {'; '.join(failures)}")
+        return 1
+    print("OK")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
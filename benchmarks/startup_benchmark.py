@@ -0,0 +1,90 @@
+"""
+Startup Benchmark for PlanetPulse
+
+Measures how long a fresh interpreter takes to import flask_app and to build
+the app with create_app(), and checks that heavy libraries (transformers,
+textblob, numpy, ...) are not imported at startup. Exits with status 1 if the
+median time exceeds the budget or a heavy library was imported, so it can
+guard against startup regressions in CI.
+
+Usage:
+    python benchmarks/startup_benchmark.py [--runs 5] [--import-budget 1.5] [--app-budget 2.5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries that must only load on first use
+HEAVY_MODULES = ['transformers', 'torch', 'textblob', 'nltk', 'sklearn', 'scipy', 'numpy', 'spacy']
+
+# Runs in a fresh interpreter and prints its timings as JSON
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import flask_app
+imported = time.perf_counter()
+flask_app.scheduler.start = lambda: None  # Don't start background jobs
+flask_app.create_app()
+created = time.perf_counter()
+print(json.dumps({
+    'import': imported - start,
+    'create_app': created - imported,
+    'heavy': [name for name in %r if name in sys.modules]
+}))
+""" % (HEAVY_MODULES,)
+
+def run_once():
+    """Time one interpreter start, without network access or shared state."""
+    env = dict(
+        os.environ,
+        API_PROBE_ON_START='false',
+        AI_WARMUP='',
+        CACHE_BACKEND='simple',
+        DATABASE_URL='sqlite://',
+        NEWSDATA_API_KEY=os.getenv('NEWSDATA_API_KEY', 'benchmark')
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark flask_app startup time')
+    parser.add_argument('--runs', type=int, default=5, help='Number of fresh interpreters to time')
+    parser.add_argument('--import-budget', type=float, default=float(os.getenv('STARTUP_IMPORT_BUDGET', 1.5)),
+                        help='Maximum median seconds to import flask_app')
+    parser.add_argument('--app-budget', type=float, default=float(os.getenv('STARTUP_APP_BUDGET', 2.5)),
+                        help='Maximum median seconds to import flask_app and call create_app()')
+    args = parser.parse_args()
+
+    results = [run_once() for _ in range(args.runs)]
+    import_time = statistics.median(result['import'] for result in results)
+    app_time = statistics.median(result['import'] + result['create_app'] for result in results)
+    heavy = sorted({name for result in results for name in result['heavy']})
+
+    print(f"import flask_app:        median {import_time:.3f}s (budget {args.import_budget:.2f}s)")
+    print(f"import + create_app():   median {app_time:.3f}s (budget {args.app_budget:.2f}s)")
+    print(f"heavy modules at import: {', '.join(heavy) or 'none'}")
+
+    failures = []
+    if import_time > args.import_budget:
+        failures.append('import time over budget')
+    if app_time > args.app_budget:
+        failures.append('startup time over budget')
+    if heavy:
+        failures.append('heavy modules imported at startup')
+    if failures:
+        print(f"FAIL: {'; '.join(failures)}")
+        return 1
+    print("OK")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
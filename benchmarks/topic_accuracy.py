@@ -0,0 +1,130 @@
+"""
+Topic Classifier Accuracy Harness for PlanetPulse
+
+Compares the embedding topic classifier against the zero-shot NLI classifier
+it replaces, using the zero-shot topics as the reference labels. Reports
+micro precision/recall/F1, per-topic F1, top-1 agreement and the time each
+classifier took. Exits with status 1 if micro F1 is below --min-f1.
+
+Articles come from the app database (the articles table) or a JSON file
+holding a list of {"title": ..., "description": ...} objects.
+
+Usage:
+    python benchmarks/topic_accuracy.py [--db instance/planetpulse.db | --json articles.json]
+                                        [--limit 200] [--min-f1 0.6]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+def load_articles(args):
+    """Load (text, title) pairs from a JSON file or the SQLite database."""
+    if args.json:
+        with open(args.json) as f:
+            rows = [(item.get('title') or '', item.get('description') or '') for item in json.load(f)]
+    else:
+        with sqlite3.connect(args.db) as conn:
+            rows = conn.execute(
+                'SELECT title, description FROM articles WHERE description IS NOT NULL '
+                'ORDER BY id DESC LIMIT ?', (args.limit,)
+            ).fetchall()
+    # Same text the enrichment pipeline analyzes
+    return [(f"{title} {description}", title) for title, description in rows[:args.limit]]
+
+def compare(reference, predicted, topics):
+    """Score predicted topic lists against reference topic lists."""
+    true_positives = false_positives = false_negatives = 0
+    per_topic = {topic: [0, 0, 0] for topic in topics}  # tp, fp, fn
+    top1_agree = 0
+    for ref, pred in zip(reference, predicted):
+        ref, pred_set = set(ref), set(pred)
+        true_positives += len(ref & pred_set)
+        false_positives += len(pred_set - ref)
+        false_negatives += len(ref - pred_set)
+        for topic in topics:
+            per_topic[topic][0] += topic in ref and topic in pred_set
+            per_topic[topic][1] += topic not in ref and topic in pred_set
+            per_topic[topic][2] += topic in ref and topic not in pred_set
+        # The embedding classifier's best topic is one the reference also chose
+        if (pred and pred[0] in ref) or (not pred and not ref):
+            top1_agree += 1
+
+    def f1(tp, fp, fn):
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+        return precision, recall, (2 * precision * recall / (precision + recall) if precision + recall else 0.0)
+
+    precision, recall, micro_f1 = f1(true_positives, false_positives, false_negatives)
+    return {
+        'precision': precision,
+        'recall': recall,
+        'micro_f1': micro_f1,
+        'top1_agreement': top1_agree / len(reference) if reference else 0.0,
+        'per_topic_f1': {topic: f1(*counts)[2] for topic, counts in per_topic.items() if any(counts)}
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare embedding topics against zero-shot topics')
+    parser.add_argument('--db', default=os.path.join(REPO_ROOT, 'instance', 'planetpulse.db'),
+                        help='SQLite database with an articles table')
+    parser.add_argument('--json', help='JSON file of articles to use instead of the database')
+    parser.add_argument('--limit', type=int, default=200, help='Maximum number of articles')
+    parser.add_argument('--batch-size', type=int, default=8, help='Articles per classifier call')
+    parser.add_argument('--min-f1', type=float, default=0.6, help='Fail below this micro F1')
+    args = parser.parse_args()
+
+    from flask_app.ai_service import AIService
+
+    articles = load_articles(args)
+    if not articles:
+        print("No articles to evaluate")
+        return 1
+    texts = [text for text, _ in articles]
+    titles = [title for _, title in articles]
+
+    # Reference: the zero-shot classifier
+    service = AIService(batch_size=args.batch_size)
+    service.topic_method = 'zero-shot'
+    if not service.zero_shot_classifier:
+        print("Zero-shot classifier unavailable; install transformers to run this harness")
+        return 1
+    start = time.perf_counter()
+    reference = service._extract_topics_batch(texts, titles, args.batch_size)
+    zero_shot_time = time.perf_counter() - start
+
+    # Candidate: the embedding classifier (centroids are encoded before timing)
+    classifier = service.topic_classifier
+    if not classifier.available:
+        print("Embedding topic encoder unavailable")
+        return 1
+    combined = [f"{title} {text}" for text, title in zip(texts, titles)]
+    start = time.perf_counter()
+    predicted = classifier.classify_batch(combined, batch_size=args.batch_size)
+    embedding_time = time.perf_counter() - start
+
+    results = compare(reference, predicted, service.CANDIDATE_TOPICS)
+    print(f"Articles:            {len(articles)}")
+    print(f"Zero-shot time:      {zero_shot_time:.2f}s ({zero_shot_time / len(articles) * 1000:.1f} ms/article)")
+    print(f"Embedding time:      {embedding_time:.2f}s ({embedding_time / len(articles) * 1000:.1f} ms/article)")
+    print(f"Speedup:             {zero_shot_time / embedding_time if embedding_time else float('inf'):.1f}x")
+    print(f"Precision / recall:  {results['precision']:.3f} / {results['recall']:.3f}")
+    print(f"Micro F1:            {results['micro_f1']:.3f} (minimum {args.min_f1:.2f})")
+    print(f"Top-1 agreement:     {results['top1_agreement']:.3f}")
+    for topic, score in sorted(results['per_topic_f1'].items()):
+        print(f"  {topic:<14} F1 {score:.3f}")
+
+    if results['micro_f1'] < args.min_f1:
+        print("FAIL: embedding topics diverge too far from zero-shot topics")
+        return 1
+    print("OK")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,24 +1,87 @@
 from flask import Flask, session
+import click
 from flask_caching import Cache
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from dotenv import load_dotenv
 import os
+import sys
+import threading
 import pytz
+from datetime import datetime
 from .news_service import NewsService
+from .quota_manager import REFRESH
 from .facts_service import FactsService
 from .auth import login_manager
 from .models import db
 from .sitemap import sitemap
+from .utils.single_flight import SingleFlight
+from .utils.leader import LeaderElection
+from .utils.feed_cache import FeedCache
+from .utils.page_cache import PageCache
+from .utils.server_session import ServerSessionInterface
 
 load_dotenv()
 
+def _cache_config():
+    """
+    Choose the cache backend shared by all workers.
+    
+    Uses Redis when CACHE_REDIS_URL is set, otherwise an SQLite file under
+    flask_cache/ that every worker on the host can read. CACHE_BACKEND=simple
+    restores the old per-process SimpleCache.
+    """
+    config = {
+        'CACHE_DEFAULT_TIMEOUT': 300,
+        'CACHE_THRESHOLD': 1000
+    }
+    if os.getenv('CACHE_REDIS_URL'):
+        config.update(CACHE_TYPE='RedisCache', CACHE_REDIS_URL=os.getenv('CACHE_REDIS_URL'))
+    elif os.getenv('CACHE_BACKEND', 'sqlite').lower() == 'simple':
+        config.update(CACHE_TYPE='SimpleCache')
+    else:
+        config.update(CACHE_TYPE='flask_app.utils.sqlite_cache.SQLiteCache', CACHE_DIR=CACHE_DIR)
+    return config
+
+def _session_store():
+    """
+    Choose where server-side sessions live.
+    
+    Follows the cache backend choice, but keeps sessions out of the feed cache so
+    a burst of visitors cannot evict cached feeds.
+    """
+    if os.getenv('CACHE_REDIS_URL'):
+        import redis
+        from flask_caching.backends import RedisCache
+        return RedisCache(host=redis.from_url(os.getenv('CACHE_REDIS_URL')), key_prefix='planetpulse:')
+    if os.getenv('CACHE_BACKEND', 'sqlite').lower() == 'simple':
+        from flask_caching.backends import SimpleCache
+        return SimpleCache(threshold=int(os.getenv('SESSION_STORE_THRESHOLD', 50000)))
+    from .utils.sqlite_cache import SQLiteCache
+    return SQLiteCache(
+        os.path.join(CACHE_DIR, 'sessions.sqlite3'),
+        threshold=int(os.getenv('SESSION_STORE_THRESHOLD', 50000))
+    )
+
+def _is_cli_command():
+    """Whether the app is being created for a flask CLI command other than the dev server."""
+    # Flask sets this for every `flask ...` invocation, including `flask run`
+    return os.getenv('FLASK_RUN_FROM_CLI') == 'true' and 'run' not in sys.argv[1:]
+
+# Directory for the shared cache and cross-worker lock files
+CACHE_DIR = os.getenv('CACHE_DIR', os.path.join(os.path.dirname(os.path.dirname(__file__)), 'flask_cache'))
+
 # Configure cache with more reliable settings
-cache = Cache(config={
-    'CACHE_TYPE': 'SimpleCache',
-    'CACHE_DEFAULT_TIMEOUT': 300,
-    'CACHE_THRESHOLD': 1000
-})
+cache = Cache(config=_cache_config())
+
+# Serve stale feeds while one background refresh replaces them
+feed_cache = FeedCache(cache)
+
+# Coalesce concurrent upstream fetches for the same feed across threads and workers
+single_flight = SingleFlight(lock_dir=os.path.join(CACHE_DIR, 'locks'))
+
+# Load-more pages are shared by feed and page token, since every visitor follows the same tokens
+page_cache = PageCache(cache, single_flight)
 
 # Initialize scheduler with pytz timezone
 scheduler = BackgroundScheduler(timezone=pytz.UTC)
@@ -33,6 +96,9 @@ def create_app():
     app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///planetpulse.db')
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     
+    # Keep pagination state server-side; the cookie only carries a session id
+    app.session_interface = ServerSessionInterface(_session_store(), ttl=int(os.getenv('SESSION_TTL', 86400)))
+    
     # Initialize extensions with app context
     db.init_app(app)
     cache.init_app(app)
@@ -40,35 +106,102 @@ def create_app():
     
     # Create database tables
     with app.app_context():
+        # Share API credit budgets between workers
+        news_service.quota.store = cache.cache
         db.create_all()
+        news_service.enrichment_cache.ensure_schema()
+        # Full-text index for answering searches from ingested articles
+        news_service.article_store.search_index.ensure()
+    
+    # Check the API keys without delaying startup: one worker per host (or per
+    # deploy with Redis) probes, and CLI commands never do
+    if os.getenv('API_PROBE_ON_START', 'true').lower() in ('1', 'true', 'yes') and not _is_cli_command():
+        with app.app_context():
+            claimed = cache.add('api_probe', True, timeout=int(os.getenv('API_PROBE_INTERVAL', 3600)))
+        if claimed:
+            def probe_api_key():
+                with app.app_context():
+                    # Shared so every worker's /api/quota reports the result
+                    cache.set('api_status', news_service.probe_api_key(), timeout=0)
+            threading.Thread(target=probe_api_key, name='api-probe', daemon=True).start()
+    
+    # Optionally pay the model loading cost at startup instead of on first use
+    if os.getenv('AI_WARMUP', '').lower() in ('1', 'true', 'yes'):
+        news_service.ai_service.warmup()
     
     # Register blueprints
-    from .routes import main
+    from .routes import main, VALID_CATEGORIES
     app.register_blueprint(main)
     app.register_blueprint(sitemap)
     
+    # Cached feeds that background enrichment results are written back to
+    feed_cache_keys = ['global_news', 'indian_news'] + [f'category_{category}' for category in VALID_CATEGORIES]
+    
+    def write_back_enrichments(finished):
+        enrichments_by_url = {article.get('link'): enrichment for article, enrichment in finished}
+        for key in feed_cache_keys:
+            articles = feed_cache.get(key)
+            if articles and news_service.apply_enrichments(articles, enrichments_by_url):
+                feed_cache.set(key, articles)
+    
+    # Start background AI enrichment so pages never wait on model inference
+    news_service.enrichment_queue.add_listener(write_back_enrichments)
+    news_service.enrichment_queue.init_app(app)
+    
+    # Only one process per host runs the refresh jobs; the others read the shared cache
+    leader = LeaderElection(os.path.join(app.instance_path, 'scheduler.lock'))
+    
     # Schedule background tasks
     def update_news_cache():
+        if not leader.is_leader:
+            return
         with app.app_context():
             try:
+                # Fetch the front page feeds and every category concurrently
+                feeds = news_service.global_and_local_feeds()
+                # Update category caches - categories that work with NewsData.io
+                CATEGORIES = ['business', 'entertainment', 'health', 'science', 'sports', 'technology']
+                for category in CATEGORIES:
+                    feeds[f'category_{category}'] = news_service.headline_params(category=category)
+                
+                front_page = {}
+                ingested = {}
+                next_pages = {}
+                # Scheduled refreshes are not user-facing, so enrich inline
+                for key, articles, next_page in news_service.fetch_feeds(feeds, defer=False, priority=REFRESH):
+                    if key.startswith('category_'):
+                        # An empty result (API error or shed request) keeps the stale feed
+                        if articles:
+                            feed_cache.set_group(key, {key: articles, f'{key}_next_page': next_page})
+                        ingested[key[len('category_'):]] = articles
+                        next_pages[key[len('category_'):]] = next_page
+                    else:
+                        front_page[key] = (articles, next_page)
+                
                 # Update global and local news cache
-                news = news_service.get_global_and_local_news()
+                news = news_service.combine_global_and_local_news(front_page['global_news'], front_page['indian_news'])
                 global_news = news['global_news']
                 indian_news = news['indian_news']
                 global_next_page = news['global_next']
                 indian_next_page = news['indian_next']
                 
-                cache.set('global_news', global_news, timeout=1800)  # 30 minutes
-                cache.set('indian_news', indian_news, timeout=1800)
-                cache.set('global_next_page', global_next_page, timeout=1800)
-                cache.set('indian_next_page', indian_next_page, timeout=1800)
+                if global_news and indian_news:
+                    feed_cache.set_group('front_page', {
+                        'global_news': global_news,
+                        'indian_news': indian_news,
+                        'global_next_page': global_next_page,
+                        'indian_next_page': indian_next_page
+                    })
                 
-                # Update category caches - categories that work with NewsData.io
-                CATEGORIES = ['business', 'entertainment', 'health', 'science', 'sports', 'technology']
-                for category in CATEGORIES:
-                    category_news, next_page = news_service.get_headlines(category=category)
-                    cache.set(f'category_{category}', category_news, timeout=1800)
-                    cache.set(f'category_{category}_next_page', next_page, timeout=1800)
+                # Persist everything fetched in this refresh in one transaction
+                ingested['global'] = global_news
+                ingested['indian'] = indian_news
+                next_pages['global'] = global_next_page
+                next_pages['indian'] = indian_next_page
+                news_service.article_store.save_feeds(ingested, next_pages)
+                
+                # Cache counters are per process; log this worker's after each refresh
+                app.logger.info(f"Cache stats: {news_service.cache_stats()}")
                 
                 # Update daily fact
                 fact = facts_service.get_daily_fact()
@@ -76,6 +209,12 @@ def create_app():
             except Exception as e:
                 print(f"Error updating cache: {str(e)}")
     
+    def elect_leader():
+        # Take over if no live process holds the lease, e.g. after the leader died
+        if leader.try_acquire() and not feed_cache.is_fresh('front_page'):
+            # A new leader with a cold or stale cache refreshes straight away
+            scheduler.modify_job('update_news_cache', next_run_time=datetime.now(pytz.UTC))
+    
     # Add the job to the scheduler
     scheduler.add_job(
         func=update_news_cache,
@@ -84,6 +223,25 @@ def create_app():
         name='Update news cache every 30 minutes',
         replace_existing=True
     )
+    scheduler.add_job(
+        func=elect_leader,
+        trigger=IntervalTrigger(seconds=int(os.getenv('LEADER_ELECTION_INTERVAL', 30))),
+        id='elect_leader',
+        name='Elect the process that runs refresh jobs',
+        next_run_time=datetime.now(pytz.UTC),
+        replace_existing=True
+    )
+    
+    @app.cli.command('enrich-backfill')
+    @click.option('--limit', type=int, default=None, help='Maximum number of stored articles to check')
+    @click.option('--batch-size', type=int, default=200, help='Articles per enrichment round')
+    def enrich_backfill(limit, batch_size):
+        """Enrich stored articles that have no AI enrichment yet."""
+        try:
+            enriched = news_service.backfill_enrichments(limit=limit, batch_size=batch_size)
+            click.echo(f"Enriched {enriched} articles")
+        finally:
+            news_service.enrichment_executor.shutdown()
     
     # Start the scheduler
     scheduler.start()
@@ -6,11 +6,15 @@ It utilizes the Hugging Face Transformers library for advanced text processing t
 """
 
 import logging
-from transformers import pipeline  # Hugging Face's pipeline for easy model loading
-import numpy as np  # Numerical computing library
-from textblob import TextBlob  # Simple NLP library for text processing
+import os
+import threading  # Locks guarding lazy model loading
 from collections import Counter  # For counting occurrences of elements
 import re  # Regular expressions for text pattern matching
+from .fast_analyzers import FastAnalyzer  # CPU-cheap tier without model downloads
+from .topic_classifier import EmbeddingTopicClassifier  # One encoder pass per article for topics
+from .summarization import MapReduceSummarizer  # Short-text bypass and batched map-reduce summaries
+from .inference_server import InferenceClient  # Client for the per-host inference sidecar
+from .utils.quantization import quantization_enabled, quantize_model  # Optional int8 models
 
 # Configure logging to track errors and operations
 logger = logging.getLogger(__name__)
@@ -25,26 +29,139 @@ class AIService:
     - Topic classification
     """
     
-    def __init__(self):
+    # Topics used by zero-shot classification
+    CANDIDATE_TOPICS = [
+        "politics", "business", "technology", "sports", "entertainment",
+        "health", "science", "education", "environment", "world"
+    ]
+
+    # Analysis tiers: transformer pipelines, or the fast numpy/scikit-learn analyzers
+    TIERS = ('full', 'fast')
+
+    # Hugging Face pipeline task for each lazily loaded model
+    PIPELINE_TASKS = {
+        'summarizer': 'summarization',
+        'sentiment_analyzer': 'sentiment-analysis',
+        'zero_shot_classifier': 'zero-shot-classification'
+    }
+
+    # Environment variables that override each pipeline's default model
+    PIPELINE_MODEL_ENV = {
+        'summarizer': 'AI_SUMMARIZER_MODEL',
+        'sentiment_analyzer': 'AI_SENTIMENT_MODEL',
+        'zero_shot_classifier': 'AI_ZERO_SHOT_MODEL'
+    }
+
+    def __init__(self, batch_size=None, inference_socket=None, quantize=None):
         """
-        Initialize AI models using Hugging Face's pipeline.
+        Set up the AI service without loading any models.
         
-        The pipeline() function automatically downloads and loads pre-trained models:
+        Each Hugging Face pipeline is loaded on first use (or by warmup()):
         - summarizer: For generating article summaries
         - sentiment_analyzer: For analyzing text sentiment
         - zero_shot_classifier: For topic classification without training
+        
+        Args:
+            batch_size (int): Number of texts sent to a pipeline in one call by
+                analyze_articles(). Defaults to the AI_BATCH_SIZE environment
+                variable, or 8.
+            inference_socket (str): Unix socket of an inference server to
+                send full-tier analysis to instead of loading models in this
+                process. Defaults to AI_INFERENCE_SOCKET; an empty string
+                disables client mode.
+            quantize (bool): Apply dynamic int8 quantization to every model
+                at load time. Defaults to AI_QUANTIZE ("int8" to enable).
+        
+        The analysis tier comes from AI_TIER: "full", "fast", or "auto" (the
+        default), which uses the fast tier while the load average per CPU is
+        above AI_FAST_TIER_LOAD (default 1.0).
+        
+        In the full tier, topics come from zero-shot classification unless
+        AI_TOPIC_CLASSIFIER is "embedding"; zero-shot classification is also
+        the fallback when the encoder cannot be loaded. The embedding
+        classifier stays opt-in until benchmarks/topic_accuracy.py has
+        measured its agreement with zero-shot topics on our articles.
+        
+        Texts shorter than AI_SUMMARY_BYPASS_TOKENS are not summarized.
         """
-        try:
-            # Initialize transformers pipeline for each task
-            self.summarizer = pipeline("summarization")
-            self.sentiment_analyzer = pipeline("sentiment-analysis")
-            self.zero_shot_classifier = pipeline("zero-shot-classification")
-        except Exception as e:
-            logger.error(f"Error initializing AI models: {str(e)}")
-            # Fallback initialization if models fail to load
-            self.summarizer = None
-            self.sentiment_analyzer = None
-            self.zero_shot_classifier = None
+        self.batch_size = batch_size or int(os.getenv('AI_BATCH_SIZE', 8))
+        self.tier = os.getenv('AI_TIER', 'auto').lower()
+        self.fast_tier_load = float(os.getenv('AI_FAST_TIER_LOAD', 1.0))
+        self.fast = FastAnalyzer()
+        self.topic_method = os.getenv('AI_TOPIC_CLASSIFIER', 'zero-shot').lower()
+        self.quantize = quantization_enabled() if quantize is None else quantize
+        self.topic_classifier = EmbeddingTopicClassifier(self.CANDIDATE_TOPICS, quantize=self.quantize)
+        self.summarization = MapReduceSummarizer()
+        if inference_socket is None:
+            inference_socket = os.getenv('AI_INFERENCE_SOCKET', '')
+        self.client = InferenceClient(inference_socket) if inference_socket else None
+        self._pipelines = {}
+        self._load_locks = {name: threading.Lock() for name in self.PIPELINE_TASKS}
+
+    @property
+    def summarizer(self):
+        return self._get_pipeline('summarizer')
+
+    @property
+    def sentiment_analyzer(self):
+        return self._get_pipeline('sentiment_analyzer')
+
+    @property
+    def zero_shot_classifier(self):
+        return self._get_pipeline('zero_shot_classifier')
+
+    def _get_pipeline(self, name):
+        """
+        Return a pipeline, loading it on first use.
+        
+        Loading is guarded by a per-pipeline lock so concurrent callers load each
+        model only once. A model that fails to load is remembered as None so
+        callers use their fallbacks instead of retrying on every call.
+        
+        Args:
+            name (str): Pipeline name, a key of PIPELINE_TASKS
+            
+        Returns:
+            Pipeline: The loaded pipeline, or None if it could not be loaded
+        """
+        if name in self._pipelines:
+            return self._pipelines[name]
+        
+        with self._load_locks[name]:
+            # Another thread may have loaded it while we waited
+            if name not in self._pipelines:
+                try:
+                    from transformers import pipeline  # Hugging Face's pipeline for easy model loading
+                    logger.info(f"Loading {self.PIPELINE_TASKS[name]} model")
+                    loaded = pipeline(self.PIPELINE_TASKS[name], model=os.getenv(self.PIPELINE_MODEL_ENV[name]) or None)
+                    if self.quantize:
+                        loaded.model = quantize_model(loaded.model)
+                    self._pipelines[name] = loaded
+                except Exception as e:
+                    logger.error(f"Error initializing AI model {name}: {str(e)}")
+                    # Fallback if the model fails to load
+                    self._pipelines[name] = None
+        return self._pipelines[name]
+
+    def warmup(self):
+        """
+        Load every model now instead of on first use.
+        
+        Returns:
+            dict: Mapping of pipeline name to whether it loaded successfully
+        """
+        if self.client:
+            # The models live in the inference server
+            return {'inference_server': self.client.ping()}
+        loaded = {}
+        if self.topic_method == 'embedding':
+            loaded['topic_classifier'] = self.topic_classifier.available
+        for name in self.PIPELINE_TASKS:
+            # The zero-shot model is only needed without the embedding classifier
+            if name == 'zero_shot_classifier' and loaded.get('topic_classifier'):
+                continue
+            loaded[name] = self._get_pipeline(name) is not None
+        return loaded
 
     def analyze_article(self, article_text, article_title):
         """
@@ -60,7 +177,10 @@ class AIService:
                 - topics: Identified topics
                 - sentiment: Sentiment analysis results
                 - tags: Generated tags
+                - tier: "full", the analysis tier that produced the result
         """
+        if self.client:
+            return self.analyze_articles([(article_text, article_title)])[0]
         try:
             # Generate summary using the summarization model
             summary = self._generate_summary(article_text)
@@ -78,12 +198,123 @@ class AIService:
                 'summary': summary,
                 'topics': topics,
                 'sentiment': sentiment,
-                'tags': tags
+                'tags': tags,
+                'tier': 'full'
             }
         except Exception as e:
             logger.error(f"Error analyzing article: {str(e)}")
             return None
 
+    def choose_tier(self, tier=None):
+        """
+        Decide which analysis tier to use.
+        
+        Args:
+            tier (str): "full", "fast" or "auto"; defaults to AI_TIER
+            
+        Returns:
+            str: "full" or "fast"
+        """
+        tier = (tier or self.tier).lower()
+        if tier in self.TIERS:
+            return tier
+        
+        # Auto: fall back to the fast tier when every model failed to load...
+        if self._pipelines and not any(self._pipelines.values()):
+            return 'fast'
+        # ...or while the machine is busy
+        try:
+            load = os.getloadavg()[0] / (os.cpu_count() or 1)
+        except (AttributeError, OSError):
+            return 'full'
+        return 'fast' if load > self.fast_tier_load else 'full'
+
+    def analyze_articles(self, articles, batch_size=None, tier=None):
+        """
+        Analyze a batch of articles, running each pipeline once per batch.
+        
+        Texts are grouped into buckets of similar length before being handed to
+        the pipelines, so padding inside a batch stays small.
+        
+        Args:
+            articles (list): List of (article_text, article_title) tuples
+            batch_size (int): Maximum number of texts per pipeline call
+            tier (str): "full", "fast" or "auto" (see choose_tier)
+            
+        Returns:
+            list: Analysis dictionaries (see analyze_article), in input order
+        """
+        if not articles:
+            return []
+        
+        batch_size = batch_size or self.batch_size
+        texts = [text for text, _ in articles]
+        titles = [title for _, title in articles]
+        
+        if self.choose_tier(tier) == 'fast':
+            logger.info(f"Analyzing {len(articles)} articles with the fast tier")
+            return self.fast.analyze_batch(texts, titles)
+        
+        if self.client:
+            try:
+                return self.client.analyze(articles, tier='full')
+            except Exception as e:
+                # Never load the models per worker; degrade until the server is back
+                logger.error(f"Inference server unavailable, using the fast tier: {str(e)}")
+                return self.fast.analyze_batch(texts, titles)
+        
+        try:
+            summaries = self._generate_summaries(texts, batch_size)
+            topics = self._extract_topics_batch(texts, titles, batch_size)
+            sentiments = self._analyze_sentiments(texts, batch_size)
+            
+            return [
+                {
+                    'summary': summary,
+                    'topics': article_topics,
+                    'sentiment': sentiment,
+                    'tags': self._generate_tags(text, article_topics),
+                    'tier': 'full'
+                }
+                for text, summary, article_topics, sentiment in zip(texts, summaries, topics, sentiments)
+            ]
+        except Exception as e:
+            logger.error(f"Error analyzing article batch: {str(e)}")
+            # Fall back to analyzing articles one at a time
+            return [self.analyze_article(text, title) for text, title in articles]
+
+    def _length_buckets(self, texts, batch_size):
+        """
+        Group text indices into batches of similar length.
+        
+        Args:
+            texts (list): Texts to group
+            batch_size (int): Maximum number of texts per batch
+            
+        Returns:
+            list: List of index lists, one per batch
+        """
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+    def _summary_length(self, text, max_length=150):
+        """
+        Calculate an appropriate summary length based on input length.
+        
+        Args:
+            text (str): The text to summarize
+            max_length (int): Maximum length of the summary
+            
+        Returns:
+            int: Target summary length
+        """
+        input_length = len(text.split())
+        if input_length < 100:
+            # For very short texts, use a shorter summary
+            return min(max_length, max(30, input_length // 2))
+        # For longer texts, use a proportion of the input length
+        return min(max_length, max(50, input_length // 3))
+
     def _generate_summary(self, text, max_length=150):
         """
         Generate a concise summary of the article text.
@@ -100,37 +331,39 @@ class AIService:
             if not self.summarizer:
                 return text[:max_length] + "..."
             
-            # Calculate appropriate summary length based on input length
-            input_length = len(text.split())
-            if input_length < 100:
-                # For very short texts, use a shorter summary
-                summary_length = min(max_length, max(30, input_length // 2))
-            else:
-                # For longer texts, use a proportion of the input length
-                summary_length = min(max_length, max(50, input_length // 3))
-            
-            # Split text into chunks if too long for the model
-            chunks = self._split_text(text)
-            summaries = []
-            
-            # Process each chunk and combine summaries
-            for chunk in chunks:
-                summary = self.summarizer(
-                    chunk,
-                    max_length=summary_length,
-                    min_length=max(30, summary_length // 2),
-                    do_sample=False
-                )
-                summaries.append(summary[0]['summary_text'])
-            
-            return " ".join(summaries)
+            return self.summarization.summarize(
+                self.summarizer, [text], [self._summary_length(text, max_length)], batch_size=1
+            )[0]
         except Exception as e:
             logger.error(f"Error generating summary: {str(e)}")
             return text[:max_length] + "..."
 
+    def _generate_summaries(self, texts, batch_size, max_length=150):
+        """
+        Generate summaries for several texts with batched summarizer calls.
+        
+        Short texts are returned without calling the model; the chunks of
+        longer texts are summarized together and then reduced per text (see
+        MapReduceSummarizer).
+        
+        Args:
+            texts (list): Article texts to summarize
+            batch_size (int): Maximum number of chunks per summarizer call
+            max_length (int): Maximum length of each summary
+            
+        Returns:
+            list: Summaries in input order
+        """
+        if not self.summarizer:
+            return [self.fast.summarize(text) for text in texts]
+        
+        summary_lengths = [self._summary_length(text, max_length) for text in texts]
+        return self.summarization.summarize(self.summarizer, texts, summary_lengths, batch_size)
+
     def _extract_topics(self, text, title):
         """
-        Extract main topics from the article using zero-shot classification.
+        Extract main topics from the article using the embedding topic
+        classifier when enabled, or zero-shot classification.
         
         Args:
             text (str): The article text
@@ -143,17 +376,15 @@ class AIService:
             # Combine title and text for better topic extraction
             combined_text = f"{title} {text}"
             
-            # Define possible topics for classification
-            candidate_topics = [
-                "politics", "business", "technology", "sports", "entertainment",
-                "health", "science", "education", "environment", "world"
-            ]
+            # The embedding classifier needs one encoder pass instead of ten NLI passes
+            if self._use_topic_classifier():
+                return self.topic_classifier.classify_batch([combined_text])[0]
             
             # Use zero-shot classification if available
             if self.zero_shot_classifier:
                 result = self.zero_shot_classifier(
                     combined_text,
-                    candidate_topics,
+                    self.CANDIDATE_TOPICS,
                     multi_label=True
                 )
                 # Return topics with confidence score > 0.5
@@ -165,6 +396,49 @@ class AIService:
             logger.error(f"Error extracting topics: {str(e)}")
             return []
 
+    def _extract_topics_batch(self, texts, titles, batch_size):
+        """
+        Extract topics for several articles with one batched classifier pass.
+        
+        Args:
+            texts (list): Article texts
+            titles (list): Article titles
+            batch_size (int): Maximum number of texts per classifier call
+            
+        Returns:
+            list: List of topic lists in input order
+        """
+        combined_texts = [f"{title} {text}" for text, title in zip(texts, titles)]
+        if self._use_topic_classifier():
+            try:
+                return self.topic_classifier.classify_batch(combined_texts, batch_size=batch_size)
+            except Exception as e:
+                logger.error(f"Error classifying batch topics, using zero-shot: {str(e)}")
+        
+        if not self.zero_shot_classifier:
+            return self.fast.keywords_batch(combined_texts)
+        
+        topics = [[] for _ in combined_texts]
+        for bucket in self._length_buckets(combined_texts, batch_size):
+            try:
+                results = self.zero_shot_classifier(
+                    [combined_texts[i] for i in bucket],
+                    self.CANDIDATE_TOPICS,
+                    multi_label=True
+                )
+                # A single input returns a dict rather than a list
+                if isinstance(results, dict):
+                    results = [results]
+                for i, result in zip(bucket, results):
+                    topics[i] = [topic for topic, score in zip(result['labels'], result['scores']) if score > 0.5]
+            except Exception as e:
+                logger.error(f"Error extracting batch topics: {str(e)}")
+        return topics
+
+    def _use_topic_classifier(self):
+        """Whether topics come from the embedding classifier (loading it on first use)."""
+        return self.topic_method == 'embedding' and self.topic_classifier.available
+
     def _analyze_sentiment(self, text):
         """
         Analyze the sentiment of the article text.
@@ -184,7 +458,9 @@ class AIService:
                     'score': result['score']
                 }
             
-            # Fallback to TextBlob for basic sentiment analysis
+            # Fallback to TextBlob for basic sentiment analysis. Imported here
+            # because it pulls in nltk and scipy, which slow down startup.
+            from textblob import TextBlob
             analysis = TextBlob(text)
             return {
                 'label': 'POSITIVE' if analysis.sentiment.polarity > 0 else 'NEGATIVE',
@@ -194,6 +470,33 @@ class AIService:
             logger.error(f"Error analyzing sentiment: {str(e)}")
             return {'label': 'NEUTRAL', 'score': 0.0}
 
+    def _analyze_sentiments(self, texts, batch_size):
+        """
+        Analyze the sentiment of several texts with batched pipeline calls.
+        
+        Args:
+            texts (list): Texts to analyze
+            batch_size (int): Maximum number of texts per analyzer call
+            
+        Returns:
+            list: Sentiment dictionaries in input order
+        """
+        if not self.sentiment_analyzer:
+            return [self.fast.sentiment(text) for text in texts]
+        
+        sentiments = [{'label': 'NEUTRAL', 'score': 0.0} for _ in texts]
+        for bucket in self._length_buckets(texts, batch_size):
+            try:
+                results = self.sentiment_analyzer([texts[i][:512] for i in bucket])
+                for i, result in zip(bucket, results):
+                    sentiments[i] = {
+                        'label': result['label'],
+                        'score': result['score']
+                    }
+            except Exception as e:
+                logger.error(f"Error analyzing batch sentiment: {str(e)}")
+        return sentiments
+
     def _generate_tags(self, text, topics):
         """
         Generate relevant tags for the article.
@@ -243,38 +546,20 @@ class AIService:
             logger.error(f"Error extracting keywords: {str(e)}")
             return []
 
-    def _split_text(self, text, max_length=1024):
-        """
-        Split long text into smaller chunks for processing.
-        
-        Args:
-            text (str): The text to split
-            max_length (int): Maximum length of each chunk
-            
-        Returns:
-            list: List of text chunks
-        """
-        try:
-            words = text.split()
-            chunks = []
-            current_chunk = []
-            current_length = 0
-            
-            # Split text into chunks of maximum length
-            for word in words:
-                if current_length + len(word) + 1 <= max_length:
-                    current_chunk.append(word)
-                    current_length += len(word) + 1
-                else:
-                    chunks.append(" ".join(current_chunk))
-                    current_chunk = [word]
-                    current_length = len(word)
-            
-            # Add the last chunk if it exists
-            if current_chunk:
-                chunks.append(" ".join(current_chunk))
-            
-            return chunks
-        except Exception as e:
-            logger.error(f"Error splitting text: {str(e)}")
-            return [text] 
\ No newline at end of file
+# Shared AIService instance for this process
+_shared_ai_service = None
+_shared_ai_service_lock = threading.Lock()
+
+def get_ai_service():
+    """
+    Get the process-wide AIService, creating it on first call.
+    
+    Returns:
+        AIService: The shared AI service instance
+    """
+    global _shared_ai_service
+    if _shared_ai_service is None:
+        with _shared_ai_service_lock:
+            if _shared_ai_service is None:
+                _shared_ai_service = AIService()
+    return _shared_ai_service
@@ -0,0 +1,185 @@
+"""
+Near-Duplicate Index Module for SmartNewsHub
+
+This module detects near-duplicate articles with MinHash signatures and
+locality-sensitive hashing (LSH). The index is updated incrementally as
+articles are ingested, so each lookup only compares an article against the
+few candidates that share an LSH band, across every feed and page seen in the
+recent time window.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Hash parameters, as used by the standard MinHash construction
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+class NearDuplicateIndex:
+    """
+    Incremental MinHash/LSH index of recently seen articles.
+    
+    Similarity is the Jaccard similarity of word shingles, estimated from the
+    fraction of matching MinHash values. Signatures are split into bands and
+    two articles become candidates when any band matches exactly.
+    """
+    
+    def __init__(self, threshold=0.5, num_perm=128, bands=32, shingle_size=2,
+                 window_hours=None, max_entries=20000, seed=1):
+        """
+        Initialize the index.
+        
+        Args:
+            threshold (float): Estimated Jaccard similarity above which two
+                articles are near-duplicates
+            num_perm (int): Number of MinHash permutations per signature
+            bands (int): Number of LSH bands; must divide num_perm
+            shingle_size (int): Number of words per shingle
+            window_hours (float): How long articles stay in the index
+                (DEDUP_WINDOW_HOURS, default 24)
+            max_entries (int): Maximum number of articles kept in the index
+            seed (int): Seed for the permutation parameters
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.window_seconds = (window_hours or float(os.getenv('DEDUP_WINDOW_HOURS', 24))) * 3600
+        self.max_entries = max_entries
+        self.seed = seed
+        
+        # Permutation parameters, created with numpy on first use to keep imports fast
+        self._a = None
+        self._b = None
+        
+        self._entries = OrderedDict()  # key -> (signature, added_at), oldest first
+        self._buckets = [{} for _ in range(bands)]  # band -> {band bytes: set of keys}
+        self._lock = threading.Lock()
+
+    def signature(self, text):
+        """
+        Compute the MinHash signature of a text.
+        
+        Args:
+            text (str): Text to hash
+            
+        Returns:
+            numpy.ndarray: Signature of num_perm unsigned integers
+        """
+        import numpy as np
+        if self._b is None:
+            with self._lock:
+                if self._b is None:
+                    # Build both before publishing them: readers check _b last
+                    generator = np.random.RandomState(self.seed)
+                    a = generator.randint(1, np.iinfo(np.int64).max, size=self.num_perm, dtype=np.int64).astype(np.uint64)
+                    b = generator.randint(0, np.iinfo(np.int64).max, size=self.num_perm, dtype=np.int64).astype(np.uint64)
+                    self._a = a
+                    self._b = b
+        
+        words = re.findall(r'\w+', text.lower())
+        if len(words) < self.shingle_size:
+            shingles = {' '.join(words)}
+        else:
+            shingles = {
+                ' '.join(words[i:i + self.shingle_size])
+                for i in range(len(words) - self.shingle_size + 1)
+            }
+        hashes = np.array([zlib.crc32(shingle.encode('utf-8')) for shingle in shingles], dtype=np.uint64)
+        
+        # Universal hashing of every shingle under every permutation, then take the minimum
+        permuted = ((hashes[:, None] * self._a + self._b) % np.uint64(_MERSENNE_PRIME)) & np.uint64(_MAX_HASH)
+        return permuted.min(axis=0)
+
+    def check_and_add(self, key, text, now=None):
+        """
+        Check whether a text duplicates a recently seen article, and index it if not.
+        
+        An article seen again under the same key is never its own duplicate.
+        
+        Args:
+            key (str): Unique article key, such as its URL
+            text (str): Article text (title and description)
+            now (float): Current time, defaults to time.time()
+            
+        Returns:
+            str: Key of the article it duplicates, or None if it is new
+        """
+        now = now if now is not None else time.time()
+        signature = self.signature(text)
+        
+        with self._lock:
+            self._expire(now)
+            
+            if key in self._entries:
+                # Refresh the timestamp of an article we already know
+                self._entries[key] = (self._entries[key][0], now)
+                self._entries.move_to_end(key)
+                return None
+            
+            duplicate = self._find_duplicate(signature)
+            if duplicate is not None:
+                return duplicate
+            
+            self._insert(key, signature, now)
+            return None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _band_keys(self, signature):
+        """Yield (band index, band bytes) pairs for a signature."""
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def _find_duplicate(self, signature):
+        """Return the key of the most similar candidate above the threshold. Caller holds the lock."""
+        candidates = set()
+        for band, band_key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        
+        best_key, best_score = None, self.threshold
+        for candidate in candidates:
+            score = float((self._entries[candidate][0] == signature).mean())
+            if score >= best_score:
+                best_key, best_score = candidate, score
+        return best_key
+
+    def _insert(self, key, signature, now):
+        """Add a signature to the index, evicting the oldest entry if full. Caller holds the lock."""
+        self._entries[key] = (signature, now)
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band].setdefault(band_key, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        """Remove an entry and its band buckets. Caller holds the lock."""
+        signature, _ = self._entries.pop(key)
+        for band, band_key in self._band_keys(signature):
+            bucket = self._buckets[band].get(band_key)
+            if bucket:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][band_key]
+
+    def _expire(self, now):
+        """Drop entries older than the time window. Caller holds the lock."""
+        cutoff = now - self.window_seconds
+        while self._entries:
+            key, (_, added_at) = next(iter(self._entries.items()))
+            if added_at >= cutoff:
+                break
+            self._remove(key)
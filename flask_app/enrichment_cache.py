@@ -0,0 +1,221 @@
+"""
+Enrichment Cache Module for SmartNewsHub
+
+This module caches AI enrichment results by article content so the same article
+is never analyzed twice, whichever feed or page it shows up in.
+
+Lookups go through an in-process LRU first and fall back to the
+ArticleEnrichment table with one IN query per batch.
+
+Each enrichment records the analysis tier that produced it. Fast-tier results
+are stopgaps from busy periods: once older than AI_FAST_TIER_TTL they are
+reported by needs_upgrade() so the caller can analyze them again with the
+full models.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from sqlalchemy import inspect, text
+from .models import ArticleEnrichment, db
+
+logger = logging.getLogger(__name__)
+
+class EnrichmentCache:
+    """
+    Content-addressed cache of article enrichments (summary, sentiment, tags).
+    
+    Keys are SHA-256 hashes of the article title plus description, so an
+    article is recognised even when the API returns it under another ID.
+    """
+    
+    def __init__(self, max_entries=None, fast_tier_ttl=None):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries (int): Maximum number of entries kept in memory. Defaults
+                to the ENRICHMENT_CACHE_SIZE environment variable, or 5000.
+            fast_tier_ttl (float): Seconds before a fast-tier enrichment is due
+                for re-analysis (AI_FAST_TIER_TTL, default 3600)
+        """
+        self.max_entries = max_entries or int(os.getenv('ENRICHMENT_CACHE_SIZE', 5000))
+        self.fast_tier_ttl = fast_tier_ttl or float(os.getenv('AI_FAST_TIER_TTL', 3600))
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        
+        # Hit/miss counters for monitoring
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def ensure_schema():
+        """
+        Add the tier column to an article_enrichment table created before it existed.
+        
+        db.create_all() does not alter existing tables. Must be called within
+        an application context.
+        """
+        try:
+            columns = {column['name'] for column in inspect(db.engine).get_columns(ArticleEnrichment.__tablename__)}
+            if 'tier' not in columns:
+                with db.engine.begin() as connection:
+                    connection.execute(text(
+                        f"ALTER TABLE {ArticleEnrichment.__tablename__} ADD COLUMN tier VARCHAR(10)"
+                    ))
+                logger.info("Added tier column to the enrichment table")
+        except Exception as e:
+            logger.error(f"Error adding tier column to the enrichment table: {str(e)}")
+
+    def needs_upgrade(self, enrichment):
+        """
+        Whether an enrichment came from the fast tier and is due for re-analysis.
+        
+        Args:
+            enrichment (dict): Cached enrichment
+            
+        Returns:
+            bool: True for fast-tier results older than fast_tier_ttl
+        """
+        if not enrichment or enrichment.get('tier') != 'fast':
+            return False
+        return time.time() - enrichment.get('enriched_at', 0) >= self.fast_tier_ttl
+
+    @staticmethod
+    def content_hash(article):
+        """
+        Compute the cache key for an article.
+        
+        Args:
+            article (dict): Article data containing title and description
+            
+        Returns:
+            str: Hex digest identifying the article content
+        """
+        content = f"{article.get('title') or ''}\n{article.get('description') or ''}"
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def get_many(self, hashes):
+        """
+        Look up enrichments for several content hashes.
+        
+        Args:
+            hashes (list): Content hashes to look up
+            
+        Returns:
+            dict: Mapping of content hash to enrichment for every hit
+        """
+        found = {}
+        missing = []
+        
+        # Check the in-process LRU first
+        with self._lock:
+            for content_hash in set(hashes):
+                enrichment = self._entries.get(content_hash)
+                if enrichment is not None:
+                    self._entries.move_to_end(content_hash)
+                    found[content_hash] = enrichment
+                    self.memory_hits += 1
+                else:
+                    missing.append(content_hash)
+        
+        if not missing:
+            return found
+        
+        # Fetch the rest from the database with a single query
+        try:
+            rows = ArticleEnrichment.query.filter(ArticleEnrichment.content_hash.in_(missing)).all()
+        except Exception as e:
+            logger.error(f"Error loading cached enrichments: {str(e)}")
+            rows = []
+        
+        loaded = {row.content_hash: self._row_to_enrichment(row) for row in rows}
+        with self._lock:
+            self.db_hits += len(loaded)
+            self.misses += len(missing) - len(loaded)
+            for content_hash, enrichment in loaded.items():
+                self._remember(content_hash, enrichment)
+        
+        found.update(loaded)
+        return found
+
+    def put_many(self, enrichments):
+        """
+        Store enrichments in memory and add them to the database session.
+        
+        The caller is responsible for committing the session.
+        
+        Args:
+            enrichments (dict): Mapping of content hash to enrichment
+        """
+        if not enrichments:
+            return
+        
+        existing = {
+            row.content_hash: row
+            for row in ArticleEnrichment.query.filter(
+                ArticleEnrichment.content_hash.in_(list(enrichments))
+            ).all()
+        }
+        now = time.time()
+        for content_hash, enrichment in enrichments.items():
+            enrichment.setdefault('tier', 'full')
+            enrichment['enriched_at'] = now
+            row = existing.get(content_hash) or ArticleEnrichment(content_hash=content_hash)
+            row.tags = json.dumps(enrichment['tags'])
+            row.summary = enrichment['summary']
+            row.sentiment = enrichment['sentiment']
+            row.tier = enrichment['tier']
+            # Re-analysis replaces the row, so its age restarts
+            row.created_at = datetime.utcfromtimestamp(now)
+            db.session.add(row)
+        
+        with self._lock:
+            for content_hash, enrichment in enrichments.items():
+                self._remember(content_hash, enrichment)
+
+    def stats(self):
+        """
+        Get cache hit/miss counters.
+        
+        Returns:
+            dict: Counters and current in-memory size
+        """
+        with self._lock:
+            lookups = self.memory_hits + self.db_hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'db_hits': self.db_hits,
+                'misses': self.misses,
+                'hit_rate': (self.memory_hits + self.db_hits) / lookups if lookups else 0.0,
+                'size': len(self._entries)
+            }
+
+    def _remember(self, content_hash, enrichment):
+        """Insert an entry into the LRU, evicting the oldest if full. Caller holds the lock."""
+        self._entries[content_hash] = enrichment
+        self._entries.move_to_end(content_hash)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _row_to_enrichment(row):
+        """Convert an ArticleEnrichment row into an enrichment dictionary."""
+        try:
+            tags = json.loads(row.tags or '[]')
+        except ValueError:
+            tags = []
+        created_at = row.created_at or datetime.utcnow()
+        return {
+            'summary': row.summary,
+            'sentiment': row.sentiment,
+            'tags': tags,
+            'tier': row.tier or 'full',
+            'enriched_at': (created_at - datetime(1970, 1, 1)).total_seconds()
+        }
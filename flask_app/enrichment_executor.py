@@ -0,0 +1,177 @@
+"""
+Enrichment Executor Module for SmartNewsHub
+
+This module spreads AI analysis over a pool of worker processes so CPU-bound
+NLP can use every core instead of the one the calling thread holds the GIL
+on. Each worker process builds its own AIService once, in the pool
+initializer, and keeps its models loaded between tasks. Articles are split
+into chunks (one analyze_articles call each), and the number of chunks in
+flight is bounded so a large backfill does not queue everything up front.
+
+The pool is off by default (AI_PROCESS_WORKERS=0): every worker process holds
+its own copy of the models, so on memory-constrained hosts the inference
+server is the better way to share them.
+"""
+
+import logging
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+# AIService of the current pool worker process
+_worker_service = None
+
+def _init_worker(torch_threads, warmup):
+    """
+    Set up a pool worker: cap math library threads and build its AIService.
+
+    Args:
+        torch_threads (int): Intra-op threads per worker process
+        warmup (bool): Load the models now instead of on the first task
+    """
+    global _worker_service
+    # Workers already run in parallel; each one gets a share of the cores
+    for name in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS'):
+        os.environ[name] = str(torch_threads)
+    try:
+        import torch
+        torch.set_num_threads(torch_threads)
+    except Exception:
+        pass  # torch is optional; the fast tier does not need it
+
+    from .ai_service import AIService
+    # Worker processes run the models themselves, never the inference server client
+    _worker_service = AIService(inference_socket='')
+    if warmup:
+        _worker_service.warmup()
+
+def _analyze_chunk(articles, tier):
+    """Run one chunk of articles through the worker's AIService."""
+    return _worker_service.analyze_articles(articles, tier=tier)
+
+class EnrichmentExecutor:
+    """
+    Process pool for AIService.analyze_articles with chunked submission.
+    """
+
+    def __init__(self, ai_service, workers=None, torch_threads=None, chunk_size=None, max_in_flight=None):
+        """
+        Initialize the executor. The pool starts on first use.
+
+        Args:
+            ai_service (AIService): In-process service used when the pool is
+                disabled, not worth it for a small batch, or broken
+            workers (int): Worker processes (AI_PROCESS_WORKERS, default 0 =
+                disabled; "auto" uses every core)
+            torch_threads (int): Intra-op threads per worker process
+                (AI_TORCH_THREADS, default 1)
+            chunk_size (int): Maximum articles per task (AI_BATCH_SIZE, default 8)
+            max_in_flight (int): Maximum tasks submitted and not yet finished
+                (AI_PROCESS_MAX_IN_FLIGHT, default twice the workers)
+        """
+        self.ai_service = ai_service
+        if workers is None:
+            workers = os.getenv('AI_PROCESS_WORKERS', '0')
+        self.workers = (os.cpu_count() or 1) if str(workers).lower() == 'auto' else int(workers)
+        self.torch_threads = torch_threads or int(os.getenv('AI_TORCH_THREADS', 1))
+        self.chunk_size = chunk_size or int(os.getenv('AI_BATCH_SIZE', 8))
+        self.max_in_flight = max_in_flight or int(os.getenv('AI_PROCESS_MAX_IN_FLIGHT', 2 * max(self.workers, 1)))
+        self.warmup = os.getenv('AI_WARMUP', '').lower() in ('1', 'true', 'yes')
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        """Whether analysis should go to worker processes."""
+        # With an inference server the models already run out of process
+        return self.workers > 1 and not self.ai_service.client
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                logger.info(f"Starting enrichment pool with {self.workers} processes")
+                # Spawn rather than fork: the web process has threads and locks
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(self.torch_threads, self.warmup)
+                )
+            return self._pool
+
+    def _discard_pool(self, error):
+        """Forget a broken pool so the next call starts a new one."""
+        with self._lock:
+            if self._pool is None:
+                return
+            self._pool = None
+        logger.error(f"Enrichment pool failed, restarting it on next use: {str(error)}")
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool:
+            pool.shutdown(wait=True)
+
+    def analyze_articles(self, articles, tier=None):
+        """
+        Analyze articles across the worker processes.
+
+        Chunks shrink for small batches so every worker gets a share; a batch
+        smaller than two chunks is analyzed in process.
+
+        Args:
+            articles (list): List of (article_text, article_title) tuples
+            tier (str): Analysis tier (see AIService.choose_tier)
+
+        Returns:
+            list: Analysis dictionaries in input order
+        """
+        if not self.enabled or len(articles) < 2:
+            return self.ai_service.analyze_articles(articles, tier=tier)
+
+        # Resolve auto here: the load on this host decides for every worker
+        tier = self.ai_service.choose_tier(tier)
+        chunk_size = max(1, min(self.chunk_size, math.ceil(len(articles) / self.workers)))
+        chunks = [articles[i:i + chunk_size] for i in range(0, len(articles), chunk_size)]
+        results = [None] * len(chunks)
+        slots = threading.BoundedSemaphore(self.max_in_flight)
+
+        def release(_):
+            slots.release()
+
+        futures = [None] * len(chunks)
+        try:
+            pool = self._get_pool()
+            for index, chunk in enumerate(chunks):
+                # Block while too many chunks are queued in the pool
+                slots.acquire()
+                futures[index] = pool.submit(_analyze_chunk, chunk, tier)
+                futures[index].add_done_callback(release)
+        except BrokenProcessPool as e:
+            self._discard_pool(e)
+        except Exception as e:
+            logger.error(f"Error submitting articles to the enrichment pool: {str(e)}")
+
+        # Wait for every chunk already in the pool rather than analyzing it twice
+        for index, future in enumerate(futures):
+            if future is None:
+                continue
+            try:
+                results[index] = future.result()
+            except BrokenProcessPool as e:
+                self._discard_pool(e)
+            except Exception as e:
+                logger.error(f"Error analyzing articles in the enrichment pool: {str(e)}")
+
+        # Analyze the chunks that failed or were never submitted in process
+        for index, chunk in enumerate(chunks):
+            if results[index] is None:
+                results[index] = self.ai_service.analyze_articles(chunk, tier=tier)
+        return [analysis for chunk_results in results for analysis in chunk_results]
@@ -0,0 +1,132 @@
+"""
+Enrichment Queue Module for SmartNewsHub
+
+This module runs AI enrichment in background worker threads so pages can be
+returned as soon as the upstream fetch completes. Articles are served with
+placeholder enrichment and filled in once the workers finish.
+"""
+
+import logging
+import os
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+class EnrichmentQueue:
+    """
+    Bounded queue of articles waiting for AI enrichment.
+    
+    Workers drain the queue in batches, call the handler inside an app context
+    and pass its results to every registered listener.
+    """
+    
+    def __init__(self, handler, workers=None, batch_size=None, max_pending=None):
+        """
+        Initialize the queue. Workers start when init_app() is called.
+        
+        Args:
+            handler (callable): Takes {content_hash: article} and returns
+                {content_hash: enrichment} for the articles it enriched
+            workers (int): Number of worker threads (AI_ENRICH_WORKERS, default 1)
+            batch_size (int): Maximum articles per handler call (AI_BATCH_SIZE, default 8)
+            max_pending (int): Maximum queued articles (AI_ENRICH_QUEUE_SIZE, default 500)
+        """
+        self.handler = handler
+        self.workers = workers or int(os.getenv('AI_ENRICH_WORKERS', 1))
+        self.batch_size = batch_size or int(os.getenv('AI_BATCH_SIZE', 8))
+        self.max_pending = max_pending or int(os.getenv('AI_ENRICH_QUEUE_SIZE', 500))
+        self.app = None
+        self._queue = queue.Queue(maxsize=self.max_pending)
+        self._pending = {}  # content_hash -> article, for everything queued or in progress
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._threads = []
+
+    @property
+    def running(self):
+        """Whether worker threads have been started."""
+        return bool(self._threads)
+
+    def init_app(self, app):
+        """
+        Start the worker threads for an application.
+        
+        Args:
+            app (Flask): Application whose context the handler runs in
+        """
+        self.app = app
+        if self._threads:
+            return
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f'enrichment-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def add_listener(self, listener):
+        """
+        Register a callback for finished enrichments.
+        
+        Args:
+            listener (callable): Called with a list of (article, enrichment) tuples
+        """
+        self._listeners.append(listener)
+
+    def submit(self, articles):
+        """
+        Queue articles for enrichment, skipping those already queued.
+        
+        Args:
+            articles (dict): Mapping of content hash to raw article
+            
+        Returns:
+            int: Number of articles newly queued
+        """
+        queued = 0
+        for content_hash, article in articles.items():
+            with self._lock:
+                if content_hash in self._pending:
+                    continue
+                self._pending[content_hash] = article
+            try:
+                self._queue.put_nowait(content_hash)
+                queued += 1
+            except queue.Full:
+                # Drop it; fill_pending_enrichments() resubmits it when its feed is served again
+                with self._lock:
+                    self._pending.pop(content_hash, None)
+                logger.warning("Enrichment queue is full; dropping article")
+        return queued
+
+    def size(self):
+        """Number of articles queued or being enriched."""
+        with self._lock:
+            return len(self._pending)
+
+    def _work(self):
+        """Worker loop: drain a batch, enrich it and notify listeners."""
+        while True:
+            hashes = [self._queue.get()]
+            while len(hashes) < self.batch_size:
+                try:
+                    hashes.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            with self._lock:
+                batch = {content_hash: self._pending[content_hash] for content_hash in hashes}
+            
+            try:
+                with self.app.app_context():
+                    results = self.handler(batch)
+                    finished = [(batch[content_hash], enrichment) for content_hash, enrichment in results.items()]
+                    for listener in self._listeners:
+                        listener(finished)
+            except Exception as e:
+                logger.error(f"Error in enrichment worker: {str(e)}")
+            finally:
+                with self._lock:
+                    for content_hash in hashes:
+                        self._pending.pop(content_hash, None)
+                for _ in hashes:
+                    self._queue.task_done()
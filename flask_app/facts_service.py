@@ -1,5 +1,5 @@
-import requests
 from datetime import datetime, timedelta
+from .utils.http_client import http_client
 
 class FactsService:
     def __init__(self):
@@ -15,7 +15,7 @@ class FactsService:
                 return self.cached_fact
 
         try:
-            response = requests.get(self.api_url)
+            response = http_client.get(self.api_url)
             if response.status_code == 200:
                 fact_data = response.json()
                 self.cached_fact = {
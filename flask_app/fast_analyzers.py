@@ -0,0 +1,205 @@
+"""
+Fast Analyzers Module for SmartNewsHub
+
+This module provides a CPU-cheap enrichment tier that needs no model
+downloads:
+- Extractive summaries ranked with TextRank over TF-IDF sentence similarity
+- Lexicon-based sentiment with simple negation handling
+- TF-IDF keyword extraction across the batch
+
+It is used when the transformer pipelines are unavailable, when the fast tier
+is requested explicitly, or automatically when the machine is under load.
+numpy and scikit-learn are imported on first use to keep startup fast.
+"""
+
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Sentence boundaries: end punctuation followed by whitespace and a capital, digit or quote
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9"\'“])')
+
+# News-oriented sentiment lexicon
+_POSITIVE_WORDS = {
+    'win', 'wins', 'won', 'success', 'successful', 'gain', 'gains', 'gained', 'growth', 'grow', 'grows',
+    'record', 'improve', 'improves', 'improved', 'improvement', 'boost',
+    'boosts', 'strong', 'stronger', 'recover', 'recovery', 'recovers', 'breakthrough', 'celebrate',
+    'celebrates', 'praised', 'praise', 'benefit', 'benefits', 'positive', 'optimistic', 'hope',
+    'hopes', 'peace', 'agreement', 'deal', 'approve', 'approved', 'support', 'supports', 'surge',
+    'surges', 'surged', 'profit', 'profits', 'rally', 'rallies', 'advance', 'advances', 'innovative',
+    'innovation', 'award', 'awarded', 'safe', 'secure', 'rescue', 'rescued', 'relief', 'upgrade',
+    'good', 'great', 'best', 'better', 'happy', 'excellent', 'triumph', 'historic', 'welcome'
+}
+_NEGATIVE_WORDS = {
+    'loss', 'losses', 'lose', 'loses', 'lost', 'fall', 'falls', 'fell', 'fallen', 'decline', 'declines',
+    'declined', 'drop', 'drops', 'dropped', 'crash', 'crashes', 'crashed', 'crisis', 'war', 'attack', 'attacks', 'killed', 'kill',
+    'kills', 'dead', 'death', 'deaths', 'die', 'dies', 'injured', 'violence', 'conflict', 'fear',
+    'fears', 'risk', 'risks', 'threat', 'threats', 'warn', 'warns', 'warned', 'warning', 'fail', 'fails',
+    'failed', 'failure', 'weak', 'weaker', 'slump', 'slumps', 'slumped', 'recession', 'inflation', 'debt',
+    'fraud', 'scandal', 'corruption', 'arrest', 'arrested', 'protest', 'protests', 'ban', 'banned',
+    'cut', 'cuts', 'layoffs', 'disaster', 'flood', 'floods', 'fire', 'storm', 'earthquake',
+    'concern', 'concerns', 'criticism', 'criticised', 'criticized', 'bad', 'worse', 'worst',
+    'negative', 'collapse', 'shortage', 'outbreak', 'lawsuit', 'sued', 'deny', 'denies', 'plunge',
+    'plunged'
+}
+_NEGATIONS = {'not', 'no', 'never', 'without', 'neither', 'nor', 'cannot'}
+
+class FastAnalyzer:
+    """
+    Lightweight summarizer, sentiment model and keyword extractor.
+    """
+
+    def __init__(self, damping=0.85, iterations=30):
+        """
+        Initialize the analyzer.
+
+        Args:
+            damping (float): TextRank damping factor
+            iterations (int): TextRank power iterations
+        """
+        self.damping = damping
+        self.iterations = iterations
+
+    def analyze_batch(self, texts, titles=None):
+        """
+        Analyze several texts with the fast tier.
+
+        Args:
+            texts (list): Article texts
+            titles (list): Article titles, prepended for keyword extraction
+
+        Returns:
+            list: Analysis dictionaries with summary, topics, sentiment, tags
+            and tier "fast", in the same format as AIService.analyze_articles
+        """
+        titles = titles or [''] * len(texts)
+        keywords = self.keywords_batch([f"{title} {text}" for text, title in zip(texts, titles)])
+        return [
+            {
+                'summary': self.summarize(text),
+                'topics': article_keywords,
+                'sentiment': self.sentiment(text),
+                'tags': article_keywords[:5],
+                'tier': 'fast'
+            }
+            for text, article_keywords in zip(texts, keywords)
+        ]
+
+    @staticmethod
+    def split_sentences(text):
+        """Split text into sentences."""
+        return [sentence.strip() for sentence in _SENTENCE_SPLIT.split(text or '') if sentence.strip()]
+
+    def summarize(self, text, max_sentences=None):
+        """
+        Extract the most central sentences of a text with TextRank.
+
+        Args:
+            text (str): Text to summarize
+            max_sentences (int): Sentences to keep; by default 2 for short
+                texts and 3 for texts of 100 words or more
+
+        Returns:
+            str: Selected sentences in their original order
+        """
+        sentences = self.split_sentences(text)
+        if max_sentences is None:
+            max_sentences = 3 if len((text or '').split()) >= 100 else 2
+        if len(sentences) <= max_sentences:
+            return (text or '').strip()
+
+        try:
+            import numpy as np
+            from sklearn.feature_extraction.text import TfidfVectorizer
+
+            # Cosine similarity between sentences (TF-IDF rows are L2-normalized)
+            vectors = TfidfVectorizer(stop_words='english').fit_transform(sentences)
+            similarity = (vectors @ vectors.T).toarray()
+            np.fill_diagonal(similarity, 0.0)
+
+            # Row-normalize into a transition matrix; isolated sentences link everywhere
+            row_sums = similarity.sum(axis=1, keepdims=True)
+            transition = np.where(row_sums > 0, similarity / np.where(row_sums > 0, row_sums, 1), 1.0 / len(sentences))
+
+            # PageRank by power iteration
+            scores = np.full(len(sentences), 1.0 / len(sentences))
+            for _ in range(self.iterations):
+                scores = (1 - self.damping) / len(sentences) + self.damping * transition.T @ scores
+
+            selected = sorted(np.argsort(-scores)[:max_sentences])
+            return ' '.join(sentences[i] for i in selected)
+        except Exception as e:
+            # E.g. a text made only of stop words
+            logger.error(f"Error in fast summary: {str(e)}")
+            return ' '.join(sentences[:max_sentences])
+
+    def sentiment(self, text):
+        """
+        Score sentiment by counting lexicon words, flipping negated ones.
+
+        Args:
+            text (str): Text to analyze
+
+        Returns:
+            dict: Sentiment label (POSITIVE, NEGATIVE or NEUTRAL) and score
+        """
+        tokens = re.findall(r"[a-z]+n't|[a-z]+", (text or '').lower().replace('’', "'"))
+        positive = negative = 0
+        for i, token in enumerate(tokens):
+            polarity = 1 if token in _POSITIVE_WORDS else -1 if token in _NEGATIVE_WORDS else 0
+            if not polarity:
+                continue
+            # A negation among the three preceding words flips the polarity
+            window = tokens[max(0, i - 3):i]
+            if any(word in _NEGATIONS or word.endswith("n't") for word in window):
+                polarity = -polarity
+            if polarity > 0:
+                positive += 1
+            else:
+                negative += 1
+
+        total = positive + negative
+        if not total:
+            return {'label': 'NEUTRAL', 'score': 0.0}
+        polarity = (positive - negative) / total
+        if abs(polarity) < 0.2:
+            return {'label': 'NEUTRAL', 'score': round(1 - abs(polarity), 3)}
+        # Express confidence like the transformer pipeline: 0.5 (unsure) to 1.0
+        return {
+            'label': 'POSITIVE' if polarity > 0 else 'NEGATIVE',
+            'score': round(0.5 + abs(polarity) / 2, 3)
+        }
+
+    def keywords_batch(self, texts, top_k=5):
+        """
+        Extract the highest TF-IDF terms of each text, with IDF over the batch.
+
+        Args:
+            texts (list): Texts to extract keywords from
+            top_k (int): Keywords per text
+
+        Returns:
+            list: Keyword lists in input order
+        """
+        if not texts:
+            return []
+        try:
+            import numpy as np
+            from sklearn.feature_extraction.text import TfidfVectorizer
+
+            vectorizer = TfidfVectorizer(stop_words='english', token_pattern=r'(?u)\b[^\W\d_]{3,}\b')
+            matrix = vectorizer.fit_transform(texts).toarray()
+            # get_feature_names_out replaced get_feature_names in scikit-learn 1.0
+            if hasattr(vectorizer, 'get_feature_names_out'):
+                vocabulary = vectorizer.get_feature_names_out()
+            else:
+                vocabulary = vectorizer.get_feature_names()
+            return [
+                [vocabulary[i] for i in np.argsort(-row)[:top_k] if row[i] > 0]
+                for row in matrix
+            ]
+        except Exception as e:
+            # E.g. every text is empty or only stop words
+            logger.error(f"Error extracting fast keywords: {str(e)}")
+            return [[] for _ in texts]
@@ -0,0 +1,363 @@
+"""
+Inference Server Module for SmartNewsHub
+
+This module runs the AI models in one sidecar process per host so gunicorn
+workers do not each hold their own copy of the model weights. The server
+listens on a Unix domain socket and answers analyze_articles requests from
+every worker. Requests that arrive within a short window are combined into a
+single analyze_articles call, so the models see larger batches than any one
+worker sends.
+
+Messages are JSON objects framed by a 4-byte big-endian length prefix:
+- {"op": "analyze", "articles": [[text, title], ...], "tier": "full"}
+  returns {"results": [...]} in the format of AIService.analyze_articles
+- {"op": "ping"} returns {"ok": true}
+- {"op": "stats"} returns request and batching counters
+
+Run the server with:
+    python -m flask_app.inference_server [--socket /tmp/planetpulse-ai.sock]
+
+and point the web workers at it by setting AI_INFERENCE_SOCKET to the same
+path.
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = '/tmp/planetpulse-ai.sock'
+
+# Length prefix of every message
+_HEADER = struct.Struct('>I')
+_MAX_MESSAGE = 64 * 1024 * 1024
+
+def _json_default(value):
+    """Serialize numpy scalars returned by the models."""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+def send_message(sock, message):
+    """Send one length-prefixed JSON message."""
+    payload = json.dumps(message, default=_json_default).encode('utf-8')
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+def _recv_exactly(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(min(size - len(data), 1024 * 1024))
+        if not chunk:
+            raise ConnectionError("Connection closed mid-message")
+        data.extend(chunk)
+    return bytes(data)
+
+def recv_message(sock):
+    """
+    Receive one length-prefixed JSON message.
+
+    Returns:
+        dict: The message, or None if the peer closed the connection
+    """
+    header = sock.recv(_HEADER.size, socket.MSG_WAITALL)
+    if not header:
+        return None
+    if len(header) < _HEADER.size:
+        header += _recv_exactly(sock, _HEADER.size - len(header))
+    (size,) = _HEADER.unpack(header)
+    if size > _MAX_MESSAGE:
+        raise ValueError(f"Message of {size} bytes is too large")
+    return json.loads(_recv_exactly(sock, size).decode('utf-8'))
+
+class InferenceClient:
+    """
+    Client for the inference server, used by AIService in client mode.
+    """
+
+    def __init__(self, socket_path, timeout=None):
+        """
+        Initialize the client.
+
+        Args:
+            socket_path (str): Path of the server's Unix domain socket
+            timeout (float): Seconds to wait for a response
+                (AI_INFERENCE_TIMEOUT, default 120)
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout or float(os.getenv('AI_INFERENCE_TIMEOUT', 120))
+
+    def request(self, message):
+        """
+        Send a request and wait for the response.
+
+        Args:
+            message (dict): Request message
+
+        Returns:
+            dict: Response message
+
+        Raises:
+            OSError: If the server is unreachable or does not answer in time
+            RuntimeError: If the server reports an error
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            send_message(sock, message)
+            response = recv_message(sock)
+        if response is None:
+            raise ConnectionError("Inference server closed the connection")
+        if 'error' in response:
+            raise RuntimeError(f"Inference server error: {response['error']}")
+        return response
+
+    def analyze(self, articles, tier=None):
+        """
+        Analyze articles on the server.
+
+        Args:
+            articles (list): List of (article_text, article_title) tuples
+            tier (str): Analysis tier passed to the server's analyze_articles
+
+        Returns:
+            list: Analysis dictionaries in input order
+        """
+        response = self.request({'op': 'analyze', 'articles': [list(article) for article in articles], 'tier': tier})
+        return response['results']
+
+    def ping(self):
+        """Whether the server is up and answering."""
+        try:
+            return bool(self.request({'op': 'ping'}).get('ok'))
+        except (OSError, RuntimeError):
+            return False
+
+class _Job:
+    """One client request waiting for its share of a batch."""
+
+    def __init__(self, articles, tier):
+        self.articles = articles
+        self.tier = tier
+        self.results = None
+        self.error = None
+        self.done = threading.Event()
+
+class MicroBatcher:
+    """
+    Combines analyze requests that arrive within a short window.
+    """
+
+    def __init__(self, service, window=None, max_batch=None):
+        """
+        Initialize the batcher and start its worker thread.
+
+        Args:
+            service (AIService): Local service that runs the models
+            window (float): Seconds to wait for more requests after the first
+                one arrives (AI_INFERENCE_WINDOW_MS, default 20 ms)
+            max_batch (int): Maximum articles per analyze_articles call
+                (AI_INFERENCE_MAX_BATCH, default 32)
+        """
+        self.service = service
+        self.window = window if window is not None else float(os.getenv('AI_INFERENCE_WINDOW_MS', 20)) / 1000
+        self.max_batch = max_batch or int(os.getenv('AI_INFERENCE_MAX_BATCH', 32))
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self.counters = {'requests': 0, 'articles': 0, 'batches': 0}
+        self._thread = threading.Thread(target=self._work, name='inference-batcher', daemon=True)
+        self._thread.start()
+
+    def analyze(self, articles, tier=None):
+        """
+        Queue articles and wait for their analyses.
+
+        Args:
+            articles (list): List of (article_text, article_title) tuples
+            tier (str): Analysis tier
+
+        Returns:
+            list: Analysis dictionaries in input order
+        """
+        job = _Job([tuple(article) for article in articles], tier)
+        self._queue.put(job)
+        job.done.wait()
+        if job.error:
+            raise job.error
+        return job.results
+
+    def _collect(self):
+        """Take the next job plus any that arrive within the window."""
+        jobs = [self._queue.get()]
+        size = len(jobs[0].articles)
+        deadline = time.monotonic() + self.window
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                job = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            jobs.append(job)
+            size += len(job.articles)
+        return jobs
+
+    def _work(self):
+        while True:
+            jobs = self._collect()
+            # Jobs asking for different tiers cannot share a call
+            by_tier = {}
+            for job in jobs:
+                by_tier.setdefault(job.tier, []).append(job)
+            for tier, tier_jobs in by_tier.items():
+                self._run(tier, tier_jobs)
+
+    def _run(self, tier, jobs):
+        articles = [article for job in jobs for article in job.articles]
+        try:
+            results = self.service.analyze_articles(articles, tier=tier)
+            offset = 0
+            for job in jobs:
+                job.results = results[offset:offset + len(job.articles)]
+                offset += len(job.articles)
+        except Exception as e:
+            logger.error(f"Error analyzing batch of {len(articles)} articles: {str(e)}")
+            for job in jobs:
+                job.error = e
+        finally:
+            with self._lock:
+                self.counters['requests'] += len(jobs)
+                self.counters['articles'] += len(articles)
+                self.counters['batches'] += 1
+            for job in jobs:
+                job.done.set()
+
+    def stats(self):
+        """
+        Get batching counters.
+
+        Returns:
+            dict: Requests, articles and model batches served so far
+        """
+        with self._lock:
+            stats = dict(self.counters)
+        stats['articles_per_batch'] = round(stats['articles'] / stats['batches'], 2) if stats['batches'] else 0.0
+        stats['queued'] = self._queue.qsize()
+        return stats
+
+class _Handler(socketserver.BaseRequestHandler):
+    """Serves the requests of one client connection."""
+
+    def handle(self):
+        while True:
+            try:
+                message = recv_message(self.request)
+            except (OSError, ValueError) as e:
+                logger.error(f"Error reading inference request: {str(e)}")
+                return
+            if message is None:
+                return
+            try:
+                response = self.server.dispatch(message)
+            except Exception as e:
+                response = {'error': str(e)}
+            try:
+                send_message(self.request, response)
+            except OSError:
+                return
+
+class InferenceServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix domain socket server in front of a shared AIService.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, service, batcher=None):
+        """
+        Bind the socket, replacing a stale socket file left by a dead server.
+
+        Args:
+            socket_path (str): Path to listen on
+            service (AIService): Local service that runs the models
+            batcher (MicroBatcher): Request batcher; created if omitted
+
+        Raises:
+            RuntimeError: If another server is already listening on the path
+        """
+        if os.path.exists(socket_path):
+            if InferenceClient(socket_path, timeout=2).ping():
+                raise RuntimeError(f"An inference server is already listening on {socket_path}")
+            os.unlink(socket_path)
+        super().__init__(socket_path, _Handler)
+        os.chmod(socket_path, 0o660)
+        self.socket_path = socket_path
+        self.service = service
+        self.batcher = batcher or MicroBatcher(service)
+
+    def dispatch(self, message):
+        """
+        Answer one request message.
+
+        Args:
+            message (dict): Request message
+
+        Returns:
+            dict: Response message
+        """
+        op = message.get('op')
+        if op == 'analyze':
+            return {'results': self.batcher.analyze(message.get('articles') or [], message.get('tier'))}
+        if op == 'ping':
+            return {'ok': True}
+        if op == 'stats':
+            stats = self.batcher.stats()
+            stats['summarization'] = self.service.summarization.stats()
+            return stats
+        return {'error': f"Unknown op {op!r}"}
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve AI analysis to every worker on this host')
+    parser.add_argument('--socket', default=os.getenv('AI_INFERENCE_SOCKET') or DEFAULT_SOCKET,
+                        help='Unix domain socket to listen on')
+    parser.add_argument('--window-ms', type=float, help='Milliseconds to wait for requests to batch together')
+    parser.add_argument('--max-batch', type=int, help='Maximum articles per model batch')
+    parser.add_argument('--no-warmup', action='store_true', help='Load models on first request instead of at start')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    from .ai_service import AIService
+
+    # The server runs the models itself, so it never acts as a client
+    service = AIService(inference_socket='')
+    if not args.no_warmup:
+        logger.info(f"Loaded models: {service.warmup()}")
+
+    window = args.window_ms / 1000 if args.window_ms is not None else None
+    server = InferenceServer(args.socket, service, MicroBatcher(service, window=window, max_batch=args.max_batch))
+    logger.info(f"Inference server listening on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
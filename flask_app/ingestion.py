@@ -0,0 +1,289 @@
+"""
+Ingestion Module for SmartNewsHub
+
+This module persists fetched feeds into the Article, Category and
+ArticleCategory tables with bulk upserts, and reads feeds back from the
+database so pages can be served when the cache is cold. Saved articles are
+also added to the full-text search index.
+"""
+
+import logging
+import os
+from datetime import datetime, timedelta
+from .models import Article, ArticleCategory, Category, FeedCursor, db
+from .enrichment_cache import EnrichmentCache
+from .search_index import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+# Keep IN clauses below SQLite's bound-parameter limit
+_CHUNK_SIZE = 500
+
+# Date formats produced by the news API and by NewsService._format_date
+_DATE_FORMATS = ('%Y-%m-%d %H:%M:%S', '%B %d, %Y %I:%M %p')
+
+def _chunks(items):
+    """Split a list into chunks of _CHUNK_SIZE."""
+    return [items[i:i + _CHUNK_SIZE] for i in range(0, len(items), _CHUNK_SIZE)]
+
+def _insert(model):
+    """
+    INSERT statement with ON CONFLICT support for the app's database.
+    
+    Upserts keep saves atomic when several workers store the same articles at
+    once; SQLite (the default) and PostgreSQL both support them.
+    
+    Args:
+        model: Model class to insert into
+        
+    Returns:
+        Insert: Dialect-specific insert statement
+    """
+    if db.engine.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
+def _parse_date(value):
+    """Parse an article date string, returning None if it is not recognised."""
+    if not value:
+        return None
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    return None
+
+class ArticleStore:
+    """
+    Database-backed store of ingested articles, grouped by feed.
+    
+    Feeds are stored as categories: "global", "indian" and the NewsData.io
+    category names.
+    """
+    
+    def __init__(self, enrichment_cache=None, max_age_hours=None):
+        """
+        Initialize the store.
+        
+        Args:
+            enrichment_cache (EnrichmentCache): Used to attach AI enrichment
+                to articles loaded from the database
+            max_age_hours (float): Only articles published this recently are
+                served from the database (DB_FEED_MAX_AGE_HOURS, default 24)
+        """
+        self.enrichment_cache = enrichment_cache
+        self.search_index = SearchIndex()
+        self.max_age_hours = max_age_hours or float(os.getenv('DB_FEED_MAX_AGE_HOURS', 24))
+
+    def save_feeds(self, feeds, next_pages=None):
+        """
+        Bulk-upsert articles and their feed categories in one transaction.
+        
+        Args:
+            feeds (dict): Mapping of feed name to a list of formatted articles
+            next_pages (dict): Mapping of feed name to the API's next page
+                token, saved so a feed loaded from the database can still be
+                paged from where the last fetch stopped
+            
+        Returns:
+            int: Number of distinct articles saved
+        """
+        # Collect each article once, with every feed it appeared in
+        articles = {}
+        article_feeds = {}
+        for feed, feed_articles in feeds.items():
+            for article in feed_articles:
+                if article.get('is_suggestion') or not article.get('id'):
+                    continue
+                article_id = str(article['id'])[:255]
+                articles[article_id] = article
+                article_feeds.setdefault(article_id, set()).add(feed)
+        
+        if not articles:
+            return 0
+        
+        try:
+            # Upsert articles: concurrent saves of the same article update one row
+            values = [
+                {
+                    'article_id': article_id,
+                    'title': (article.get('title') or 'Untitled Article')[:500],
+                    'description': article.get('description'),
+                    'url': (article.get('url') or '')[:500],
+                    'image_url': (article.get('image_url') or '')[:500] or None,
+                    'source': (article.get('source') or '')[:100] or None,
+                    'published_at': _parse_date(article.get('published_at')),
+                    'created_at': datetime.utcnow()
+                }
+                for article_id, article in articles.items()
+            ]
+            for chunk in _chunks(values):
+                statement = _insert(Article).values(chunk)
+                excluded = statement.excluded
+                db.session.execute(statement.on_conflict_do_update(
+                    index_elements=['article_id'],
+                    set_={
+                        'title': excluded.title,
+                        'description': excluded.description,
+                        'url': excluded.url,
+                        'image_url': excluded.image_url,
+                        'source': excluded.source,
+                        'published_at': db.func.coalesce(excluded.published_at, Article.published_at)
+                    }
+                ))
+            rows = {}
+            for chunk in _chunks(list(articles)):
+                rows.update({
+                    row.article_id: row
+                    for row in Article.query.filter(Article.article_id.in_(chunk))
+                    .execution_options(populate_existing=True).all()
+                })
+            
+            # Insert missing categories
+            db.session.execute(
+                _insert(Category).values([{'name': feed} for feed in feeds])
+                .on_conflict_do_nothing(index_elements=['name'])
+            )
+            category_ids = {category.name: category.id for category in Category.query.filter(Category.name.in_(list(feeds))).all()}
+            
+            # Insert missing article/category links
+            links = [
+                {'article_id': rows[article_id].id, 'category_id': category_ids[name]}
+                for article_id, names in article_feeds.items()
+                for name in names
+            ]
+            for chunk in _chunks(links):
+                db.session.execute(
+                    _insert(ArticleCategory).values(chunk)
+                    .on_conflict_do_nothing(index_elements=['article_id', 'category_id'])
+                )
+            
+            # Remember where each feed's pagination continues
+            self._save_cursors({
+                feed: next_page for feed, next_page in (next_pages or {}).items()
+                if feed in feeds and feeds[feed]
+            })
+            
+            # Keep the full-text index in step with the articles table
+            self.search_index.index(list(rows.values()))
+            
+            db.session.commit()
+            logger.info(f"Saved {len(articles)} articles across {len(feeds)} feeds")
+            return len(articles)
+        except Exception as e:
+            logger.error(f"Error saving articles: {str(e)}")
+            db.session.rollback()
+            return 0
+
+    def _save_cursors(self, next_pages):
+        """Upsert next page tokens per feed; the caller commits the session."""
+        if not next_pages:
+            return
+        statement = _insert(FeedCursor).values([
+            {'feed': feed, 'next_page': str(next_page)[:255] if next_page else None, 'updated_at': datetime.utcnow()}
+            for feed, next_page in next_pages.items()
+        ])
+        db.session.execute(statement.on_conflict_do_update(
+            index_elements=['feed'],
+            set_={'next_page': statement.excluded.next_page, 'updated_at': statement.excluded.updated_at}
+        ))
+
+    def load_cursor(self, feed):
+        """
+        Get the saved next page token of a feed.
+        
+        Args:
+            feed (str): Feed name
+            
+        Returns:
+            str: Next page token, or None if there is none
+        """
+        try:
+            cursor = FeedCursor.query.filter_by(feed=feed).first()
+        except Exception as e:
+            logger.error(f"Error loading {feed} next page token: {str(e)}")
+            return None
+        return cursor.next_page if cursor else None
+
+    def load_feed(self, feed, limit=10):
+        """
+        Load the most recent articles of a feed from the database.
+        
+        Args:
+            feed (str): Feed name
+            limit (int): Maximum number of articles
+            
+        Returns:
+            list: Formatted articles, newest first (empty if none are recent)
+        """
+        try:
+            cutoff = datetime.utcnow() - timedelta(hours=self.max_age_hours)
+            rows = (
+                Article.query
+                .join(ArticleCategory, ArticleCategory.article_id == Article.id)
+                .join(Category, Category.id == ArticleCategory.category_id)
+                .filter(Category.name == feed)
+                .filter(db.or_(Article.published_at >= cutoff,
+                               db.and_(Article.published_at.is_(None), Article.created_at >= cutoff)))
+                .order_by(Article.published_at.desc(), Article.id.desc())
+                .limit(limit)
+                .all()
+            )
+        except Exception as e:
+            logger.error(f"Error loading {feed} feed from database: {str(e)}")
+            return []
+        return self._format_rows(rows)
+
+    def search(self, query, limit=10, offset=0):
+        """
+        Search ingested articles with the full-text index.
+        
+        Args:
+            query (str): User query
+            limit (int): Maximum number of articles
+            offset (int): Number of ranked results to skip
+            
+        Returns:
+            list: Formatted articles, best match first (empty if local search
+            is unavailable)
+        """
+        ids = self.search_index.search(query, limit=limit, offset=offset)
+        if not ids:
+            return []
+        try:
+            rows = {row.id: row for row in Article.query.filter(Article.id.in_(ids)).all()}
+        except Exception as e:
+            logger.error(f"Error loading search results from database: {str(e)}")
+            return []
+        return self._format_rows([rows[article_id] for article_id in ids if article_id in rows])
+
+    def _format_rows(self, rows):
+        """Format Article rows like API articles, with cached AI enrichment attached."""
+        articles = [
+            {
+                'title': row.title,
+                'description': row.description,
+                'image_url': row.image_url,
+                'source': row.source,
+                'published_at': row.published_at.strftime('%B %d, %Y %I:%M %p') if row.published_at else None,
+                'url': row.url,
+                'id': row.article_id,
+                'summary': None,
+                'sentiment': None,
+                'tags': []
+            }
+            for row in rows
+        ]
+        
+        # Attach cached AI enrichment
+        if self.enrichment_cache and articles:
+            found = self.enrichment_cache.get_many([EnrichmentCache.content_hash(article) for article in articles])
+            for article in articles:
+                enrichment = found.get(EnrichmentCache.content_hash(article))
+                if enrichment:
+                    article.update(summary=enrichment['summary'], sentiment=enrichment['sentiment'], tags=enrichment['tags'])
+        
+        return articles
@@ -75,6 +75,17 @@ class ArticleTags(db.Model):
     sentiment = db.Column(db.String(50))  # AI-analyzed sentiment
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+class ArticleEnrichment(db.Model):
+    __tablename__ = 'article_enrichment'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    content_hash = db.Column(db.String(64), unique=True, nullable=False)  # Hash of title and description
+    tags = db.Column(db.Text, default='[]')  # JSON array of AI-generated tags
+    summary = db.Column(db.Text)  # AI-generated summary
+    sentiment = db.Column(db.String(50))  # AI-analyzed sentiment
+    tier = db.Column(db.String(10))  # Analysis tier, "full" or "fast"; NULL rows predate tiers and count as full
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)  # When the current analysis was made
+
 class Category(db.Model):
     __tablename__ = 'categories'
     
@@ -83,6 +94,14 @@ class Category(db.Model):
     description = db.Column(db.String(200))
     articles = db.relationship('ArticleCategory', backref='category')
 
+class FeedCursor(db.Model):
+    __tablename__ = 'feed_cursors'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    feed = db.Column(db.String(100), unique=True, nullable=False)  # Feed name, e.g. global or a category
+    next_page = db.Column(db.String(255))  # API token of the page after the last one fetched
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 class ArticleCategory(db.Model):
     __tablename__ = 'article_categories'
     
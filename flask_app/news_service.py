@@ -8,23 +8,39 @@ This module handles all news-related operations including:
 - Handling API rate limits and fallbacks
 """
 
-import requests  # HTTP library for making API requests
 import os  # Operating system interface
+import json  # Serialize tag lists for the database
 import logging  # Logging facility for Python
+from concurrent.futures import ThreadPoolExecutor, as_completed  # Concurrent feed fetching
 from datetime import datetime  # Basic date and time types
-from dotenv import load_dotenv  # Load environment variables from .env file
 from urllib.parse import quote_plus  # URL encoding
-from sklearn.feature_extraction.text import TfidfVectorizer  # Text feature extraction
-from sklearn.metrics.pairwise import cosine_similarity  # Calculate text similarity
-import numpy as np  # Numerical computing
-from .ai_service import AIService  # AI analysis service
-from .models import ArticleTags, db  # Database models
+from .ai_service import get_ai_service  # Shared AI analysis service
+from .enrichment_executor import EnrichmentExecutor  # Optional multi-process analysis
+from .enrichment_cache import EnrichmentCache  # Content-addressed enrichment cache
+from .search_cache import SearchCache  # Normalized-query search result cache
+from .quota_manager import QuotaManager, INTERACTIVE, REFRESH  # API credit budgets
+from .enrichment_queue import EnrichmentQueue  # Background enrichment workers
+from .dedup_index import NearDuplicateIndex  # MinHash/LSH near-duplicate detection
+from .ingestion import ArticleStore  # Database persistence of ingested articles
+from .models import Article, ArticleTags, db  # Database models
+from .utils.http_client import http_client  # Pooled HTTP client with retries
 
 # Configure logging with timestamp and log level
 logging.basicConfig(level=logging.INFO, 
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('news_service')
 
+def pending_enrichment():
+    """Placeholder enrichment for an article still waiting in the background queue."""
+    return {'summary': None, 'sentiment': None, 'tags': [], 'pending': True}
+
+# Search results per page, and the token prefix of pages served from the local index
+SEARCH_PAGE_SIZE = 10
+LOCAL_PAGE_PREFIX = 'local:'
+
+# Responses that mean the key (or the server), not the request, was at fault
+KEY_FAILURE_STATUSES = {401, 402, 403, 429, 500, 502, 503, 504}
+
 class NewsService:
     """
     Service class for handling news operations.
@@ -46,159 +62,420 @@ class NewsService:
         - AI analysis service
         - Logging configuration
         """
-        # Print current working directory and environment variables
-        logger.info("Current working directory: %s", os.getcwd())
-        logger.info("Environment variables: %s", list(os.environ.keys()))
-        
-        # Load environment variables from .env file
-        env_path = os.path.join('/Applications/smartnewshub/SmartNewsHub', '.env')
-        logger.info("Looking for .env file at: %s", env_path)
-        if os.path.exists(env_path):
-            logger.info(".env file found at: %s", env_path)
-            load_dotenv(env_path)
-        else:
-            logger.error(".env file not found at: %s", env_path)
-        
-        # Initialize API configuration
+        # Initialize API configuration (.env is loaded by the flask_app package)
         self.api_key = os.getenv('NEWSDATA_API_KEY')
         self.api_key_fallback = os.getenv('NEWSDATA_API_KEY_FALLBACK')
         self.base_url = "https://newsdata.io/api/1/news"
         self.default_language = 'en'
-        self.similarity_threshold = 0.7  # Threshold for considering articles similar
+        self.similarity_threshold = 0.5  # Estimated Jaccard similarity for near-duplicates
+        self.fetch_workers = int(os.getenv('NEWSDATA_FETCH_WORKERS', 8))  # Concurrent upstream requests
         
         # Initialize text processing tools
-        self.vectorizer = TfidfVectorizer(stop_words='english')
-        self.ai_service = AIService()
+        self.dedup_index = NearDuplicateIndex(threshold=self.similarity_threshold)
+        self.ai_service = get_ai_service()
+        self.enrichment_executor = EnrichmentExecutor(self.ai_service)
+        self.enrichment_cache = EnrichmentCache()
+        self.enrichment_queue = EnrichmentQueue(self._enrich_articles)
+        self.article_store = ArticleStore(self.enrichment_cache)
+        self.search_cache = SearchCache()
+        self.quota = QuotaManager([('primary', self.api_key), ('fallback', self.api_key_fallback)])
+        self.defer_enrichment = os.getenv('AI_ENRICH_ASYNC', 'true').lower() in ('1', 'true', 'yes')
+        self.fast_tier_backlog = int(os.getenv('AI_FAST_TIER_BACKLOG', 200))  # Queued articles before using the fast tier
         
-        # Validate API key configuration
+        # Result of the last API key probe, see probe_api_key
+        self.api_status = None
+        
+        # Validate API key configuration without touching the network
         if not self.api_key:
             logger.error("NEWSDATA_API_KEY not found in environment variables!")
-            logger.error("Current environment variables: %s", list(os.environ.keys()))
-            logger.error("Current working directory: %s", os.getcwd())
             logger.error("Please check that your .env file exists and contains NEWSDATA_API_KEY")
         else:
-            logger.info("NewsData.io API key loaded successfully: %s...", self.api_key[:5])
-            logger.info("API key length: %d", len(self.api_key))
-            # Test API key with a simple request
+            logger.info("NewsData.io API key loaded")
+
+    def cache_stats(self):
+        """
+        Get hit/miss counters of the in-process caches for monitoring.
+        
+        Returns:
+            dict: Search and enrichment cache statistics
+        """
+        return {
+            'search': self.search_cache.stats(),
+            'enrichment': self.enrichment_cache.stats()
+        }
+
+    def probe_api_key(self):
+        """
+        Check that the API keys work with a minimal request.
+        
+        Runs in a background thread at startup, never on import.
+        The request is budgeted like a scheduled refresh, and its response
+        updates the quota manager (e.g. pausing a rejected key).
+        
+        Returns:
+            dict: Probe result with 'ok', 'status' and 'checked_at'
+        """
+        status = None
+        if self.api_key:
             try:
-                test_params = {'apikey': self.api_key, 'language': 'en', 'size': 1}
-                test_response = requests.get(self.base_url, params=test_params)
-                if test_response.status_code == 200:
-                    logger.info("API key test successful")
-                else:
-                    logger.error("API key test failed with status code: %d", test_response.status_code)
-                    logger.error("Response: %s", test_response.text)
+                response = self._make_api_request({'language': self.default_language, 'size': 1}, REFRESH)
+                status = response.status_code if response is not None else None
             except Exception as e:
-                logger.error("Error testing API key: %s", str(e))
+                logger.error(f"Error testing API key: {str(e)}")
+        
+        self.api_status = {'ok': status == 200, 'status': status, 'checked_at': datetime.now().isoformat()}
+        if status == 200:
+            logger.info("API key test successful")
+        else:
+            logger.error(f"API key test failed with status: {status}")
+        return self.api_status
 
-    def _process_article_with_ai(self, article):
+    def _process_articles_with_ai(self, articles, defer=None):
         """
-        Process an article using AI analysis.
+        Process a batch of articles using batched AI analysis.
+        
+        Articles whose content has been analyzed before are served from the
+        enrichment cache. Cache misses are either analyzed inline or, when
+        deferred, handed to the background enrichment queue and returned with
+        placeholder enrichment. Fast-tier enrichments that are due for an
+        upgrade are analyzed again inline, or served as they are and queued
+        once the queue is short enough for the full tier.
         
         Args:
-            article (dict): Article data containing title and description
+            articles (list): Raw article dictionaries from the API
+            defer (bool): Queue cache misses instead of analyzing them inline.
+                Defaults to True while the enrichment queue is running.
             
         Returns:
-            ArticleTags: Database model instance with AI analysis results
+            list: Enrichment dictionaries (or None on failure) in input order
         """
+        if not articles:
+            return []
+        
+        if defer is None:
+            defer = self.defer_enrichment and self.enrichment_queue.running
+        
         try:
-            # Combine title and description for analysis
-            content = f"{article.get('title', '')} {article.get('description', '')}"
+            hashes = [EnrichmentCache.content_hash(article) for article in articles]
+            cached = self.enrichment_cache.get_many(hashes)
+            
+            # Collect one article per unseen content hash, and fast-tier results due for an upgrade
+            misses = {}
+            upgrades = {}
+            for article, content_hash in zip(articles, hashes):
+                if content_hash not in cached:
+                    misses.setdefault(content_hash, article)
+                elif self.enrichment_cache.needs_upgrade(cached[content_hash]):
+                    upgrades.setdefault(content_hash, article)
+            
+            if upgrades:
+                if not defer:
+                    misses.update(upgrades)
+                elif self.enrichment_queue.size() <= self.fast_tier_backlog:
+                    self.enrichment_queue.submit(upgrades)
+            
+            if misses:
+                logger.info(f"Enrichment cache: {len(articles) - len(misses)} hits, {len(misses)} misses")
+                if defer:
+                    self.enrichment_queue.submit(misses)
+                    cached.update({content_hash: pending_enrichment() for content_hash in misses})
+                else:
+                    cached.update(self._enrich_articles(misses))
+            
+            return [cached.get(content_hash) for content_hash in hashes]
+        except Exception as e:
+            logger.error(f"Error processing articles with AI: {str(e)}")
+            return [None] * len(articles)
+
+    def _enrich_articles(self, articles):
+        """
+        Analyze articles with AI and save the results.
+        
+        Results go to the enrichment cache and ArticleTags with one commit.
+        Also used as the background enrichment queue's handler.
+        
+        Args:
+            articles (dict): Mapping of content hash to raw article
             
-            # Get AI analysis results
-            analysis = self.ai_service.analyze_article(content, article.get('title', ''))
+        Returns:
+            dict: Mapping of content hash to enrichment for each analyzed article
+        """
+        try:
+            # Combine title and description for analysis
+            batch = [
+                (f"{article.get('title', '')} {article.get('description', '')}", article.get('title', ''))
+                for article in articles.values()
+            ]
+            # Switch to the fast tier while the background queue is backed up
+            tier = 'fast' if self.enrichment_queue.size() > self.fast_tier_backlog else None
+            analyses = self.enrichment_executor.analyze_articles(batch, tier=tier)
+            
+            fresh = {}
+            for content_hash, analysis in zip(articles, analyses):
+                if analysis:
+                    fresh[content_hash] = {
+                        'summary': analysis.get('summary', ''),
+                        'sentiment': analysis.get('sentiment', {}).get('label', 'NEUTRAL'),
+                        'tags': analysis.get('tags', []),
+                        'tier': analysis.get('tier', 'full')
+                    }
+            
+            self.enrichment_cache.put_many(fresh)
+            self._save_article_tags(
+                [(articles[content_hash], enrichment) for content_hash, enrichment in fresh.items()]
+            )
+            
+            # Save the whole batch to database
+            db.session.commit()
+            return fresh
+        except Exception as e:
+            logger.error(f"Error enriching articles: {str(e)}")
+            db.session.rollback()
+            return {}
+
+    def backfill_enrichments(self, limit=None, batch_size=200):
+        """
+        Enrich stored articles that have no cached enrichment yet, or only a
+        fast-tier one that is due for an upgrade.
+        
+        Articles are read newest first in batches; each batch's cache misses
+        go through the enrichment executor, so a backfill can use every core
+        when AI_PROCESS_WORKERS is set.
+        
+        Args:
+            limit (int): Maximum number of stored articles to check, or None for all
+            batch_size (int): Articles read and enriched per round
             
-            # Create or update article tags in database
-            article_tags = ArticleTags.query.filter_by(article_id=article.get('article_id')).first()
+        Returns:
+            int: Number of articles enriched
+        """
+        enriched = 0
+        query = Article.query.order_by(Article.id.desc())
+        if limit:
+            query = query.limit(limit)
+        
+        batch = []
+        for row in query.yield_per(batch_size):
+            batch.append({'title': row.title, 'description': row.description, 'link': row.url})
+            if len(batch) >= batch_size:
+                enriched += self._backfill_batch(batch)
+                batch = []
+        if batch:
+            enriched += self._backfill_batch(batch)
+        return enriched
+
+    def _backfill_batch(self, articles):
+        """Enrich the articles of one backfill batch that are not cached yet."""
+        hashes = [EnrichmentCache.content_hash(article) for article in articles]
+        cached = self.enrichment_cache.get_many(hashes)
+        misses = {}
+        for article, content_hash in zip(articles, hashes):
+            if content_hash not in cached or self.enrichment_cache.needs_upgrade(cached[content_hash]):
+                misses[content_hash] = article
+        if not misses:
+            return 0
+        fresh = self._enrich_articles(misses)
+        logger.info(f"Backfill: enriched {len(fresh)} of {len(articles)} articles")
+        return len(fresh)
+
+    def _save_article_tags(self, enriched_articles):
+        """
+        Create or update ArticleTags rows for freshly enriched articles.
+        
+        Existing rows are loaded with one query; the caller commits the session.
+        
+        Args:
+            enriched_articles (list): List of (article, enrichment) tuples
+        """
+        article_ids = [article.get('article_id') for article, _ in enriched_articles if article.get('article_id')]
+        if not article_ids:
+            return
+        
+        existing = {
+            tags.article_id: tags
+            for tags in ArticleTags.query.filter(ArticleTags.article_id.in_(article_ids)).all()
+        }
+        for article, enrichment in enriched_articles:
+            article_id = article.get('article_id')
+            if not article_id:
+                continue
+            article_tags = existing.get(article_id)
             if not article_tags:
-                article_tags = ArticleTags(article_id=article.get('article_id'))
+                article_tags = ArticleTags(article_id=article_id)
+                existing[article_id] = article_tags
+            article_tags.tags = json.dumps(enrichment['tags'])
+            article_tags.summary = enrichment['summary']
+            article_tags.sentiment = enrichment['sentiment']
+            db.session.add(article_tags)
+
+    def _format_article(self, article, article_id, enrichment):
+        """
+        Build the article dictionary used by templates and the JSON API.
+        
+        Args:
+            article (dict): Raw article data from the API
+            article_id (str): Unique article ID
+            enrichment (dict): AI enrichment for the article, or None
             
-            # Update tags with AI analysis results
-            article_tags.tags = analysis.get('tags', [])
-            article_tags.summary = analysis.get('summary', '')
-            article_tags.sentiment = analysis.get('sentiment', {}).get('label', 'NEUTRAL')
+        Returns:
+            dict: Formatted article
+        """
+        formatted = {
+            'title': article.get('title', 'Untitled Article'),
+            'description': article.get('description', 'No description available'),
+            'image_url': article.get('image_url'),
+            'source': article.get('source_id', 'Unknown Source'),
+            'published_at': self._format_date(article.get('pubDate')),
+            'url': article.get('link', '#'),
+            'id': article_id,
+            'summary': enrichment['summary'] if enrichment else None,
+            'sentiment': enrichment['sentiment'] if enrichment else None,
+            'tags': enrichment['tags'] if enrichment else []
+        }
+        if enrichment and enrichment.get('pending'):
+            formatted['enrichment_pending'] = True
+        return formatted
+
+    def fill_pending_enrichments(self, articles):
+        """
+        Fill in placeholders whose enrichment has since finished.
+        
+        Covers articles that were cached after the background worker already
+        wrote its results back. Articles that are still missing and no longer
+        queued (dropped from a full queue, or their batch failed) are submitted
+        again.
+        
+        Args:
+            articles (list): Formatted articles, updated in place
             
-            # Save to database
-            db.session.add(article_tags)
-            db.session.commit()
+        Returns:
+            bool: True if any article was updated
+        """
+        pending = [article for article in articles if article.get('enrichment_pending')]
+        if not pending:
+            return False
+        found = self.enrichment_cache.get_many([EnrichmentCache.content_hash(article) for article in pending])
+        
+        # Resubmit articles nobody is working on; submit() skips those still queued
+        if self.enrichment_queue.running:
+            missing = {}
+            for article in pending:
+                content_hash = EnrichmentCache.content_hash(article)
+                if content_hash not in found:
+                    missing[content_hash] = {
+                        'title': article.get('title'),
+                        'description': article.get('description'),
+                        'link': article.get('url'),
+                        'article_id': article.get('id')
+                    }
+            if missing:
+                self.enrichment_queue.submit(missing)
+        
+        enrichments_by_url = {
+            article['url']: found[EnrichmentCache.content_hash(article)]
+            for article in pending
+            if EnrichmentCache.content_hash(article) in found
+        }
+        return self.apply_enrichments(articles, enrichments_by_url)
+
+    @staticmethod
+    def apply_enrichments(articles, enrichments_by_url):
+        """
+        Fill in placeholder enrichment on already formatted articles.
+        
+        Args:
+            articles (list): Formatted articles, updated in place
+            enrichments_by_url (dict): Mapping of article URL to enrichment
             
-            return article_tags
-        except Exception as e:
-            logger.error(f"Error processing article with AI: {str(e)}")
-            return None
+        Returns:
+            bool: True if any article was updated
+        """
+        updated = False
+        for article in articles:
+            if not article.get('enrichment_pending'):
+                continue
+            enrichment = enrichments_by_url.get(article.get('url'))
+            if enrichment:
+                article['summary'] = enrichment['summary']
+                article['sentiment'] = enrichment['sentiment']
+                article['tags'] = enrichment['tags']
+                del article['enrichment_pending']
+                updated = True
+        return updated
 
-    def _make_api_request(self, params):
+    def _make_api_request(self, params, priority=INTERACTIVE):
         """
         Make API request with fallback key support.
         
+        Each request spends one credit from a key chosen by the quota manager,
+        which sheds low-priority requests when the budget runs low. The next
+        key is only tried when the failure was down to the key or the server,
+        not the request itself. Every HTTP attempt is a paid request, so the
+        shared client's own retries are disabled here: a rate-limited or 5xx
+        response is retried on the next key, after the quota manager has
+        admitted and counted that attempt too.
+        
         Args:
             params (dict): Request parameters
+            priority (str): Quota priority class (INTERACTIVE, PREFETCH or REFRESH)
             
         Returns:
-            Response: API response object or None if request fails
+            Response: API response object or None if request fails or is shed
         """
-        # Try with main API key
-        params['apikey'] = self.api_key
-        try:
-            response = requests.get(self.base_url, params=params)
-            if response.status_code == 200:
+        response = None
+        tried = ()
+        while True:
+            acquired = self.quota.acquire(priority, exclude=tried)
+            if not acquired:
                 return response
-            logger.warning(f"Primary API key failed with status {response.status_code}. Trying fallback key if available.")
-        except Exception as e:
-            logger.warning(f"Primary API key request error: {e}. Trying fallback key if available.")
-            
-        # Try with fallback key if available
-        if self.api_key_fallback:
-            params['apikey'] = self.api_key_fallback
+            label, params['apikey'] = acquired
+            tried += (label,)
             try:
-                response = requests.get(self.base_url, params=params)
-                return response
+                response = http_client.get(self.base_url, params=params, max_retries=0)
             except Exception as e:
-                logger.error(f"Fallback API key request error: {e}")
-        return None
+                logger.warning(f"API request with {label} key failed: {e}")
+                response = None
+            self.quota.record(label, response)
+            
+            if response is not None and response.status_code not in KEY_FAILURE_STATUSES:
+                return response
+            status = response.status_code if response is not None else 'no response'
+            logger.warning(f"API request with {label} key failed ({status}). Trying the next key if it has budget.")
 
-    def _detect_similar_content(self, articles):
+    def _detect_similar_content(self, articles, index=None):
         """
-        Detect and remove articles with similar content using TF-IDF and cosine similarity.
+        Detect and remove near-duplicate articles using the MinHash/LSH index.
+        
+        By default articles are checked against everything ingested in the
+        recent window, across feeds and pages, and new articles are added to
+        the index as they pass.
         
         Args:
             articles (list): List of article dictionaries
+            index (NearDuplicateIndex): Index to use instead of the shared one
             
         Returns:
             list: Filtered list of unique articles
         """
         if not articles:
             return articles
-
-        # Combine title and description for better comparison
-        texts = [f"{article['title']} {article['description']}" for article in articles]
         
+        index = index or self.dedup_index
         try:
-            # Create TF-IDF matrix for text comparison
-            tfidf_matrix = self.vectorizer.fit_transform(texts)
-            
-            # Calculate cosine similarity between articles
-            similarity_matrix = cosine_similarity(tfidf_matrix)
-            
-            # Find and remove similar articles
             unique_articles = []
-            seen_indices = set()
-            
-            for i in range(len(articles)):
-                if i in seen_indices:
+            for article in articles:
+                # Search suggestions are not articles
+                if article.get('is_suggestion'):
+                    unique_articles.append(article)
                     continue
-                    
-                unique_articles.append(articles[i])
-                seen_indices.add(i)
                 
-                # Check similarity with remaining articles
-                for j in range(i + 1, len(articles)):
-                    if j in seen_indices:
-                        continue
-                        
-                    if similarity_matrix[i, j] > self.similarity_threshold:
-                        logger.info(f"Found similar articles: '{articles[i]['title']}' and '{articles[j]['title']}'")
-                        seen_indices.add(j)
+                # Combine title and description for better comparison
+                text = f"{article['title']} {article.get('description', '')}"
+                duplicate_of = index.check_and_add(article['url'], text)
+                if duplicate_of:
+                    logger.info(f"Found similar articles: '{article['title']}' duplicates {duplicate_of}")
+                    continue
+                unique_articles.append(article)
             
             logger.info(f"Removed {len(articles) - len(unique_articles)} similar articles")
             return unique_articles
@@ -207,9 +484,9 @@ class NewsService:
             logger.error(f"Error in content similarity detection: {str(e)}")
             return articles
 
-    def get_headlines(self, page_size=10, page=0, category=None):
+    def headline_params(self, page_size=10, page=0, category=None):
         """
-        Fetch headlines from the news API.
+        Build API parameters for a headlines request.
         
         Args:
             page_size (int): Number of articles per page
@@ -217,7 +494,7 @@ class NewsService:
             category (str): News category filter
             
         Returns:
-            tuple: (list of articles, next page token)
+            dict: Request parameters
         """
         params = {
             'language': self.default_language,
@@ -229,70 +506,18 @@ class NewsService:
             params['page'] = page
         if category:
             params['category'] = category
-            
-        try:
-            logger.info(f"Fetching headlines with params: {params}")
-            response = self._make_api_request(params)
-            if not response:
-                logger.error("No response from NewsData API (headlines)")
-                return [], None
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get('status') != 'success':
-                logger.error(f"API Error response: {data}")
-                return [], None
-                
-            next_page = data.get('nextPage')
-            logger.info(f"Received next_page token: {next_page}")
-            
-            results = data.get('results', [])
-            logger.info(f"Received {len(results)} articles from API")
-            
-            # Process and deduplicate articles
-            seen_article_ids = set()
-            articles = []
-            
-            for article in results:
-                # Skip invalid articles
-                if not article.get('description') or not article.get('link'):
-                    continue
-                
-                # Create unique article ID
-                article_id = article.get('article_id') or article.get('link')
-                
-                # Skip duplicates
-                if article_id in seen_article_ids:
-                    continue
-                
-                seen_article_ids.add(article_id)
-                
-                # Process article with AI
-                article_tags = self._process_article_with_ai(article)
-                    
-                articles.append({
-                    'title': article.get('title', 'Untitled Article'),
-                    'description': article.get('description', 'No description available'),
-                    'image_url': article.get('image_url'),
-                    'source': article.get('source_id', 'Unknown Source'),
-                    'published_at': self._format_date(article.get('pubDate')),
-                    'url': article.get('link', '#'),
-                    'id': article_id,
-                    'summary': article_tags.summary if article_tags else None,
-                    'sentiment': article_tags.sentiment if article_tags else None,
-                    'tags': article_tags.tags if article_tags else []
-                })
-            
-            # Remove similar content
-            articles = self._detect_similar_content(articles)
-            
-            logger.info(f"Processed {len(articles)} valid articles after deduplication and similarity check")
-            return articles, next_page
-        except Exception as e:
-            logger.error(f"Error fetching headlines: {str(e)}")
-            return [], None
+        return params
 
-    def get_indian_news(self, page_size=10, page=0):
+    def indian_news_params(self, page=0):
+        """
+        Build API parameters for an Indian news request.
+        
+        Args:
+            page (int/str): Page number or token
+            
+        Returns:
+            dict: Request parameters
+        """
         # Use a different approach to get Indian news
         # Try adding a query for India-related content
         params = {
@@ -303,67 +528,179 @@ class NewsService:
         # Only add page parameter if it's not the first page
         if isinstance(page, str) and page:
             params['page'] = page
+        return params
+
+    def _fetch_results(self, params, label, priority=INTERACTIVE):
+        """
+        Fetch one page of raw results from the news API.
+        
+        Safe to call from worker threads: it does no database or AI work.
+        
+        Args:
+            params (dict): Request parameters
+            label (str): Feed name used in log messages
+            priority (str): Quota priority class of the request
             
+        Returns:
+            tuple: (list of raw articles, next page token), or None on failure
+        """
         try:
-            logger.info(f"Fetching Indian news with params: {params}")
-            response = self._make_api_request(params)
+            logger.info(f"Fetching {label} with params: {params}")
+            response = self._make_api_request(params, priority)
             if not response:
-                logger.error("No response from NewsData API (indian news)")
-                return [], None
+                logger.error(f"No response from NewsData API ({label})")
+                return None
             response.raise_for_status()
             data = response.json()
             
             if data.get('status') != 'success':
-                logger.error(f"API Error response for Indian news: {data}")
-                return [], None
+                logger.error(f"API Error response for {label}: {data}")
+                return None
                 
             next_page = data.get('nextPage')
-            logger.info(f"Received next_page token for Indian news: {next_page}")
+            logger.info(f"Received next_page token for {label}: {next_page}")
             
             results = data.get('results', [])
-            logger.info(f"Received {len(results)} Indian news articles from API")
+            logger.info(f"Received {len(results)} {label} articles from API")
+            return results, next_page
+        except Exception as e:
+            logger.error(f"Error fetching {label}: {str(e)}")
+            return None
+
+    def _build_feed(self, results, label, defer=None):
+        """
+        Turn raw API results into enriched, deduplicated articles.
+        
+        Args:
+            results (list): Raw article dictionaries from the API
+            label (str): Feed name used in log messages
+            defer (bool): Passed to _process_articles_with_ai
             
-            articles = []
-            for article in results:
-                # Skip articles without descriptions or links
-                if not article.get('description') or not article.get('link'):
-                    continue
-                
-                # Create a unique article ID based on url or title
-                article_id = article.get('article_id') or article.get('link')
-                
-                # Process article with AI
-                article_tags = self._process_article_with_ai(article)
-                    
-                articles.append({
-                    'title': article.get('title', 'Untitled Article'),
-                    'description': article.get('description', 'No description available'),
-                    'image_url': article.get('image_url'),
-                    'source': article.get('source_id', 'Unknown Source'),
-                    'published_at': self._format_date(article.get('pubDate')),
-                    'url': article.get('link', '#'),
-                    'id': article_id,
-                    'summary': article_tags.summary if article_tags else None,
-                    'sentiment': article_tags.sentiment if article_tags else None,
-                    'tags': article_tags.tags if article_tags else []
-                })
+        Returns:
+            list: Formatted articles
+        """
+        # Process and deduplicate articles
+        seen_article_ids = set()
+        valid_articles = []
+        
+        for article in results:
+            # Skip invalid articles
+            if not article.get('description') or not article.get('link'):
+                continue
             
-            # Remove similar content
-            articles = self._detect_similar_content(articles)
+            # Create unique article ID
+            article_id = article.get('article_id') or article.get('link')
             
-            logger.info(f"Processed {len(articles)} valid Indian news articles after similarity check")
-            return articles, next_page
-        except Exception as e:
-            logger.error(f"Error fetching Indian news: {str(e)}")
+            # Skip duplicates
+            if article_id in seen_article_ids:
+                continue
+            
+            seen_article_ids.add(article_id)
+            valid_articles.append((article, article_id))
+        
+        # Process all articles with AI in one batch
+        enrichments = self._process_articles_with_ai([article for article, _ in valid_articles], defer=defer)
+        articles = [
+            self._format_article(article, article_id, enrichment)
+            for (article, article_id), enrichment in zip(valid_articles, enrichments)
+        ]
+        
+        # Remove similar content
+        articles = self._detect_similar_content(articles)
+        
+        logger.info(f"Processed {len(articles)} valid {label} articles after deduplication and similarity check")
+        return articles
+
+    def fetch_feeds(self, feeds, max_workers=None, defer=None, priority=INTERACTIVE):
+        """
+        Fetch several feeds concurrently and enrich each one as it arrives.
+        
+        Upstream requests run on a bounded thread pool. Enrichment and database
+        work happen in the calling thread (which holds the app context), one
+        feed at a time in completion order, so it overlaps with the requests
+        that are still in flight.
+        
+        Args:
+            feeds (dict): Mapping of feed key to request parameters
+            max_workers (int): Maximum concurrent requests
+            defer (bool): Passed to _process_articles_with_ai
+            priority (str): Quota priority class of the requests
+            
+        Yields:
+            tuple: (feed key, list of articles, next page token)
+        """
+        if not feeds:
+            return
+        
+        max_workers = min(max_workers or self.fetch_workers, len(feeds))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='news-fetch') as executor:
+            futures = {
+                executor.submit(self._fetch_results, params, key, priority): key
+                for key, params in feeds.items()
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                fetched = future.result()
+                if not fetched:
+                    yield key, [], None
+                    continue
+                results, next_page = fetched
+                yield key, self._build_feed(results, key, defer=defer), next_page
+
+    def get_headlines(self, page_size=10, page=0, category=None, priority=INTERACTIVE):
+        """
+        Fetch headlines from the news API.
+        
+        Args:
+            page_size (int): Number of articles per page
+            page (int/str): Page number or token
+            category (str): News category filter
+            priority (str): Quota priority class of the request
+            
+        Returns:
+            tuple: (list of articles, next page token)
+        """
+        fetched = self._fetch_results(self.headline_params(page_size, page, category), 'headlines', priority)
+        if not fetched:
             return [], None
+        results, next_page = fetched
+        return self._build_feed(results, 'headlines'), next_page
 
-    def get_global_and_local_news(self):
-        # Fetch global news - general headlines without any query
-        global_news, global_next = self.get_headlines(page_size=5, page=0)
-        logger.info(f"Fetched {len(global_news)} global news articles")
+    def get_indian_news(self, page_size=10, page=0, priority=INTERACTIVE):
+        fetched = self._fetch_results(self.indian_news_params(page), 'Indian news', priority)
+        if not fetched:
+            return [], None
+        results, next_page = fetched
+        return self._build_feed(results, 'Indian news'), next_page
+
+    def global_and_local_feeds(self):
+        """
+        Build the feed parameters used by get_global_and_local_news.
+        
+        Returns:
+            dict: Mapping of feed key to request parameters
+        """
+        return {
+            # Fetch global news - general headlines without any query
+            'global_news': self.headline_params(page_size=5, page=0),
+            # Fetch Indian news directly rather than using the nextPage from global news
+            'indian_news': self.indian_news_params(page=0)
+        }
+
+    def combine_global_and_local_news(self, global_feed, indian_feed):
+        """
+        Remove overlap between global and Indian news and balance their sizes.
         
-        # Fetch Indian news directly rather than using the nextPage from global news
-        indian_news, indian_next = self.get_indian_news(page_size=5, page=0)
+        Args:
+            global_feed (tuple): (global articles, next page token)
+            indian_feed (tuple): (Indian articles, next page token)
+            
+        Returns:
+            dict: Global and Indian news with their next page tokens
+        """
+        global_news, global_next = global_feed
+        indian_news, indian_next = indian_feed
+        logger.info(f"Fetched {len(global_news)} global news articles")
         logger.info(f"Fetched {len(indian_news)} Indian news articles")
         
         # Make sure there's no overlap between the two sets
@@ -384,7 +721,91 @@ class NewsService:
             'indian_next': indian_next
         }
 
+    def load_global_and_local_news(self):
+        """
+        Load the front page feeds from the database instead of the API.
+        
+        Returns:
+            dict: Same shape as get_global_and_local_news, or None if the
+                database has no recent articles for either feed
+        """
+        global_news = self.article_store.load_feed('global', limit=5)
+        indian_news = self.article_store.load_feed('indian', limit=5)
+        if not global_news or not indian_news:
+            return None
+        news = self.combine_global_and_local_news(
+            (global_news, self.article_store.load_cursor('global')),
+            (indian_news, self.article_store.load_cursor('indian'))
+        )
+        if not news['global_news']:
+            return None
+        return news
+
+    def get_global_and_local_news(self, priority=INTERACTIVE):
+        # Fetch both feeds concurrently
+        feeds = {
+            key: (articles, next_page)
+            for key, articles, next_page in self.fetch_feeds(self.global_and_local_feeds(), priority=priority)
+        }
+        return self.combine_global_and_local_news(feeds['global_news'], feeds['indian_news'])
+
     def search_news(self, query, page=0):
+        """
+        Search news, serving repeated searches from the search cache.
+        
+        Args:
+            query (str): Search query, normalized before lookup and search
+            page (int/str): Page token; falsy for the first page
+            
+        Returns:
+            tuple: (list of articles, next page token)
+        """
+        query = SearchCache.normalize_query(query)
+        if not query:
+            return [], None
+        
+        cached = self.search_cache.get(query, page)
+        if cached is not None:
+            articles, next_page = cached
+            # Pick up background enrichment that finished after the page was cached
+            self.fill_pending_enrichments(articles)
+            return articles, next_page
+        
+        articles, next_page = self._search(query, page)
+        if articles:
+            self.search_cache.put(query, page, (articles, next_page))
+        return articles, next_page
+
+    def _search(self, query, page=0):
+        """
+        Search news, answering from the local full-text index where possible.
+        
+        Local results are paged with 'local:<offset>' tokens. When the local
+        index runs out, the page is topped up with news API results and paging
+        continues with the API's tokens.
+        
+        Args:
+            query (str): Search query
+            page (int/str): Page token; falsy for the first page
+            
+        Returns:
+            tuple: (list of articles, next page token)
+        """
+        if page and not str(page).startswith(LOCAL_PAGE_PREFIX):
+            return self._search_api(query, page)
+        
+        offset = int(str(page)[len(LOCAL_PAGE_PREFIX):] or 0) if page else 0
+        local_articles = self.article_store.search(query, limit=SEARCH_PAGE_SIZE, offset=offset)
+        if len(local_articles) == SEARCH_PAGE_SIZE:
+            logger.info(f"Answered search '{query}' from the local index (offset {offset})")
+            return local_articles, f'{LOCAL_PAGE_PREFIX}{offset + SEARCH_PAGE_SIZE}'
+        
+        # Top up a short local page from the news API
+        api_articles, next_page = self._search_api(query)
+        local_urls = {article['url'] for article in local_articles}
+        return local_articles + [article for article in api_articles if article['url'] not in local_urls], next_page
+
+    def _search_api(self, query, page=0):
         if not self.api_key:
             logger.error("Cannot perform search: API key is missing")
             return [], None
@@ -392,7 +813,7 @@ class NewsService:
         params = {
             'language': self.default_language,
             'q': query,
-            'size': 10,  # Changed from 20 to 10 to comply with API limits
+            'size': SEARCH_PAGE_SIZE,  # Changed from 20 to 10 to comply with API limits
             'category': None  # Allow all categories
         }
         
@@ -433,7 +854,7 @@ class NewsService:
             if suggested_query and suggested_query != query:
                 logger.info(f"Suggested correction: {suggested_query}")
             
-            articles = []
+            valid_articles = []
             seen_urls = set()  # Track seen URLs to prevent duplicates
             
             # Process main search results
@@ -449,22 +870,21 @@ class NewsService:
                 
                 # Create a unique article ID based on url or title
                 article_id = article.get('article_id') or article.get('link')
-                
-                # Process article with AI
-                article_tags = self._process_article_with_ai(article)
-                    
-                articles.append({
-                    'title': article.get('title', 'Untitled Article'),
-                    'description': article.get('description', 'No description available'),
-                    'image_url': article.get('image_url'),
-                    'source': article.get('source_id', 'Unknown Source'),
-                    'published_at': self._format_date(article.get('pubDate')),
-                    'url': article.get('link', '#'),
-                    'id': article_id,
-                    'summary': article_tags.summary if article_tags else None,
-                    'sentiment': article_tags.sentiment if article_tags else None,
-                    'tags': article_tags.tags if article_tags else []
-                })
+                valid_articles.append((article, article_id))
+            
+            # Process all articles with AI in one batch
+            enrichments = self._process_articles_with_ai([article for article, _ in valid_articles])
+            articles = [
+                self._format_article(article, article_id, enrichment)
+                for (article, article_id), enrichment in zip(valid_articles, enrichments)
+            ]
+            
+            # Nothing matched, but the suggested correction may already be cached
+            if not articles and suggested_query:
+                cached = self.search_cache.get(SearchCache.normalize_query(suggested_query))
+                if cached:
+                    logger.info(f"Serving cached results for suggested query: {suggested_query}")
+                    articles = [article for article in cached[0] if not article.get('is_suggestion')]
             
             # If we have suggested corrections, add them to the response
             if suggested_query:
@@ -475,14 +895,17 @@ class NewsService:
                     'is_suggestion': True
                 })
             
-            # Remove similar content
-            articles = self._detect_similar_content(articles)
+            # Remove similar content within this page only, so search results
+            # are not hidden by articles seen in other feeds
+            articles = self._detect_similar_content(
+                articles, index=NearDuplicateIndex(threshold=self.similarity_threshold)
+            )
             
             logger.info(f"Returning {len(articles)} processed articles")
             return articles, next_page
             
         except Exception as e:
-            logger.error(f"Error in search_news: {str(e)}")
+            logger.error(f"Error in _search_api: {str(e)}")
             return [], None
 
     def get_local_news(self, country=None, city=None, state=None):
@@ -514,24 +937,13 @@ class NewsService:
             
             if data.get('status') == 'success':
                 articles = data.get('results', [])
-                processed_articles = []
                 
-                for article in articles:
-                    # Process article with AI
-                    article_tags = self._process_article_with_ai(article)
-                    
-                    processed_articles.append({
-                        'title': article.get('title', 'Untitled Article'),
-                        'description': article.get('description', 'No description available'),
-                        'image_url': article.get('image_url'),
-                        'source': article.get('source_id', 'Unknown Source'),
-                        'published_at': self._format_date(article.get('pubDate')),
-                        'url': article.get('link', '#'),
-                        'id': article.get('article_id') or article.get('link'),
-                        'summary': article_tags.summary if article_tags else None,
-                        'sentiment': article_tags.sentiment if article_tags else None,
-                        'tags': article_tags.tags if article_tags else []
-                    })
+                # Process all articles with AI in one batch
+                enrichments = self._process_articles_with_ai(articles)
+                processed_articles = [
+                    self._format_article(article, article.get('article_id') or article.get('link'), enrichment)
+                    for article, enrichment in zip(articles, enrichments)
+                ]
                 
                 return processed_articles
             else:
@@ -578,21 +990,27 @@ class NewsService:
             data = response.json()
             
             if data.get('status') == 'success':
+                results = [
+                    article for article in data.get('results', [])
+                    if article.get('title') and article.get('link')
+                ]
+                
+                # Process all articles with AI in one batch
+                enrichments = self._process_articles_with_ai(results)
                 articles = []
-                for article in data.get('results', []):
-                    if article.get('title') and article.get('link'):
-                        # Process article with AI
-                        article_tags = self._process_article_with_ai(article)
-                        
-                        articles.append({
-                            'title': article['title'],
-                            'url': article['link'],
-                            'source': article.get('source_id', 'Unknown'),
-                            'published_at': article.get('pubDate', 'N/A'),
-                            'summary': article_tags.summary if article_tags else None,
-                            'sentiment': article_tags.sentiment if article_tags else None,
-                            'tags': article_tags.tags if article_tags else []
-                        })
+                for article, enrichment in zip(results, enrichments):
+                    formatted = {
+                        'title': article['title'],
+                        'url': article['link'],
+                        'source': article.get('source_id', 'Unknown'),
+                        'published_at': article.get('pubDate', 'N/A'),
+                        'summary': enrichment['summary'] if enrichment else None,
+                        'sentiment': enrichment['sentiment'] if enrichment else None,
+                        'tags': enrichment['tags'] if enrichment else []
+                    }
+                    if enrichment and enrichment.get('pending'):
+                        formatted['enrichment_pending'] = True
+                    articles.append(formatted)
                 return articles
             return []
             
@@ -3,13 +3,13 @@ from datetime import datetime, timedelta
 from collections import Counter
 import logging
 import json
-from .ai_service import AIService
+from .ai_service import get_ai_service
 
 logger = logging.getLogger(__name__)
 
 class PersonalizationService:
     def __init__(self):
-        self.ai_service = AIService()
+        self.ai_service = get_ai_service()
 
     def update_user_preferences(self, user_id, article_data):
         """Update user preferences based on reading behavior"""
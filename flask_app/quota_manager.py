@@ -0,0 +1,188 @@
+"""
+Quota Manager Module for SmartNewsHub
+
+This module budgets NewsData.io credits across API keys and request types.
+Each key has a daily credit budget spent through a token bucket: background
+work may only spend credits as fast as they accrue over the day (plus a small
+burst), while user-facing requests may draw on whatever is left. Priority
+classes keep a reserve for users, so prefetches are shed before user searches
+and scheduled refreshes are shed before prefetches.
+
+Spend counters and cooldowns live in the shared cache, so every worker on a
+host draws from the same budget.
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from flask_caching.backends import SimpleCache
+
+logger = logging.getLogger(__name__)
+
+# Priority classes, most important first
+INTERACTIVE = 'interactive'  # User-facing page loads and searches
+PREFETCH = 'prefetch'        # Speculative next-page fetches
+REFRESH = 'refresh'          # Scheduled and background feed refreshes
+PRIORITIES = (INTERACTIVE, PREFETCH, REFRESH)
+
+# Response headers that report remaining credits
+_REMAINING_HEADERS = ('X-RateLimit-Remaining', 'X-Api-Credits-Remaining', 'X-Credits-Remaining')
+
+class QuotaManager:
+    """
+    Per-key credit budgets with priority-based admission.
+    """
+
+    def __init__(self, keys, daily_credits=None, burst=None, reserves=None, store=None):
+        """
+        Initialize the quota manager.
+
+        Args:
+            keys (list): (label, API key) pairs in order of preference; labels
+                are used in logs and monitoring instead of the keys themselves
+            daily_credits (int): Credits per key per day (NEWSDATA_DAILY_CREDITS,
+                default 200)
+            burst (int): Credits background work may spend ahead of the
+                paced rate (QUOTA_BURST, default 20)
+            reserves (dict): Fraction of the daily budget each priority class
+                must leave unspent (QUOTA_RESERVE_PREFETCH default 0.1,
+                QUOTA_RESERVE_REFRESH default 0.25)
+            store: Cache backend for shared counters; per-process if omitted
+        """
+        self.keys = [(label, key) for label, key in keys if key]
+        self.daily_credits = daily_credits or int(os.getenv('NEWSDATA_DAILY_CREDITS', 200))
+        self.burst = burst or int(os.getenv('QUOTA_BURST', 20))
+        self.reserves = reserves or {
+            INTERACTIVE: 0.0,
+            PREFETCH: float(os.getenv('QUOTA_RESERVE_PREFETCH', 0.1)),
+            REFRESH: float(os.getenv('QUOTA_RESERVE_REFRESH', 0.25))
+        }
+        self.store = store or SimpleCache()
+
+        # Admission counters for monitoring
+        self._lock = threading.Lock()
+        self.granted = {priority: 0 for priority in PRIORITIES}
+        self.shed = {priority: 0 for priority in PRIORITIES}
+
+    @staticmethod
+    def _day():
+        return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+    @staticmethod
+    def _seconds_into_day():
+        now = datetime.now(timezone.utc)
+        return now.hour * 3600 + now.minute * 60 + now.second
+
+    def _spent(self, label):
+        return self.store.get(f'quota:{label}:{self._day()}:spent') or 0
+
+    def _remaining(self, label):
+        """Credits left today, from our own count or the API's report if lower."""
+        remaining = self.daily_credits - self._spent(label)
+        reported = self.store.get(f'quota:{label}:reported_remaining')
+        if reported is not None:
+            remaining = min(remaining, reported)
+        return max(remaining, 0)
+
+    def _tokens(self, label):
+        """Credits background work may spend now: the paced allowance minus today's spend."""
+        accrued = self.daily_credits * self._seconds_into_day() / 86400
+        return min(self.daily_credits, self.burst + accrued) - self._spent(label)
+
+    def _cooling_down(self, label):
+        return bool(self.store.get(f'quota:{label}:cooldown'))
+
+    def _admits(self, label, priority):
+        """Whether a key has budget for a request of the given priority."""
+        if self._cooling_down(label):
+            return False
+        if self._remaining(label) <= self.daily_credits * self.reserves[priority]:
+            return False
+        # Only background work is paced; users may spend the rest of the day's credits
+        return priority == INTERACTIVE or self._tokens(label) >= 1
+
+    def acquire(self, priority=INTERACTIVE, exclude=()):
+        """
+        Pick a key with budget for a request and spend one credit from it.
+
+        Args:
+            priority (str): One of INTERACTIVE, PREFETCH or REFRESH
+            exclude (tuple): Labels of keys not to use, e.g. one that just failed
+
+        Returns:
+            tuple: (label, API key), or None if the request should be shed
+        """
+        for label, key in self.keys:
+            if label in exclude or not self._admits(label, priority):
+                continue
+            spent_key = f'quota:{label}:{self._day()}:spent'
+            if not self.store.add(spent_key, 1, timeout=2 * 86400):
+                self.store.inc(spent_key)
+            with self._lock:
+                self.granted[priority] += 1
+            return label, key
+
+        with self._lock:
+            self.shed[priority] += 1
+        logger.warning(f"Shedding {priority} API request: no key has budget left for it")
+        return None
+
+    def record(self, label, response):
+        """
+        Update a key's budget from an API response.
+
+        Args:
+            label (str): Label of the key the request used
+            response: requests.Response, or None if the request failed
+        """
+        if response is None:
+            return
+
+        for header in _REMAINING_HEADERS:
+            value = response.headers.get(header)
+            if value is not None:
+                try:
+                    self.store.set(f'quota:{label}:reported_remaining', int(float(value)), timeout=3600)
+                except ValueError:
+                    pass
+                break
+
+        if response.status_code == 429:
+            # Rate limited or out of credits: stop using this key for a while
+            try:
+                cooldown = int(float(response.headers.get('Retry-After', 900)))
+            except ValueError:
+                cooldown = 900
+            self.store.set(f'quota:{label}:cooldown', True, timeout=max(cooldown, 1))
+            logger.warning(f"API key '{label}' is rate limited; pausing it for {cooldown}s")
+        elif response.status_code in (401, 403):
+            # Invalid or suspended key
+            self.store.set(f'quota:{label}:cooldown', True, timeout=3600)
+            logger.error(f"API key '{label}' was rejected ({response.status_code}); pausing it for an hour")
+
+    def stats(self):
+        """
+        Get the budget of every key and admission counters per priority.
+
+        Returns:
+            dict: Quota state for monitoring
+        """
+        keys = {}
+        for label, _ in self.keys:
+            keys[label] = {
+                'daily_credits': self.daily_credits,
+                'spent_today': self._spent(label),
+                'remaining': self._remaining(label),
+                'background_tokens': round(max(self._tokens(label), 0), 1),
+                'cooling_down': self._cooling_down(label),
+                'admits': {priority: self._admits(label, priority) for priority in PRIORITIES}
+            }
+        with self._lock:
+            return {
+                'keys': keys,
+                'granted': dict(self.granted),
+                'shed': dict(self.shed),
+                'checked_at': time.time()
+            }
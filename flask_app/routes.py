@@ -1,6 +1,9 @@
-from flask import Blueprint, render_template, request, url_for, redirect, jsonify, session, flash, current_app, send_from_directory
-from flask_app import cache, news_service, facts_service
+from flask import Blueprint, render_template, request, url_for, redirect, jsonify, session, flash, current_app, send_from_directory, abort
+from flask_app import cache, feed_cache, page_cache, news_service, facts_service, single_flight
+from flask_app.quota_manager import INTERACTIVE, PREFETCH, REFRESH
+from flask_app.utils.seen_set import SeenSet
 from urllib.parse import quote_plus
+import hmac
 import os
 import logging
 
@@ -12,51 +15,212 @@ main = Blueprint('main', __name__)
 # Update categories to match NewsData.io categories
 VALID_CATEGORIES = ['top', 'world', 'business', 'entertainment', 'health', 'science', 'sports', 'technology', 'politics', 'india']
 
-# Dictionary to store the article IDs we've already shown to avoid duplication
-SHOWN_ARTICLES = {
-    'global': set(),
-    'indian': set(),
-}
+# Bounds on the pagination state kept per session
+MAX_SHOWN_PER_FEED = int(os.getenv('SESSION_SHOWN_LIMIT', 500))
+MAX_SEARCH_FEEDS = 5
+
+def _feed_state(feed):
+    """Return (next page token, SeenSet of shown article URLs) for a feed in this session."""
+    state = session.get('feeds', {}).get(feed, {})
+    seen = state.get('seen')
+    if not isinstance(seen, SeenSet):
+        seen = SeenSet(MAX_SHOWN_PER_FEED)
+    return state.get('next_page', ''), seen
+
+def _save_feed_state(feed, next_page, seen):
+    """Store a feed's pagination state, keeping only the most recent searches."""
+    feeds = session.get('feeds', {})
+    # Re-insert so the most recently used feeds come last
+    feeds.pop(feed, None)
+    feeds[feed] = {'next_page': next_page, 'seen': seen}
+    searches = [name for name in feeds if name.startswith('search:')]
+    for name in searches[:-MAX_SEARCH_FEEDS]:
+        del feeds[name]
+    session['feeds'] = feeds
+
+def _filter_unseen(articles, seen):
+    """Return the articles not shown yet and mark them as shown."""
+    return [article for article in articles if seen.add(article['url'])]
+
+def _cached_front_page():
+    """Return the cached front page feeds (possibly stale), or None if either feed is missing."""
+    global_news = feed_cache.get('global_news')
+    indian_news = feed_cache.get('indian_news')
+    if not global_news or not indian_news:
+        return None
+    return {
+        'global_news': global_news,
+        'indian_news': indian_news,
+        'global_next': feed_cache.get('global_next_page'),
+        'indian_next': feed_cache.get('indian_next_page')
+    }
+
+def _store_front_page(news, fresh=True):
+    """
+    Cache the front page feeds and mark them fresh.
+    
+    Feeds loaded from the database are stored with fresh=False, so they are
+    served at once but revalidated from the API.
+    
+    An empty result (API error, timeout or a shed request) is not stored, so
+    the stale feeds keep being served until a refresh succeeds.
+    
+    Returns:
+        bool: True if the feeds were stored
+    """
+    if not news['global_news'] or not news['indian_news']:
+        logger.warning("Front page refresh returned no articles; keeping the cached feeds")
+        return False
+    feed_cache.set_group('front_page', {
+        'global_news': news['global_news'],
+        'indian_news': news['indian_news'],
+        'global_next_page': news['global_next'],
+        'indian_next_page': news['indian_next']
+    }, fresh=fresh)
+    return True
+
+def _load_front_page():
+    """Load the front page feeds from the database or the API and cache them."""
+    news = news_service.load_global_and_local_news()
+    if not news:
+        return _refresh_front_page()
+    # Database rows may be hours old: serve them now and revalidate
+    _store_front_page(news, fresh=False)
+    feed_cache.revalidate(
+        'front_page',
+        lambda: _store_front_page(_fetch_front_page(REFRESH)),
+        app=current_app._get_current_object()
+    )
+    return news
+
+def _fetch_front_page(priority=INTERACTIVE):
+    """Fetch the front page feeds from the API and persist them."""
+    news = news_service.get_global_and_local_news(priority=priority)
+    news_service.article_store.save_feeds(
+        {'global': news['global_news'], 'indian': news['indian_news']},
+        {'global': news['global_next'], 'indian': news['indian_next']}
+    )
+    return news
+
+def _refresh_front_page(priority=INTERACTIVE):
+    """Fetch the front page feeds from the API, persist them and cache them."""
+    news = _fetch_front_page(priority)
+    _store_front_page(news)
+    return news
+
+def _cached_category(category_name):
+    """Return the cached (articles, next page) of a category (possibly stale), or None if missing."""
+    articles = feed_cache.get(f'category_{category_name}')
+    if not articles:
+        return None
+    return articles, feed_cache.get(f'category_{category_name}_next_page')
+
+def _store_category(category_name, articles, next_page, fresh=True):
+    """
+    Cache a category feed and mark it fresh, unless the fetch returned nothing.
+    
+    Feeds loaded from the database are stored with fresh=False so they are
+    revalidated from the API.
+    
+    Returns:
+        bool: True if the feed was stored
+    """
+    if not articles:
+        logger.warning(f"Refresh of category {category_name} returned no articles; keeping the cached feed")
+        return False
+    key = f'category_{category_name}'
+    feed_cache.set_group(key, {key: articles, f'{key}_next_page': next_page}, fresh=fresh)
+    return True
+
+def _load_category(category_name):
+    """Load a category from the database or the API and cache it."""
+    articles = news_service.article_store.load_feed(category_name)
+    if not articles:
+        return _refresh_category(category_name)
+    # Continue paging where the last API fetch stopped, and revalidate the old rows
+    next_page = news_service.article_store.load_cursor(category_name)
+    _store_category(category_name, articles, next_page, fresh=False)
+    feed_cache.revalidate(
+        f'category_{category_name}',
+        lambda: _store_category(category_name, *_fetch_category(category_name, REFRESH)),
+        app=current_app._get_current_object()
+    )
+    return articles, next_page
+
+def _fetch_category(category_name, priority=INTERACTIVE):
+    """Fetch a category from the API and persist it."""
+    articles, next_page = news_service.get_headlines(category=category_name, priority=priority)
+    news_service.article_store.save_feeds({category_name: articles}, {category_name: next_page})
+    return articles, next_page
+
+def _refresh_category(category_name, priority=INTERACTIVE):
+    """Fetch a category from the API, persist it and cache it."""
+    articles, next_page = _fetch_category(category_name, priority)
+    _store_category(category_name, articles, next_page)
+    return articles, next_page
+
+def _page_fetcher(feed, priority=INTERACTIVE):
+    """Return fetch(page) -> (articles, next page token) for a load-more feed."""
+    if feed == 'global':
+        return lambda page: news_service.get_headlines(page=page, priority=priority)
+    if feed == 'indian':
+        return lambda page: news_service.get_indian_news(page=page, priority=priority)
+    category_name = feed[len('category_'):]
+    return lambda page: news_service.get_headlines(category=category_name, page=page, priority=priority)
+
+def _prefetch_page(feed, page):
+    """Warm the shared page cache with the page a visitor is likely to request next."""
+    page_cache.prefetch(feed, page, _page_fetcher(feed, PREFETCH), app=current_app._get_current_object())
+
+def _get_page(feed, page):
+    """Get a load-more page from the shared page cache and prefetch the page after it."""
+    articles, next_page = page_cache.get_page(feed, page, _page_fetcher(feed))
+    if news_service.fill_pending_enrichments(articles):
+        # Pick up background enrichment that finished after the page was cached
+        page_cache.set_page(feed, page, articles, next_page)
+    _prefetch_page(feed, next_page)
+    return articles, next_page
 
 @main.route('/')
 def index():
     # Try to get cached data first
-    global_news = cache.get('global_news')
-    indian_news = cache.get('indian_news')
+    news = _cached_front_page()
     daily_fact = cache.get('daily_fact')
-    global_next_page = cache.get('global_next_page')
-    indian_next_page = cache.get('indian_next_page')
     
-    # Initialize or clear the shown articles for a new session
-    session.pop('shown_global_articles', None)
-    session.pop('shown_indian_articles', None)
-    
-    # If cache is empty, fetch fresh data
-    if not global_news or not indian_news:
-        news = news_service.get_global_and_local_news()
-        global_news = news['global_news']
-        indian_news = news['indian_news']
-        global_next_page = news['global_next']
-        indian_next_page = news['indian_next']
-        
-        # Cache the fresh data
-        cache.set('global_news', global_news, timeout=1800)
-        cache.set('indian_news', indian_news, timeout=1800)
-        cache.set('global_next_page', global_next_page, timeout=1800)
-        cache.set('indian_next_page', indian_next_page, timeout=1800)
+    if news:
+        # Pick up background enrichment that finished after the feed was cached
+        if news_service.fill_pending_enrichments(news['global_news']):
+            feed_cache.set('global_news', news['global_news'])
+        if news_service.fill_pending_enrichments(news['indian_news']):
+            feed_cache.set('indian_news', news['indian_news'])
+        # Serve a stale feed now and replace it in the background
+        if not feed_cache.is_fresh('front_page'):
+            feed_cache.revalidate(
+                'front_page',
+                lambda: _store_front_page(_fetch_front_page(REFRESH)),
+                app=current_app._get_current_object()
+            )
+    else:
+        # Only a missing or hard-expired feed blocks; load it once for all requests and workers
+        news = single_flight.do('global_and_local_news', _load_front_page, recheck=_cached_front_page)
+    
+    global_news = news['global_news']
+    indian_news = news['indian_news']
+    global_next_page = news['global_next']
+    indian_next_page = news['indian_next']
     
     # Get daily fact if not in cache
     if not daily_fact:
         daily_fact = facts_service.get_daily_fact()
         cache.set('daily_fact', daily_fact, timeout=86400)  # 24 hours
     
-    # Store next page tokens in session for load more functionality
-    session['global_next_page'] = global_next_page
-    session['indian_next_page'] = indian_next_page
-    
-    # Track which articles we've shown to avoid duplication
-    session['shown_global_articles'] = [article['url'] for article in global_news]
-    session['shown_indian_articles'] = [article['url'] for article in indian_news]
+    # Start the load more state over, tracking which articles we've shown to avoid duplication
+    for feed, next_page, articles in (('global', global_next_page, global_news), ('indian', indian_next_page, indian_news)):
+        seen = SeenSet(MAX_SHOWN_PER_FEED)
+        seen.update(article['url'] for article in articles)
+        _save_feed_state(feed, next_page, seen)
+    _prefetch_page('global', global_next_page)
+    _prefetch_page('indian', indian_next_page)
     
     return render_template('index.html', 
                          global_news=global_news,
@@ -82,28 +246,34 @@ def category(category_name):
                             categories=VALID_CATEGORIES)
     
     # Try to get cached data first
-    cache_key = f'category_{category_name_lower}'
-    articles = cache.get(cache_key)
-    next_page = cache.get(f'{cache_key}_next_page')
-    
-    # If cache is empty, fetch fresh data
-    if not articles:
-        articles, next_page = news_service.get_headlines(category=category_name_lower)
-        cache.set(cache_key, articles, timeout=1800)
-        cache.set(f'{cache_key}_next_page', next_page, timeout=1800)
-    
-    # Get seen articles from session or initialize empty set
-    seen_articles = set(session.get(f'seen_{category_name_lower}_articles', []))
-    
-    # Filter out seen articles
-    new_articles = [article for article in articles if article['id'] not in seen_articles]
-    
-    # Update seen articles in session
-    seen_articles.update(article['id'] for article in new_articles)
-    session[f'seen_{category_name_lower}_articles'] = list(seen_articles)
-    
-    # Store next page token in session for load more functionality
-    session[f'category_{category_name_lower}_next_page'] = next_page
+    cached = _cached_category(category_name_lower)
+    if cached:
+        articles, next_page = cached
+        if news_service.fill_pending_enrichments(articles):
+            # Pick up background enrichment that finished after the feed was cached
+            feed_cache.set(f'category_{category_name_lower}', articles)
+        # Serve a stale feed now and replace it in the background
+        if not feed_cache.is_fresh(f'category_{category_name_lower}'):
+            feed_cache.revalidate(
+                f'category_{category_name_lower}',
+                lambda: _store_category(category_name_lower, *_fetch_category(category_name_lower, REFRESH)),
+                app=current_app._get_current_object()
+            )
+    else:
+        # Only a missing or hard-expired feed blocks; load it once for all requests and workers
+        articles, next_page = single_flight.do(
+            f'headlines:category={category_name_lower}',
+            lambda: _load_category(category_name_lower),
+            recheck=lambda: _cached_category(category_name_lower)
+        )
+    
+    # Filter out articles this visitor has already seen
+    _, seen_articles = _feed_state(f'category_{category_name_lower}')
+    new_articles = _filter_unseen(articles, seen_articles)
+    
+    # Update seen articles and the next page token for load more functionality
+    _save_feed_state(f'category_{category_name_lower}', next_page, seen_articles)
+    _prefetch_page(f'category_{category_name_lower}', next_page)
     
     return render_template('category.html',
                          articles=new_articles,
@@ -127,11 +297,8 @@ def search():
         # Debug logging
         current_app.logger.info(f"Found {len(articles)} articles")
         
-        # Store next page token in session for load more functionality
-        session[f'search_{query}_next_page'] = next_page
-        
-        # Store shown articles in session to prevent duplicates
-        session[f'shown_search_{query}_articles'] = []
+        # Store next page token and shown articles in session for load more functionality
+        _save_feed_state(f'search:{query}', next_page, SeenSet(MAX_SHOWN_PER_FEED))
         
         return render_template('search.html', 
                             query=query,
@@ -153,22 +320,16 @@ def random_fact():
 def more_global_news():
     """API endpoint to fetch more global news for the load more button"""
     # Get next page token from session
-    next_page = session.get('global_next_page', '')
-    shown_articles = session.get('shown_global_articles', [])
+    next_page, shown_articles = _feed_state('global')
     
-    # Fetch news with the next page token
-    articles, new_next_page = news_service.get_headlines(page=next_page)
+    # Fetch news with the next page token, shared by every visitor on the same page
+    articles, new_next_page = _get_page('global', next_page)
     
     # Filter out articles we've already shown
-    filtered_articles = []
-    for article in articles:
-        if article['url'] not in shown_articles:
-            filtered_articles.append(article)
-            shown_articles.append(article['url'])
+    filtered_articles = _filter_unseen(articles, shown_articles)
     
     # Update session with new next page token and shown articles
-    session['global_next_page'] = new_next_page
-    session['shown_global_articles'] = shown_articles
+    _save_feed_state('global', new_next_page, shown_articles)
     
     return jsonify({
         'articles': filtered_articles,
@@ -179,22 +340,16 @@ def more_global_news():
 def more_indian_news():
     """API endpoint to fetch more Indian news for the load more button"""
     # Get next page token from session
-    next_page = session.get('indian_next_page', '')
-    shown_articles = session.get('shown_indian_articles', [])
+    next_page, shown_articles = _feed_state('indian')
     
-    # Fetch more Indian news with next page token
-    articles, new_next_page = news_service.get_indian_news(page=next_page)
+    # Fetch more Indian news with next page token, shared by every visitor on the same page
+    articles, new_next_page = _get_page('indian', next_page)
     
     # Filter out articles we've already shown
-    filtered_articles = []
-    for article in articles:
-        if article['url'] not in shown_articles:
-            filtered_articles.append(article)
-            shown_articles.append(article['url'])
+    filtered_articles = _filter_unseen(articles, shown_articles)
     
     # Update session with new next page token and shown articles
-    session['indian_next_page'] = new_next_page
-    session['shown_indian_articles'] = shown_articles
+    _save_feed_state('indian', new_next_page, shown_articles)
     
     return jsonify({
         'articles': filtered_articles,
@@ -205,22 +360,16 @@ def more_indian_news():
 def more_category_news(category_name):
     """API endpoint to fetch more category news for the load more button"""
     # Get next page token from session
-    next_page = session.get(f'category_{category_name}_next_page', '')
-    shown_articles = session.get(f'shown_category_{category_name}_articles', [])
+    next_page, shown_articles = _feed_state(f'category_{category_name}')
     
-    # Fetch more category news with next page token
-    articles, new_next_page = news_service.get_headlines(category=category_name, page=next_page)
+    # Fetch more category news with next page token, shared by every visitor on the same page
+    articles, new_next_page = _get_page(f'category_{category_name}', next_page)
     
     # Filter out articles we've already shown
-    filtered_articles = []
-    for article in articles:
-        if article['url'] not in shown_articles:
-            filtered_articles.append(article)
-            shown_articles.append(article['url'])
+    filtered_articles = _filter_unseen(articles, shown_articles)
     
     # Update session with new next page token and shown articles
-    session[f'category_{category_name}_next_page'] = new_next_page
-    session[f'shown_category_{category_name}_articles'] = shown_articles
+    _save_feed_state(f'category_{category_name}', new_next_page, shown_articles)
     
     return jsonify({
         'articles': filtered_articles,
@@ -235,22 +384,16 @@ def more_search_results():
         return jsonify({'articles': [], 'has_more': False})
     
     # Get next page token from session
-    next_page = session.get(f'search_{query}_next_page', '')
-    shown_articles = session.get(f'shown_search_{query}_articles', [])
+    next_page, shown_articles = _feed_state(f'search:{query}')
     
     # Fetch more search results with next page token
     articles, new_next_page = news_service.search_news(query, page=next_page)
     
     # Filter out articles we've already shown
-    filtered_articles = []
-    for article in articles:
-        if article['url'] not in shown_articles:
-            filtered_articles.append(article)
-            shown_articles.append(article['url'])
+    filtered_articles = _filter_unseen(articles, shown_articles)
     
     # Update session with new next page token and shown articles
-    session[f'search_{query}_next_page'] = new_next_page
-    session[f'shown_search_{query}_articles'] = shown_articles
+    _save_feed_state(f'search:{query}', new_next_page, shown_articles)
     
     return jsonify({
         'articles': filtered_articles,
@@ -328,6 +471,29 @@ def logout():
     flash('You have been logged out successfully.', 'success')
     return redirect(url_for('main.index'))
 
+def _require_monitoring_token():
+    """
+    Reject requests without the MONITORING_TOKEN bearer token.
+    
+    Monitoring endpoints are disabled (404) when no token is configured.
+    """
+    token = os.getenv('MONITORING_TOKEN')
+    if not token:
+        abort(404)
+    supplied = request.headers.get('Authorization', '')
+    if not hmac.compare_digest(supplied.encode('utf-8'), f'Bearer {token}'.encode('utf-8')):
+        abort(403)
+
+@main.route('/api/quota')
+def quota_status():
+    """API endpoint exposing the NewsData.io credit budget and cache hit rates for monitoring."""
+    _require_monitoring_token()
+    return jsonify(dict(
+        news_service.quota.stats(),
+        api_status=news_service.api_status or cache.get('api_status'),
+        caches=news_service.cache_stats()
+    ))
+
 @main.route('/api/news/breaking')
 def breaking_news():
     """API endpoint for breaking news."""
@@ -0,0 +1,143 @@
+"""
+Search Cache Module for SmartNewsHub
+
+This module caches search results by normalized query and page token, so
+repeated and trending searches are answered without another upstream call or
+another round of AI enrichment.
+
+Entries live in an in-process LRU and expire after a TTL, since search
+results go stale as news breaks.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Spellings of the news API's boolean operators, mapped to their canonical form
+_OPERATORS = {
+    'AND': 'AND', '&': 'AND', '&&': 'AND',
+    'OR': 'OR', '|': 'OR', '||': 'OR',
+    'NOT': 'NOT'
+}
+
+class SearchCache:
+    """
+    TTL + LRU cache of (articles, next page token) keyed by query and page.
+    """
+
+    def __init__(self, max_entries=None, ttl=None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum number of cached pages. Defaults to the
+                SEARCH_CACHE_SIZE environment variable, or 1000.
+            ttl (int): Seconds a page stays valid. Defaults to the
+                SEARCH_CACHE_TTL environment variable, or 600.
+        """
+        self.max_entries = max_entries or int(os.getenv('SEARCH_CACHE_SIZE', 1000))
+        self.ttl = ttl or int(os.getenv('SEARCH_CACHE_TTL', 600))
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Hit/miss counters for monitoring
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    @staticmethod
+    def normalize_query(query):
+        """
+        Normalize a query so equivalent spellings share a cache entry.
+
+        Case-folds words, collapses whitespace and writes boolean operators
+        as upper-case AND/OR/NOT. Operators are only recognised when written
+        in upper case or as symbols, so "rock and roll" keeps its "and".
+
+        Args:
+            query (str): Raw user query
+
+        Returns:
+            str: Normalized query
+        """
+        tokens = []
+        for token in re.findall(r'&&|\|\||[&|()]|"[^"]*"?|[^\s&|()"]+', query or ''):
+            if token in _OPERATORS:
+                tokens.append(_OPERATORS[token])
+            elif token.startswith('"'):
+                # Normalize inside phrases too, and close an unterminated quote
+                phrase = ' '.join(token.strip('"').split()).casefold()
+                if phrase:
+                    tokens.append(f'"{phrase}"')
+            else:
+                tokens.append(token.casefold())
+        return ' '.join(tokens).replace('( ', '(').replace(' )', ')')
+
+    @staticmethod
+    def _key(query, page):
+        return (query, str(page or ''))
+
+    def get(self, query, page=None):
+        """
+        Get a cached results page.
+
+        Args:
+            query (str): Normalized query
+            page (str): Page token; falsy for the first page
+
+        Returns:
+            tuple: (list of articles, next page token), or None on a miss
+        """
+        key = self._key(query, page)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, query, page, value):
+        """
+        Cache a results page, evicting the least recently used if full.
+
+        Args:
+            query (str): Normalized query
+            page (str): Page token; falsy for the first page
+            value (tuple): (list of articles, next page token)
+        """
+        key = self._key(query, page)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        """
+        Get cache hit/miss counters.
+
+        Returns:
+            dict: Counters, hit rate and current size
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'expired': self.expired,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries)
+            }
@@ -0,0 +1,203 @@
+"""
+Search Index Module for SmartNewsHub
+
+This module maintains an SQLite FTS5 full-text index over ingested articles so
+searches can be answered from our own corpus with BM25 ranking. Articles are
+indexed incrementally as feeds are saved. On databases without FTS5 the index
+reports itself unavailable and searches go to the news API as before.
+"""
+
+import logging
+import os
+import re
+from sqlalchemy import text
+from .models import db
+
+logger = logging.getLogger(__name__)
+
+# Title matches count ten times as much as description matches
+_BM25_WEIGHTS = (10.0, 1.0)
+
+# Boolean operators of the news API query syntax
+_QUERY_OPERATORS = {'AND', 'OR', 'NOT', 'NEAR'}
+
+class SearchIndex:
+    """
+    FTS5 index of article titles and descriptions, keyed by Article.id.
+    """
+
+    def __init__(self, table='article_fts'):
+        """
+        Initialize the index.
+
+        Args:
+            table (str): Name of the FTS5 virtual table
+        """
+        self.table = table
+        self.available = False
+        self.enabled = os.getenv('SEARCH_LOCAL', 'true').lower() in ('1', 'true', 'yes')
+
+    def ensure(self):
+        """
+        Create the FTS5 table if needed and backfill it from existing articles.
+
+        Must be called within an application context.
+
+        Returns:
+            bool: Whether local search is available
+        """
+        if not self.enabled or db.engine.dialect.name != 'sqlite':
+            self.available = False
+            return False
+
+        try:
+            exists = db.session.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {'name': self.table}
+            ).first()
+            if not exists:
+                db.session.execute(text(
+                    f"CREATE VIRTUAL TABLE {self.table} USING fts5("
+                    f"title, description, tokenize='porter unicode61')"
+                ))
+                # Index everything ingested before the index existed
+                db.session.execute(text(
+                    f"INSERT INTO {self.table} (rowid, title, description) "
+                    f"SELECT id, title, COALESCE(description, '') FROM articles"
+                ))
+                logger.info(f"Created full-text index {self.table}")
+            db.session.commit()
+            self.available = True
+        except Exception as e:
+            logger.error(f"Local search unavailable, falling back to the news API: {str(e)}")
+            db.session.rollback()
+            self.available = False
+        return self.available
+
+    def index(self, rows):
+        """
+        Add or replace articles in the index, in the caller's transaction.
+
+        Args:
+            rows (list): Article model instances with primary keys assigned
+        """
+        if not self.available or not rows:
+            return
+        params = [
+            {'id': row.id, 'title': row.title or '', 'description': row.description or ''}
+            for row in rows
+        ]
+        db.session.execute(text(f"DELETE FROM {self.table} WHERE rowid = :id"), params)
+        db.session.execute(
+            text(f"INSERT INTO {self.table} (rowid, title, description) VALUES (:id, :title, :description)"),
+            params
+        )
+
+    @staticmethod
+    def _phrase(token):
+        """Quote the words of a query token as an FTS5 phrase, or None if it has no words."""
+        words = re.findall(r'\w+', token.lower())
+        return '"' + ' '.join(words) + '"' if words else None
+
+    @classmethod
+    def _group(cls, tokens, position=0):
+        """
+        Build the expression of one parenthesised group of query tokens.
+
+        Args:
+            tokens (list): Query tokens with balanced parentheses
+            position (int): Index of the first token of the group
+
+        Returns:
+            tuple: (expression, index of the token after the group)
+        """
+        parts = []
+        operator = None
+        drop_next = False
+        while position < len(tokens):
+            token = tokens[position]
+            position += 1
+            if token == ')':
+                break
+            if token == '(':
+                inner, position = cls._group(tokens, position)
+                operand = f'({inner})' if inner else None
+            elif token in _QUERY_OPERATORS:
+                if token == 'NEAR':
+                    continue
+                if parts:
+                    operator = token
+                elif token == 'NOT':
+                    # FTS5 has no unary NOT: drop the negated operand instead
+                    drop_next = True
+                continue
+            else:
+                operand = cls._phrase(token)
+            if operand is None:
+                continue
+            if drop_next:
+                drop_next, operator = False, None
+                continue
+            if parts:
+                parts.append(operator or 'AND')
+            parts.append(operand)
+            operator = None
+        return ' '.join(parts), position
+
+    @classmethod
+    def match_expression(cls, query):
+        """
+        Turn a free-text query into a safe FTS5 MATCH expression.
+
+        Words and quoted phrases become quoted FTS5 phrases, so punctuation in
+        user input cannot cause syntax errors. Upper-case AND, OR and NOT and
+        parentheses are passed through (NOT as FTS5's binary "a NOT b"); words
+        without an operator between them must all match. Misplaced operators
+        and unbalanced parentheses are dropped, and NEAR is ignored.
+
+        Args:
+            query (str): User query, normalized by SearchCache.normalize_query
+
+        Returns:
+            str: MATCH expression, or an empty string if the query has no words
+        """
+        tokens = []
+        depth = 0
+        for token in re.findall(r'"[^"]*"?|[()]|[^\s()"]+', query or ''):
+            if token == ')':
+                if not depth:
+                    continue
+                depth -= 1
+            elif token == '(':
+                depth += 1
+            tokens.append(token)
+        return cls._group(tokens + [')'] * depth)[0]
+
+    def search(self, query, limit=10, offset=0):
+        """
+        Rank indexed articles against a query with BM25.
+
+        Args:
+            query (str): User query
+            limit (int): Maximum number of results
+            offset (int): Number of results to skip
+
+        Returns:
+            list: Article primary keys, best match first
+        """
+        expression = self.match_expression(query)
+        if not self.available or not expression:
+            return []
+        try:
+            result = db.session.execute(
+                text(
+                    f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH :query "
+                    f"ORDER BY bm25({self.table}, {_BM25_WEIGHTS[0]}, {_BM25_WEIGHTS[1]}) "
+                    f"LIMIT :limit OFFSET :offset"
+                ),
+                {'query': expression, 'limit': limit, 'offset': offset}
+            )
+            return [row[0] for row in result]
+        except Exception as e:
+            logger.error(f"Error searching local index: {str(e)}")
+            return []
@@ -54,7 +54,7 @@ def generate_sitemap():
     for article in articles:
         url = ET.SubElement(urlset, 'url')
         ET.SubElement(url, 'loc').text = f'https://planetpulse.com/article/{article.id}'
-        ET.SubElement(url, 'lastmod').text = article.updated_at.strftime('%Y-%m-%d')
+        ET.SubElement(url, 'lastmod').text = (article.published_at or article.created_at).strftime('%Y-%m-%d')
         ET.SubElement(url, 'changefreq').text = 'weekly'
         ET.SubElement(url, 'priority').text = '0.7'
     
@@ -0,0 +1,236 @@
+"""
+Summarization Module for SmartNewsHub
+
+This module runs the summarization model in map-reduce fashion:
+- Bypass: texts under a token threshold are already shorter than a summary,
+  so they are returned as they are (with whitespace and feed truncation
+  markers tidied up) without calling the model
+- Map: longer texts are split on sentence boundaries into chunks that fit the
+  model's input, and the chunks of every text are summarized together in
+  length-bucketed batched calls
+- Reduce: the partial summaries of a multi-chunk text are joined and
+  summarized again in a final pass (repeating the map step if the joined
+  summaries are still too long for one chunk)
+
+Most feed items are a title plus a short description, so the bypass alone
+removes most summarizer calls.
+"""
+
+import logging
+import os
+import re
+import threading
+
+from .fast_analyzers import FastAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# Feed truncation markers such as "... [+1234 chars]" or a trailing "[...]"
+_TRUNCATION_MARKER = re.compile(r'\s*(\[\+\d+ chars\]|\[(\.\.\.|…)\])\s*$')
+
+# Rough tokens per word when the model's tokenizer is not available
+_TOKENS_PER_WORD = 1.3
+
+class MapReduceSummarizer:
+    """
+    Short-text bypass plus batched map-reduce over a summarization pipeline.
+    """
+
+    def __init__(self, bypass_tokens=None, chunk_tokens=None, max_rounds=3):
+        """
+        Initialize the summarizer.
+
+        Args:
+            bypass_tokens (int): Texts with at most this many tokens are not
+                summarized (AI_SUMMARY_BYPASS_TOKENS, default 150, the longest
+                summary we generate)
+            chunk_tokens (int): Maximum tokens per chunk sent to the model
+                (AI_SUMMARY_CHUNK_TOKENS, default 900); capped by the
+                tokenizer's own limit
+            max_rounds (int): Maximum map passes before partial summaries are
+                simply joined
+        """
+        self.bypass_tokens = bypass_tokens or int(os.getenv('AI_SUMMARY_BYPASS_TOKENS', 150))
+        self.chunk_tokens = chunk_tokens or int(os.getenv('AI_SUMMARY_CHUNK_TOKENS', 900))
+        self.max_rounds = max_rounds
+
+        # Counters for monitoring how much work the bypass saves
+        self._lock = threading.Lock()
+        self.counters = {'texts': 0, 'bypassed': 0, 'chunks': 0, 'calls': 0}
+
+    def _count(self, **amounts):
+        with self._lock:
+            for name, amount in amounts.items():
+                self.counters[name] += amount
+
+    def stats(self):
+        """
+        Get summarization counters.
+
+        Returns:
+            dict: Texts seen, texts bypassed, chunks summarized and model calls
+        """
+        with self._lock:
+            return dict(self.counters)
+
+    @staticmethod
+    def trim(text):
+        """Tidy a text returned without summarization."""
+        text = ' '.join((text or '').split())
+        return _TRUNCATION_MARKER.sub('', text).strip()
+
+    def count_tokens(self, texts, tokenizer=None):
+        """
+        Count the model tokens of several texts.
+
+        Args:
+            texts (list): Texts to measure
+            tokenizer: The pipeline's tokenizer; if missing, tokens are
+                estimated from the word count
+
+        Returns:
+            list: Token counts in input order
+        """
+        if not texts:
+            return []
+        if tokenizer is not None:
+            try:
+                return [len(ids) for ids in tokenizer(list(texts), add_special_tokens=False)['input_ids']]
+            except Exception as e:
+                logger.error(f"Error counting tokens: {str(e)}")
+        return [int(len(text.split()) * _TOKENS_PER_WORD) + 1 for text in texts]
+
+    def _chunk_limit(self, tokenizer):
+        """Chunk size in tokens, leaving room for the model's special tokens."""
+        limit = getattr(tokenizer, 'model_max_length', None)
+        # Tokenizers without a limit report a huge sentinel value
+        if isinstance(limit, int) and 0 < limit < 100000:
+            return max(16, min(self.chunk_tokens, limit - 8))
+        return self.chunk_tokens
+
+    def split(self, text, tokenizer=None):
+        """
+        Split a text into chunks of at most the chunk limit in tokens.
+
+        Chunks end on sentence boundaries; a sentence longer than a whole
+        chunk is cut between words.
+
+        Args:
+            text (str): Text to split
+            tokenizer: The pipeline's tokenizer, or None to estimate tokens
+
+        Returns:
+            list: Text chunks
+        """
+        limit = self._chunk_limit(tokenizer)
+        sentences = FastAnalyzer.split_sentences(text) or [text]
+        chunks, current, current_tokens = [], [], 0
+        for sentence, tokens in zip(sentences, self.count_tokens(sentences, tokenizer)):
+            if tokens > limit:
+                # Cut an oversized sentence into word runs of roughly the limit
+                words = sentence.split()
+                step = max(1, len(words) * limit // tokens)
+                pieces = [' '.join(words[i:i + step]) for i in range(0, len(words), step)]
+            else:
+                pieces = [sentence]
+            for piece in pieces:
+                piece_tokens = tokens if len(pieces) == 1 else min(tokens, limit)
+                if current and current_tokens + piece_tokens > limit:
+                    chunks.append(' '.join(current))
+                    current, current_tokens = [], 0
+                current.append(piece)
+                current_tokens += piece_tokens
+        if current:
+            chunks.append(' '.join(current))
+        return chunks
+
+    def summarize(self, summarizer, texts, summary_lengths, batch_size):
+        """
+        Summarize several texts.
+
+        Args:
+            summarizer: Hugging Face summarization pipeline
+            texts (list): Texts to summarize
+            summary_lengths (list): Target summary length in tokens per text
+            batch_size (int): Maximum chunks per model call
+
+        Returns:
+            list: Summaries in input order
+        """
+        tokenizer = getattr(summarizer, 'tokenizer', None)
+        summaries = [None] * len(texts)
+        pending = {}
+        for index, (text, tokens) in enumerate(zip(texts, self.count_tokens(texts, tokenizer))):
+            if tokens <= self.bypass_tokens:
+                summaries[index] = self.trim(text)
+            else:
+                pending[index] = text
+        self._count(texts=len(texts), bypassed=len(texts) - len(pending))
+
+        for _ in range(self.max_rounds):
+            if not pending:
+                break
+            # Map: summarize the chunks of every pending text together
+            chunks = [
+                (index, chunk)
+                for index, text in pending.items()
+                for chunk in self.split(text, tokenizer)
+            ]
+            partials = self._summarize_chunks(
+                summarizer, [chunk for _, chunk in chunks],
+                [summary_lengths[index] for index, _ in chunks], batch_size
+            )
+            joined = {}
+            for (index, _), partial in zip(chunks, partials):
+                joined.setdefault(index, []).append(partial)
+
+            # Reduce: single-chunk texts are done; joined partial summaries
+            # that are still longer than a summary go through another pass
+            next_pending = {}
+            parts_by_index = {index: ' '.join(parts) for index, parts in joined.items()}
+            lengths = self.count_tokens(list(parts_by_index.values()), tokenizer)
+            for (index, combined), tokens in zip(parts_by_index.items(), lengths):
+                if len(joined[index]) == 1 or tokens <= summary_lengths[index]:
+                    summaries[index] = combined
+                else:
+                    next_pending[index] = combined
+            pending = next_pending
+
+        # Out of rounds: keep the joined partial summaries
+        for index, text in pending.items():
+            summaries[index] = text
+        return summaries
+
+    def _summarize_chunks(self, summarizer, chunks, summary_lengths, batch_size):
+        """
+        Run the model over chunks in batches of similar length.
+
+        Args:
+            summarizer: Hugging Face summarization pipeline
+            chunks (list): Chunk texts
+            summary_lengths (list): Target summary length per chunk
+            batch_size (int): Maximum chunks per model call
+
+        Returns:
+            list: Chunk summaries in input order
+        """
+        results = [None] * len(chunks)
+        order = sorted(range(len(chunks)), key=lambda i: len(chunks[i]))
+        for start in range(0, len(order), batch_size):
+            bucket = order[start:start + batch_size]
+            lengths = [summary_lengths[i] for i in bucket]
+            try:
+                outputs = summarizer(
+                    [chunks[i] for i in bucket],
+                    max_length=max(lengths),
+                    min_length=max(30, min(lengths) // 2),
+                    do_sample=False
+                )
+                for i, output in zip(bucket, outputs):
+                    results[i] = output['summary_text']
+            except Exception as e:
+                logger.error(f"Error generating batch summary: {str(e)}")
+                for i in bucket:
+                    results[i] = chunks[i][:max(lengths)] + "..."
+        self._count(chunks=len(chunks), calls=(len(chunks) + batch_size - 1) // batch_size)
+        return results
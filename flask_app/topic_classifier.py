@@ -0,0 +1,216 @@
+"""
+Topic Classifier Module for SmartNewsHub
+
+This module classifies articles into the fixed candidate topics with sentence
+embeddings instead of zero-shot NLI. Zero-shot classification runs one NLI
+forward pass per (article, topic) pair, i.e. ten per article. Here each topic
+is encoded once into a centroid vector of a few descriptive phrases, and each
+article needs a single encoder pass followed by one matrix product against
+the cached centroids.
+"""
+
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Descriptive phrases per topic; their mean embedding is the topic centroid
+TOPIC_DESCRIPTIONS = {
+    'politics': [
+        'politics',
+        'government, elections and political parties',
+        'parliament passes a new law',
+        'the minister criticised the opposition'
+    ],
+    'business': [
+        'business',
+        'companies, markets and the economy',
+        'the company reported quarterly earnings',
+        'shares rose on the stock exchange'
+    ],
+    'technology': [
+        'technology',
+        'software, gadgets and the internet',
+        'the tech giant launched a new smartphone',
+        'artificial intelligence and computing'
+    ],
+    'sports': [
+        'sports',
+        'football, cricket and tennis matches',
+        'the team won the championship final',
+        'the player scored in the league game'
+    ],
+    'entertainment': [
+        'entertainment',
+        'movies, music and celebrities',
+        'the film premiered at the box office',
+        'the singer released a new album'
+    ],
+    'health': [
+        'health',
+        'medicine, hospitals and disease',
+        'doctors warn about a virus outbreak',
+        'a new treatment for patients'
+    ],
+    'science': [
+        'science',
+        'scientific research and discoveries',
+        'scientists published a study on space',
+        'researchers discovered a new species'
+    ],
+    'education': [
+        'education',
+        'schools, universities and students',
+        'exam results were announced for students',
+        'teachers and the school curriculum'
+    ],
+    'environment': [
+        'environment',
+        'climate change, pollution and nature',
+        'rising temperatures and carbon emissions',
+        'wildlife conservation and forests'
+    ],
+    'world': [
+        'world news',
+        'international relations and foreign affairs',
+        'leaders met at a global summit',
+        'conflict between countries abroad'
+    ]
+}
+
+class EmbeddingTopicClassifier:
+    """
+    Nearest-centroid topic classifier over sentence embeddings.
+    """
+
+    def __init__(self, topics, model_name=None, threshold=None, max_topics=3, quantize=False):
+        """
+        Set up the classifier without loading the encoder.
+
+        Args:
+            topics (list): Candidate topic names; each needs an entry in
+                TOPIC_DESCRIPTIONS (otherwise the name itself is encoded)
+            model_name (str): Hugging Face sentence encoder (AI_TOPIC_MODEL,
+                default sentence-transformers/all-MiniLM-L6-v2)
+            threshold (float): Minimum cosine similarity for a topic
+                (AI_TOPIC_THRESHOLD, default 0.25)
+            max_topics (int): Maximum topics per article
+            quantize (bool): Apply dynamic int8 quantization to the encoder
+        """
+        self.topics = list(topics)
+        self.model_name = model_name or os.getenv('AI_TOPIC_MODEL', 'sentence-transformers/all-MiniLM-L6-v2')
+        self.threshold = threshold if threshold is not None else float(os.getenv('AI_TOPIC_THRESHOLD', 0.25))
+        self.max_topics = max_topics
+        self.quantize = quantize
+        self._tokenizer = None
+        self._model = None
+        self._centroids = None
+        self._failed = False
+        self._lock = threading.Lock()
+
+    @property
+    def available(self):
+        """Whether the encoder is (or can be) loaded; loads it on first call."""
+        return self._load()
+
+    def _load(self):
+        """Load the encoder and encode the topic centroids once."""
+        if self._centroids is not None:
+            return True
+        if self._failed:
+            return False
+
+        with self._lock:
+            if self._centroids is None and not self._failed:
+                try:
+                    from transformers import AutoModel, AutoTokenizer
+                    logger.info(f"Loading topic encoder {self.model_name}")
+                    self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                    self._model = AutoModel.from_pretrained(self.model_name)
+                    self._model.eval()
+                    if self.quantize:
+                        from .utils.quantization import quantize_model
+                        self._model = quantize_model(self._model)
+                    self._centroids = self._encode_centroids()
+                except Exception as e:
+                    logger.error(f"Error initializing topic encoder: {str(e)}")
+                    self._failed = True
+        return self._centroids is not None
+
+    def _encode_centroids(self):
+        """Encode each topic's phrases and average them into unit-length centroids."""
+        import numpy as np
+        centroids = []
+        for topic in self.topics:
+            phrases = TOPIC_DESCRIPTIONS.get(topic, [topic])
+            centroid = self.encode(phrases).mean(axis=0)
+            centroids.append(centroid / np.linalg.norm(centroid))
+        return np.stack(centroids)
+
+    def encode(self, texts, batch_size=32, max_length=256):
+        """
+        Encode texts into unit-length sentence embeddings (mean pooling).
+
+        Args:
+            texts (list): Texts to encode
+            batch_size (int): Texts per encoder pass
+            max_length (int): Maximum tokens per text
+
+        Returns:
+            numpy.ndarray: One row per text
+        """
+        import numpy as np
+        import torch
+
+        embeddings = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self._tokenizer(
+                texts[start:start + batch_size],
+                padding=True, truncation=True, max_length=max_length, return_tensors='pt'
+            )
+            with torch.no_grad():
+                hidden = self._model(**inputs).last_hidden_state
+            # Average token vectors, ignoring padding
+            mask = inputs['attention_mask'].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+            embeddings.append(torch.nn.functional.normalize(pooled, dim=1).numpy())
+        return np.concatenate(embeddings) if embeddings else np.zeros((0, 0))
+
+    def scores(self, texts, batch_size=32):
+        """
+        Cosine similarity of every text to every topic centroid.
+
+        Args:
+            texts (list): Texts to score
+            batch_size (int): Texts per encoder pass
+
+        Returns:
+            numpy.ndarray: Matrix of shape (len(texts), len(topics))
+        """
+        if not self._load():
+            raise RuntimeError("Topic encoder is not available")
+        return self.encode(texts, batch_size=batch_size) @ self._centroids.T
+
+    def classify_batch(self, texts, batch_size=32):
+        """
+        Assign topics to several texts.
+
+        A text gets every topic whose similarity reaches the threshold, best
+        first and at most max_topics of them.
+
+        Args:
+            texts (list): Texts to classify
+            batch_size (int): Texts per encoder pass
+
+        Returns:
+            list: Topic lists in input order
+        """
+        if not texts:
+            return []
+        similarities = self.scores(texts, batch_size=batch_size)
+        topics = []
+        for row in similarities:
+            ranked = sorted(range(len(self.topics)), key=lambda i: -row[i])[:self.max_topics]
+            topics.append([self.topics[i] for i in ranked if row[i] >= self.threshold])
+        return topics
@@ -0,0 +1,33 @@
+"""
+Background Utility for PlanetPulse
+
+This module starts short-lived daemon threads for work that must not delay a
+request, such as revalidating a stale feed or prefetching the next page. The
+work runs inside the application context when an app is given, so it can use
+the database and the shared cache.
+"""
+
+import threading
+
+def run_in_background(fn, app=None, name=None):
+    """
+    Run fn in a daemon thread, inside the app context if an app is given.
+
+    Args:
+        fn (callable): Work to run; it handles and logs its own errors
+        app (Flask): Application whose context the work runs in
+        name (str): Thread name, e.g. 'revalidate-front_page'
+
+    Returns:
+        threading.Thread: The started thread
+    """
+    def run_in_context():
+        if app is None:
+            fn()
+            return
+        with app.app_context():
+            fn()
+
+    thread = threading.Thread(target=run_in_context, name=name, daemon=True)
+    thread.start()
+    return thread
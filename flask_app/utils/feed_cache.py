@@ -0,0 +1,106 @@
+"""
+Feed Cache Utility for PlanetPulse
+
+This module adds stale-while-revalidate semantics on top of the shared cache.
+Feed values are stored with a long hard TTL, and a separate freshness marker
+expires after the soft TTL. Between the two a stale feed is still served at
+once while a single background refresh replaces it, so only a feed past its
+hard TTL makes a request wait on the upstream API.
+"""
+
+import logging
+import os
+
+from .background import run_in_background
+
+logger = logging.getLogger(__name__)
+
+class FeedCache:
+    """
+    Soft/hard TTL wrapper around a Flask-Caching cache for feed groups.
+
+    A group is a set of keys written together (e.g. a feed and its next page
+    token) that share one freshness marker.
+    """
+
+    def __init__(self, cache, soft_ttl=None, hard_ttl=None, refresh_timeout=120):
+        """
+        Initialize the feed cache.
+
+        Args:
+            cache: Flask-Caching Cache instance holding the feeds
+            soft_ttl (int): Seconds a feed counts as fresh
+            hard_ttl (int): Seconds a feed may be served at all
+            refresh_timeout (int): Seconds before a stuck or failed refresh
+                may be retried
+        """
+        self.cache = cache
+        self.soft_ttl = soft_ttl or int(os.getenv('FEED_CACHE_SOFT_TTL', 1800))
+        self.hard_ttl = max(hard_ttl or int(os.getenv('FEED_CACHE_HARD_TTL', 14400)), self.soft_ttl)
+        self.refresh_timeout = refresh_timeout
+
+    def get(self, key):
+        """Get a cached value, fresh or stale."""
+        return self.cache.get(key)
+
+    def set(self, key, value):
+        """Update a value without changing its group's freshness."""
+        self.cache.set(key, value, timeout=self.hard_ttl)
+
+    def set_group(self, group, values, fresh=True):
+        """
+        Store a group of values and mark the group fresh.
+
+        Args:
+            group (str): Name of the group
+            values (dict): Cache key -> value
+            fresh (bool): Mark the group fresh; pass False for values that
+                are already old (e.g. loaded from the database) so the next
+                request revalidates them
+        """
+        for key, value in values.items():
+            self.cache.set(key, value, timeout=self.hard_ttl)
+        if fresh:
+            self.cache.set(f'{group}_fresh', True, timeout=self.soft_ttl)
+        else:
+            self.cache.delete(f'{group}_fresh')
+
+    def is_fresh(self, group):
+        """Whether the group was stored within the soft TTL."""
+        return bool(self.cache.get(f'{group}_fresh'))
+
+    def revalidate(self, group, refresh, app=None):
+        """
+        Refresh a stale group in the background unless a refresh is running.
+
+        The running flag lives in the shared cache, so at most one worker
+        refreshes a group at a time. After a successful refresh the flag is
+        cleared; after a failed one it is left to expire, so the stale group
+        keeps being served and the refresh is retried after refresh_timeout
+        rather than on every request.
+
+        Args:
+            group (str): Name of the group
+            refresh (callable): Fetches the group and stores it with
+                set_group; returns a falsy value if nothing was stored
+            app (Flask): Application whose context the refresh runs in
+
+        Returns:
+            bool: True if this call started a refresh
+        """
+        flag = f'{group}_refreshing'
+        if not self.cache.add(flag, True, timeout=self.refresh_timeout):
+            return False
+
+        def run():
+            try:
+                if refresh():
+                    logger.info(f"Revalidated stale feed group {group}")
+                    self.cache.delete(flag)
+                else:
+                    logger.warning(f"Revalidation of feed group {group} stored nothing; retrying later")
+            except Exception as e:
+                logger.error(f"Error revalidating feed group {group}: {str(e)}")
+
+        run_in_background(run, app, name=f'revalidate-{group}')
+        return True
@@ -0,0 +1,123 @@
+"""
+HTTP Client Utility for PlanetPulse
+
+This module provides a shared HTTP client for upstream APIs with keep-alive
+connection pooling, connect/read timeouts and retries with jittered
+exponential backoff.
+"""
+
+import logging
+import os
+import random
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Connection pool size per upstream host; other hosts use DEFAULT_POOL_SIZE
+HOST_POOL_SIZES = {
+    'https://newsdata.io': 16,
+    'https://uselessfacts.jsph.pl': 2,
+}
+DEFAULT_POOL_SIZE = 4
+
+class HTTPClient:
+    """
+    Pooled HTTP client shared by every service in the process.
+    
+    A single requests.Session keeps connections alive between calls, so
+    repeated requests to the same host skip the TCP and TLS handshakes.
+    """
+    
+    def __init__(self, connect_timeout=None, read_timeout=None, max_retries=None,
+                 backoff_base=None, backoff_max=None, pool_sizes=None):
+        """
+        Initialize the client.
+        
+        Args:
+            connect_timeout (float): Seconds to wait for a connection
+                (HTTP_CONNECT_TIMEOUT, default 3.05)
+            read_timeout (float): Seconds to wait for response data
+                (HTTP_READ_TIMEOUT, default 10)
+            max_retries (int): Retries after the first attempt (HTTP_MAX_RETRIES, default 2)
+            backoff_base (float): First backoff delay in seconds (HTTP_BACKOFF_BASE, default 0.5)
+            backoff_max (float): Maximum backoff delay in seconds (HTTP_BACKOFF_MAX, default 8)
+            pool_sizes (dict): Mapping of URL prefix to connection pool size
+        """
+        self.connect_timeout = connect_timeout or float(os.getenv('HTTP_CONNECT_TIMEOUT', 3.05))
+        self.read_timeout = read_timeout or float(os.getenv('HTTP_READ_TIMEOUT', 10))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('HTTP_MAX_RETRIES', 2))
+        self.backoff_base = backoff_base or float(os.getenv('HTTP_BACKOFF_BASE', 0.5))
+        self.backoff_max = backoff_max or float(os.getenv('HTTP_BACKOFF_MAX', 8))
+        
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=DEFAULT_POOL_SIZE, pool_maxsize=DEFAULT_POOL_SIZE))
+        self.session.mount('http://', HTTPAdapter(pool_connections=DEFAULT_POOL_SIZE, pool_maxsize=DEFAULT_POOL_SIZE))
+        for prefix, size in (pool_sizes or HOST_POOL_SIZES).items():
+            self.session.mount(prefix, HTTPAdapter(pool_connections=1, pool_maxsize=size))
+
+    def get(self, url, params=None, timeout=None, max_retries=None, **kwargs):
+        """
+        Send a GET request, retrying 429/5xx responses and connection errors.
+        
+        Args:
+            url (str): URL to request
+            params (dict): Query parameters
+            timeout (float/tuple): Overrides the (connect, read) timeouts
+            max_retries (int): Overrides the number of retries
+            **kwargs: Passed through to requests.Session.get
+            
+        Returns:
+            Response: The last response received
+            
+        Raises:
+            requests.RequestException: If the final attempt fails to connect
+        """
+        timeout = timeout or (self.connect_timeout, self.read_timeout)
+        max_retries = self.max_retries if max_retries is None else max_retries
+        
+        for attempt in range(max_retries + 1):
+            try:
+                response = self.session.get(url, params=params, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= max_retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+                logger.warning(f"Request to {url} failed ({e}); retrying in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+            
+            if response.status_code not in RETRY_STATUSES or attempt >= max_retries:
+                return response
+            
+            delay = self._backoff_delay(attempt, response)
+            logger.warning(f"Request to {url} returned {response.status_code}; retrying in {delay:.2f}s")
+            response.close()
+            time.sleep(delay)
+
+    def _backoff_delay(self, attempt, response=None):
+        """
+        Compute how long to wait before the next attempt.
+        
+        A numeric Retry-After header is honoured; otherwise the delay is drawn
+        uniformly from [0, base * 2^attempt] ("full jitter"), capped at backoff_max.
+        
+        Args:
+            attempt (int): Zero-based attempt number that just failed
+            response (Response): The failed response, if any
+            
+        Returns:
+            float: Delay in seconds
+        """
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+# Shared client for the whole process
+http_client = HTTPClient()
@@ -6,10 +6,10 @@ This module provides functions for optimizing images and ensuring proper alt tag
 
 import os
 from PIL import Image
-import requests
 from io import BytesIO
 from flask import current_app
 import hashlib
+from .http_client import http_client
 
 def optimize_image(image_url, alt_text=None):
     """
@@ -34,7 +34,7 @@ def optimize_image(image_url, alt_text=None):
         
         if not os.path.exists(cached_path):
             # Download and optimize image
-            response = requests.get(image_url)
+            response = http_client.get(image_url)
             img = Image.open(BytesIO(response.content))
             
             # Convert to RGB if necessary
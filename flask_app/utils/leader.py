@@ -0,0 +1,82 @@
+"""
+Leader Election Utility for PlanetPulse
+
+This module elects one process per host to run scheduled jobs, using an
+exclusive flock on a lease file. The operating system releases the lock when
+the holder exits, so another worker takes over at its next election attempt.
+"""
+
+import logging
+import os
+import threading
+
+try:
+    import fcntl  # File locks (POSIX only)
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+class LeaderElection:
+    """
+    Flock-based leader lease shared by every worker on a host.
+    """
+    
+    def __init__(self, lock_path):
+        """
+        Initialize the election.
+        
+        Args:
+            lock_path (str): Path of the lease file
+        """
+        self.lock_path = lock_path
+        self._file = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_leader(self):
+        """Whether this process currently holds the lease."""
+        return self._file is not None or fcntl is None
+
+    def try_acquire(self):
+        """
+        Try to become the leader without blocking.
+        
+        Returns:
+            bool: True only when this call newly acquired the lease
+        """
+        if fcntl is None:
+            # Without file locks every process behaves as the leader
+            return False
+        
+        with self._lock:
+            if self._file is not None:
+                return False
+            
+            os.makedirs(os.path.dirname(self.lock_path), exist_ok=True)
+            lease = open(self.lock_path, 'a+')
+            try:
+                fcntl.flock(lease, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lease.close()
+                return False
+            
+            # Record the holder for anyone inspecting the lease file
+            lease.seek(0)
+            lease.truncate()
+            lease.write(str(os.getpid()))
+            lease.flush()
+            self._file = lease
+            logger.info(f"Process {os.getpid()} is now the scheduler leader")
+            return True
+
+    def release(self):
+        """Give up the lease if held."""
+        with self._lock:
+            if self._file is None:
+                return
+            try:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
+            finally:
+                self._file.close()
+                self._file = None
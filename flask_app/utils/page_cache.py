@@ -0,0 +1,105 @@
+"""
+Page Cache Utility for PlanetPulse
+
+This module caches upstream result pages by feed and page token in the shared
+cache. Every visitor starts from the same cached first page, so they follow the
+same next-page tokens and the load-more endpoints can serve one fetched page to
+all of them. Serving page N also prefetches page N+1 in the background.
+"""
+
+import logging
+import os
+
+from .background import run_in_background
+
+logger = logging.getLogger(__name__)
+
+class PageCache:
+    """
+    Shared cache of (articles, next page token) keyed by feed and page token.
+    """
+
+    def __init__(self, cache, single_flight=None, timeout=None):
+        """
+        Initialize the page cache.
+
+        Args:
+            cache: Flask-Caching Cache instance shared by all workers
+            single_flight (SingleFlight): Coalesces concurrent fetches of a page
+            timeout (int): Seconds a fetched page is kept
+        """
+        self.cache = cache
+        self.single_flight = single_flight
+        self.timeout = timeout or int(os.getenv('PAGE_CACHE_TTL', 900))
+
+    @staticmethod
+    def _key(feed, page):
+        return f'page:{feed}:{page or ""}'
+
+    def _cached(self, feed, page):
+        return self.cache.get(self._key(feed, page))
+
+    def _fetch(self, feed, page, fetch):
+        """Fetch a page upstream and cache it, unless it came back empty."""
+        articles, next_page = fetch(page)
+        if articles:
+            self.cache.set(self._key(feed, page), (articles, next_page), timeout=self.timeout)
+        return articles, next_page
+
+    def get_page(self, feed, page, fetch):
+        """
+        Get a page from the cache, fetching it once on a miss.
+
+        Args:
+            feed (str): Feed name, e.g. 'global' or 'category_sports'
+            page (str): Upstream page token
+            fetch (callable): fetch(page) -> (articles, next page token)
+
+        Returns:
+            tuple: (list of articles, next page token)
+        """
+        cached = self._cached(feed, page)
+        if cached:
+            return cached
+        if self.single_flight is None:
+            return self._fetch(feed, page, fetch)
+        return self.single_flight.do(
+            self._key(feed, page),
+            lambda: self._fetch(feed, page, fetch),
+            recheck=lambda: self._cached(feed, page)
+        )
+
+    def set_page(self, feed, page, articles, next_page):
+        """Replace a cached page, e.g. after enrichment filled it in."""
+        self.cache.set(self._key(feed, page), (articles, next_page), timeout=self.timeout)
+
+    def prefetch(self, feed, page, fetch, app=None):
+        """
+        Fetch a page in the background if it is not cached yet.
+
+        Args:
+            feed (str): Feed name
+            page (str): Upstream page token to prefetch
+            fetch (callable): fetch(page) -> (articles, next page token)
+            app (Flask): Application whose context the fetch runs in
+
+        Returns:
+            bool: True if a prefetch was started
+        """
+        if not page or self.cache.has(self._key(feed, page)):
+            return False
+        # Only one worker prefetches a given page
+        flag = f'{self._key(feed, page)}:prefetching'
+        if not self.cache.add(flag, True, timeout=60):
+            return False
+
+        def run():
+            try:
+                self.get_page(feed, page, fetch)
+            except Exception as e:
+                logger.error(f"Error prefetching {feed} page {page}: {str(e)}")
+            finally:
+                self.cache.delete(flag)
+
+        run_in_background(run, app, name=f'prefetch-{feed}')
+        return True
@@ -0,0 +1,96 @@
+"""
+Quantization Utility for PlanetPulse
+
+This module applies dynamic int8 quantization to transformer models on CPU.
+Linear layer weights are stored as int8 and activations are quantized on the
+fly. benchmarks/quantization_benchmark.py measures the effect: with
+BERT/BART-base sized models (hidden size 768) analysis ran about 2x faster and
+the serialized weights shrank from 307 MB to 86 MB, while small models
+(hidden size 256) gained no speed. Resident memory did not go down: weights
+loaded from safetensors stay memory-mapped, and the int8 copies come on top.
+Run the benchmark against the real models before enabling AI_QUANTIZE, since
+summaries can change.
+"""
+
+import ctypes
+import ctypes.util
+import gc
+import io
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Values of AI_QUANTIZE that enable int8 dynamic quantization
+INT8_MODES = ('int8', 'dynamic', '1', 'true', 'yes')
+
+def quantization_enabled():
+    """Whether AI_QUANTIZE asks for int8 models."""
+    return os.getenv('AI_QUANTIZE', '').lower() in INT8_MODES
+
+def quantize_model(model):
+    """
+    Quantize a model's Linear layers to int8 in place.
+
+    Args:
+        model (torch.nn.Module): Model loaded on the CPU
+
+    Returns:
+        torch.nn.Module: The quantized model, or the original model if
+        quantization is not supported here
+    """
+    try:
+        import torch
+        try:
+            from torch.ao.quantization import quantize_dynamic
+        except ImportError:
+            from torch.quantization import quantize_dynamic
+
+        # fbgemm needs x86; ARM hosts only have qnnpack
+        engines = torch.backends.quantized.supported_engines
+        if torch.backends.quantized.engine not in engines or torch.backends.quantized.engine == 'none':
+            torch.backends.quantized.engine = 'fbgemm' if 'fbgemm' in engines else 'qnnpack'
+
+        model = quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    except Exception as e:
+        logger.error(f"Error quantizing {type(model).__name__}, keeping fp32: {str(e)}")
+        return model
+    _release_freed_memory()
+    return model
+
+def _release_freed_memory():
+    """
+    Hand the replaced fp32 weights back to the OS.
+
+    glibc keeps freed memory in the process, so for models whose weights were
+    read into memory (rather than memory-mapped) the resident size after
+    quantization would otherwise be larger than before it.
+    """
+    gc.collect()
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'))
+        libc.malloc_trim(0)
+    except (OSError, AttributeError, TypeError):
+        pass  # Not glibc (macOS, musl): nothing to trim
+
+def model_size_bytes(model):
+    """
+    Size of a model's serialized weights.
+
+    Quantized weights are packed outside parameters(), so the state dict is
+    serialized instead of summing parameter sizes.
+
+    Args:
+        model (torch.nn.Module): Model to measure
+
+    Returns:
+        int: Bytes, or 0 if the model cannot be serialized
+    """
+    try:
+        import torch
+        buffer = io.BytesIO()
+        torch.save(model.state_dict(), buffer)
+        return buffer.tell()
+    except Exception as e:
+        logger.error(f"Error measuring model size: {str(e)}")
+        return 0
@@ -0,0 +1,77 @@
+"""
+Seen-Set Utility for PlanetPulse
+
+This module provides a compact, fixed-size record of the articles a visitor has
+already been shown. It is a pair of Bloom filters used as two generations: new
+URLs go into the current filter, and once it holds `capacity` URLs the previous
+generation is dropped and a fresh one started. Memory per feed is constant
+however long a visitor scrolls, membership tests are O(1), and the false
+positive rate stays at or below `error_rate` per generation (a false positive
+hides an unseen article; nothing seen is ever shown twice while remembered).
+"""
+
+import hashlib
+import math
+
+class SeenSet:
+    """
+    Two-generation Bloom filter of article URLs.
+    """
+
+    def __init__(self, capacity=500, error_rate=0.001):
+        """
+        Initialize an empty seen-set.
+
+        Args:
+            capacity (int): URLs per generation, so between capacity and
+                2 * capacity of the most recent URLs are remembered
+            error_rate (float): False positive rate of a full generation
+        """
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        # Optimal filter size and hash count for the capacity and error rate
+        self.num_bits = math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.current = bytearray((self.num_bits + 7) // 8)
+        self.previous = bytearray(len(self.current))
+        self.count = 0
+
+    def _positions(self, url):
+        """Bit positions of a URL, using double hashing over one digest."""
+        digest = hashlib.blake2b(url.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    @staticmethod
+    def _contains(bits, positions):
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in positions)
+
+    def __contains__(self, url):
+        positions = self._positions(url)
+        return self._contains(self.current, positions) or self._contains(self.previous, positions)
+
+    def add(self, url):
+        """
+        Remember a URL.
+
+        Returns:
+            bool: True if the URL was not already (probably) in the set
+        """
+        positions = self._positions(url)
+        if self._contains(self.current, positions) or self._contains(self.previous, positions):
+            return False
+        if self.count >= self.capacity:
+            # Rotate generations so the footprint stays fixed
+            self.previous = self.current
+            self.current = bytearray(len(self.previous))
+            self.count = 0
+        for pos in positions:
+            self.current[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+        return True
+
+    def update(self, urls):
+        """Remember several URLs."""
+        for url in urls:
+            self.add(url)
@@ -0,0 +1,97 @@
+"""
+Server-Side Session Utility for PlanetPulse
+
+This module keeps Flask session data in a shared cache store instead of the
+signed session cookie. The cookie only carries a short random session id, so
+request and response headers stay small however much pagination state a visitor
+builds up, and unchanged sessions are neither re-serialized nor re-signed.
+"""
+
+import logging
+import re
+import secrets
+from datetime import datetime, timedelta, timezone
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+logger = logging.getLogger(__name__)
+
+# Session ids we issue: 32 URL-safe characters
+SESSION_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{32}$')
+
+class ServerSession(CallbackDict, SessionMixin):
+    """Session dict that records whether it was changed during the request."""
+
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(session):
+            session.modified = True
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+
+class ServerSessionInterface(SessionInterface):
+    """
+    Store sessions in a cachelib/Flask-Caching backend keyed by session id.
+    """
+
+    def __init__(self, store, ttl=86400, key_prefix='session:'):
+        """
+        Initialize the session interface.
+
+        Args:
+            store: Cache backend (e.g. SQLiteCache or RedisCache) holding sessions
+            ttl (int): Seconds an untouched session is kept
+            key_prefix (str): Prefix of session keys in the store
+        """
+        self.store = store
+        self.ttl = ttl
+        self.key_prefix = key_prefix
+
+    def _key(self, sid):
+        return f'{self.key_prefix}{sid}'
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid and SESSION_ID_PATTERN.match(sid):
+            try:
+                data = self.store.get(self._key(sid))
+            except Exception as e:
+                logger.error(f"Error loading session: {str(e)}")
+                data = None
+            if data is not None:
+                return ServerSession(data, sid=sid)
+        return ServerSession(sid=secrets.token_urlsafe(24), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if not session:
+            # Drop emptied sessions (e.g. after logout) instead of storing them
+            if session.modified and not session.new:
+                self.store.delete(self._key(session.sid))
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        # Only write when the request changed the session
+        if not session.modified and not session.new:
+            return
+
+        try:
+            self.store.set(self._key(session.sid), dict(session), timeout=self.ttl)
+        except Exception as e:
+            logger.error(f"Error saving session: {str(e)}")
+            return
+
+        response.set_cookie(
+            name,
+            session.sid,
+            expires=datetime.now(timezone.utc) + timedelta(seconds=self.ttl),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app)
+        )
@@ -0,0 +1,135 @@
+"""
+Single-Flight Utility for PlanetPulse
+
+This module coalesces concurrent calls for the same key into one execution.
+Callers in the same process wait on an in-flight call and share its result.
+Across processes a lock file serialises callers, and each re-checks the shared
+cache after taking the lock so only the first one does the work.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+
+try:
+    import fcntl  # File locks for cross-process coordination (POSIX only)
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+class _Call:
+    """An in-flight call that other threads can wait on."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time, sharing the result with waiters.
+    """
+    
+    def __init__(self, lock_dir=None, lock_timeout=60):
+        """
+        Initialize the coordinator.
+        
+        Args:
+            lock_dir (str): Directory for cross-process lock files. Without it
+                (or without fcntl) calls are only coalesced within the process.
+            lock_timeout (float): Seconds to wait for another process's lock
+                before running the call anyway
+        """
+        self.lock_dir = lock_dir
+        self.lock_timeout = lock_timeout
+        self._calls = {}
+        self._lock = threading.Lock()
+        if lock_dir:
+            os.makedirs(lock_dir, exist_ok=True)
+
+    def do(self, key, fn, recheck=None):
+        """
+        Run fn for a key unless an identical call is already in flight.
+        
+        Args:
+            key (str): Identifies the work, e.g. the upstream parameters
+            fn (callable): Does the work and returns its result
+            recheck (callable): Returns an existing result (such as a fresh cache
+                entry) or None. Called once the cross-process lock is held, so a
+                caller that waited on another worker can skip fn.
+            
+        Returns:
+            The result of fn (or of recheck), shared by every concurrent caller
+            
+        Raises:
+            Exception: Whatever fn raised, re-raised in every waiting caller
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        
+        if not leader:
+            call.done.wait()
+            if call.error:
+                raise call.error
+            return call.result
+        
+        try:
+            with self._process_lock(key):
+                result = recheck() if recheck else None
+                call.result = result if result is not None else fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def _process_lock(self, key):
+        """Return a context manager holding the cross-process lock for a key."""
+        if not self.lock_dir or fcntl is None:
+            return _NoLock()
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return _FileLock(os.path.join(self.lock_dir, f'{digest}.lock'), self.lock_timeout)
+
+class _NoLock:
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+class _FileLock:
+    """Exclusive flock on a file, waiting at most timeout seconds."""
+    
+    def __init__(self, path, timeout):
+        self.path = path
+        self.timeout = timeout
+        self.file = None
+
+    def __enter__(self):
+        self.file = open(self.path, 'a')
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                fcntl.flock(self.file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return self
+            except OSError:
+                if time.monotonic() >= deadline:
+                    logger.warning(f"Timed out waiting for lock {self.path}; continuing without it")
+                    return self
+                time.sleep(0.05)
+
+    def __exit__(self, *exc):
+        try:
+            fcntl.flock(self.file, fcntl.LOCK_UN)
+        finally:
+            self.file.close()
+        return False
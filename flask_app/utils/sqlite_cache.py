@@ -0,0 +1,150 @@
+"""
+SQLite Cache Backend for PlanetPulse
+
+This module provides a Flask-Caching backend stored in a single SQLite file, so
+every gunicorn worker on a host shares one copy of each cached feed without
+needing an external cache server.
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from flask_caching.backends.base import BaseCache
+
+class SQLiteCache(BaseCache):
+    """
+    Flask-Caching backend backed by an SQLite database file.
+    
+    Values are pickled like the other Flask-Caching backends. The database runs
+    in WAL mode so readers in other processes are not blocked by writers.
+    """
+    
+    def __init__(self, path, default_timeout=300, threshold=1000, **kwargs):
+        """
+        Initialize the cache.
+        
+        Args:
+            path (str): Path of the SQLite database file
+            default_timeout (int): Default timeout in seconds (0 means never expire)
+            threshold (int): Maximum number of entries before expired and oldest
+                entries are pruned
+            **kwargs: Other Flask-Caching options, which this backend ignores
+        """
+        super().__init__(default_timeout=default_timeout)
+        self.path = path
+        self.threshold = threshold
+        self._local = threading.local()
+        
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)'
+            )
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        path = os.path.join(config['CACHE_DIR'], 'cache.sqlite3')
+        kwargs.update(threshold=config['CACHE_THRESHOLD'])
+        return cls(path, *args, **kwargs)
+
+    def _connection(self):
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _expiry(self, timeout):
+        """Convert a timeout in seconds into an absolute expiry time (0 = never)."""
+        timeout = self._normalize_timeout(timeout)
+        return time.time() + timeout if timeout else 0
+
+    def get(self, key):
+        row = self._connection().execute(
+            'SELECT value FROM cache WHERE key = ? AND (expires = 0 OR expires > ?)',
+            (key, time.time())
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            return pickle.loads(row[0])
+        except Exception:
+            return None
+
+    def set(self, key, value, timeout=None):
+        value = sqlite3.Binary(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        conn = self._connection()
+        conn.execute(
+            'INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)',
+            (key, value, self._expiry(timeout))
+        )
+        self._prune(conn)
+        return True
+
+    def add(self, key, value, timeout=None):
+        value = sqlite3.Binary(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        conn = self._connection()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('DELETE FROM cache WHERE key = ? AND expires != 0 AND expires <= ?', (key, time.time()))
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO cache (key, value, expires) VALUES (?, ?, ?)',
+                (key, value, self._expiry(timeout))
+            )
+        return cursor.rowcount == 1
+
+    def delete(self, key):
+        cursor = self._connection().execute('DELETE FROM cache WHERE key = ?', (key,))
+        return cursor.rowcount == 1
+
+    def has(self, key):
+        row = self._connection().execute(
+            'SELECT 1 FROM cache WHERE key = ? AND (expires = 0 OR expires > ?)',
+            (key, time.time())
+        ).fetchone()
+        return row is not None
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache')
+        return True
+
+    def inc(self, key, delta=1):
+        # Read and write inside one write transaction so concurrent workers don't lose updates
+        conn = self._connection()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            value = (self.get(key) or 0) + delta
+            # A live key keeps its expiry; a missing or expired one starts over with
+            # the default timeout, like set()
+            conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, '
+                'COALESCE((SELECT expires FROM cache WHERE key = ? AND (expires = 0 OR expires > ?)), ?))',
+                (key, sqlite3.Binary(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)), key, time.time(),
+                 self._expiry(None))
+            )
+        return value
+
+    def dec(self, key, delta=1):
+        return self.inc(key, -delta)
+
+    def _prune(self, conn):
+        """Drop expired entries, then the soonest-expiring ones, once over the threshold."""
+        if not self.threshold:
+            return
+        count = conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+        if count <= self.threshold:
+            return
+        conn.execute('DELETE FROM cache WHERE expires != 0 AND expires <= ?', (time.time(),))
+        excess = conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0] - self.threshold
+        if excess > 0:
+            conn.execute(
+                'DELETE FROM cache WHERE key IN ('
+                'SELECT key FROM cache WHERE expires != 0 ORDER BY expires LIMIT ?)',
+                (excess,)
+            )
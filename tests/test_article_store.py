@@ -0,0 +1,83 @@
+import threading
+from datetime import datetime
+
+import pytest
+from flask import Flask
+
+from flask_app.ingestion import ArticleStore
+from flask_app.models import db
+
+
+@pytest.fixture
+def store():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield ArticleStore()
+        db.session.remove()
+        db.drop_all()
+
+
+def article(article_id):
+    return {'id': article_id, 'title': f'Title {article_id}', 'description': 'Text',
+            'url': f'http://x/{article_id}', 'published_at': datetime.utcnow().isoformat()}
+
+
+def test_save_feeds_persists_next_page_tokens(store):
+    store.save_feeds({'sports': [article('a')], 'global': [article('b')]}, {'sports': 'page2', 'global': 'g2'})
+    assert store.load_cursor('sports') == 'page2'
+    assert store.load_cursor('global') == 'g2'
+    assert [a['id'] for a in store.load_feed('sports')] == ['a']
+
+    store.save_feeds({'sports': [article('c')]}, {'sports': 'page3'})
+    assert store.load_cursor('sports') == 'page3'
+
+
+def test_cursor_not_saved_for_empty_feed(store):
+    store.save_feeds({'sports': [article('a')]}, {'sports': 'page2'})
+    store.save_feeds({'sports': [], 'global': [article('b')]}, {'sports': None, 'global': 'g2'})
+    assert store.load_cursor('sports') == 'page2'
+    assert store.load_cursor('missing') is None
+
+
+def test_overlapping_saves_from_separate_sessions(tmp_path):
+    from flask_app.models import Article, ArticleCategory, Category
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'articles.db'}"
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+
+    batches = [
+        {'sports': [article(str(i)) for i in range(0, 300)]},
+        {'sports': [article(str(i)) for i in range(150, 450)], 'global': [article('200')]},
+    ]
+    barrier = threading.Barrier(len(batches))
+    saved = [None] * len(batches)
+
+    def save(index):
+        # Each thread gets its own app context and so its own session
+        with app.app_context():
+            store = ArticleStore()
+            barrier.wait()
+            saved[index] = store.save_feeds(batches[index], {'sports': f'page{index}'})
+            db.session.remove()
+
+    threads = [threading.Thread(target=save, args=(index,)) for index in range(len(batches))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+
+    assert saved == [300, 300]
+    with app.app_context():
+        assert Article.query.count() == 450
+        assert Category.query.count() == 2
+        assert ArticleCategory.query.count() == 451
+        assert ArticleStore().load_cursor('sports') in ('page0', 'page1')
+        db.drop_all()
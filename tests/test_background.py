@@ -0,0 +1,21 @@
+from flask import Flask, current_app, has_app_context
+
+from flask_app.utils.background import run_in_background
+
+
+def test_runs_inside_the_app_context():
+    app = Flask('background-test')
+    seen = []
+
+    thread = run_in_background(lambda: seen.append(current_app.name), app, name='job')
+    thread.join(5)
+
+    assert thread.name == 'job'
+    assert thread.daemon
+    assert seen == ['background-test']
+
+
+def test_runs_without_an_app():
+    seen = []
+    run_in_background(lambda: seen.append(has_app_context())).join(5)
+    assert seen == [False]
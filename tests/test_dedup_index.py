@@ -0,0 +1,61 @@
+import threading
+
+from flask_app.dedup_index import NearDuplicateIndex
+
+STORY = "Central bank holds interest rates steady as inflation eases but remains above target"
+
+
+def test_near_duplicate_is_detected():
+    index = NearDuplicateIndex(window_hours=1)
+    assert index.check_and_add('a', STORY, now=0) is None
+    assert index.check_and_add('b', STORY + " says officials", now=1) == 'a'
+    assert len(index) == 1
+
+
+def test_different_story_is_kept():
+    index = NearDuplicateIndex(window_hours=1)
+    index.check_and_add('a', STORY, now=0)
+    assert index.check_and_add('b', "Local team wins the cricket final after a dramatic last over", now=1) is None
+    assert len(index) == 2
+
+
+def test_same_key_is_not_its_own_duplicate():
+    index = NearDuplicateIndex(window_hours=1)
+    index.check_and_add('a', STORY, now=0)
+    assert index.check_and_add('a', STORY, now=1) is None
+    assert len(index) == 1
+
+
+def test_entries_expire_after_the_window():
+    index = NearDuplicateIndex(window_hours=1)
+    index.check_and_add('a', STORY, now=0)
+    assert index.check_and_add('b', STORY, now=2 * 3600) is None
+    assert len(index) == 1
+
+
+def test_oldest_entries_are_evicted_at_capacity():
+    index = NearDuplicateIndex(window_hours=1, max_entries=2)
+    for i, text in enumerate(["alpha beta gamma", "delta epsilon zeta", "eta theta iota"]):
+        index.check_and_add(str(i), text, now=i)
+    assert len(index) == 2
+    # The first article was evicted, so it is new again
+    assert index.check_and_add('again', "alpha beta gamma", now=3) is None
+
+
+def test_concurrent_first_signatures_match():
+    index = NearDuplicateIndex()
+    barrier = threading.Barrier(8)
+    signatures = []
+
+    def sign():
+        barrier.wait()
+        signatures.append(index.signature(STORY))
+
+    threads = [threading.Thread(target=sign) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    expected = NearDuplicateIndex().signature(STORY)
+    assert all((signature == expected).all() for signature in signatures)
@@ -0,0 +1,64 @@
+import time
+
+import pytest
+from flask import Flask
+from sqlalchemy import inspect, text
+
+from flask_app.enrichment_cache import EnrichmentCache
+from flask_app.models import db
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def enrichment(tier):
+    return {'summary': 'Summary', 'sentiment': 'POSITIVE', 'tags': ['a'], 'tier': tier}
+
+
+def test_tier_survives_the_database(app):
+    EnrichmentCache().put_many({'h1': enrichment('fast'), 'h2': enrichment('full')})
+    db.session.commit()
+
+    # A new cache has to load both from the table
+    loaded = EnrichmentCache().get_many(['h1', 'h2'])
+    assert loaded['h1']['tier'] == 'fast'
+    assert loaded['h2']['tier'] == 'full'
+    assert abs(loaded['h1']['enriched_at'] - time.time()) < 60
+
+
+def test_fast_tier_results_expire_for_upgrade(app):
+    cache = EnrichmentCache(fast_tier_ttl=60)
+    cache.put_many({'h1': enrichment('fast'), 'h2': enrichment('full')})
+    fast, full = cache.get_many(['h1'])['h1'], cache.get_many(['h2'])['h2']
+    assert not cache.needs_upgrade(fast)
+
+    fast['enriched_at'] -= 120
+    full['enriched_at'] -= 120
+    assert cache.needs_upgrade(fast)
+    assert not cache.needs_upgrade(full)
+    assert not cache.needs_upgrade({'summary': None, 'tags': [], 'pending': True})
+
+
+def test_ensure_schema_adds_tier_column(app):
+    db.drop_all()
+    with db.engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE article_enrichment (id INTEGER PRIMARY KEY, content_hash VARCHAR(64) UNIQUE NOT NULL, "
+            "tags TEXT, summary TEXT, sentiment VARCHAR(50), created_at DATETIME)"
+        ))
+        connection.execute(text("INSERT INTO article_enrichment (content_hash, tags) VALUES ('old', '[]')"))
+
+    EnrichmentCache.ensure_schema()
+    assert 'tier' in {column['name'] for column in inspect(db.engine).get_columns('article_enrichment')}
+    # Rows from before tiers were recorded count as full analyses
+    assert EnrichmentCache().get_many(['old'])['old']['tier'] == 'full'
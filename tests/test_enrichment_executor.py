@@ -0,0 +1,74 @@
+from concurrent.futures import Future
+
+import pytest
+
+from flask_app.enrichment_executor import EnrichmentExecutor
+
+class StubService:
+    """AIService stand-in that records the batches it analyzes in process."""
+
+    client = None
+
+    def __init__(self):
+        self.calls = []
+
+    def choose_tier(self, tier):
+        return tier or 'full'
+
+    def analyze_articles(self, articles, tier=None):
+        self.calls.append(list(articles))
+        return [{'text': text, 'tier': tier, 'where': 'local'} for text, _ in articles]
+
+class FakePool:
+    """Runs each chunk synchronously; chunks holding a failing article raise."""
+
+    def __init__(self, fail_on):
+        self.fail_on = fail_on
+        self.submitted = []
+
+    def submit(self, fn, chunk, tier):
+        self.submitted.append(chunk)
+        future = Future()
+        if any(text == self.fail_on for text, _ in chunk):
+            future.set_exception(RuntimeError('worker failed'))
+        else:
+            future.set_result([{'text': text, 'tier': tier, 'where': 'pool'} for text, _ in chunk])
+        return future
+
+def articles(count):
+    return [(f'text {i}', f'title {i}') for i in range(count)]
+
+def test_single_worker_runs_in_process():
+    service = StubService()
+    executor = EnrichmentExecutor(service, workers=1)
+
+    results = executor.analyze_articles(articles(3))
+
+    assert not executor.enabled
+    assert service.calls == [articles(3)]
+    assert [r['text'] for r in results] == ['text 0', 'text 1', 'text 2']
+
+def test_small_batch_skips_the_pool(monkeypatch):
+    service = StubService()
+    executor = EnrichmentExecutor(service, workers=4)
+    monkeypatch.setattr(executor, '_get_pool', lambda: pytest.fail('pool used'))
+
+    results = executor.analyze_articles(articles(1))
+
+    assert service.calls == [articles(1)]
+    assert results[0]['where'] == 'local'
+
+def test_failed_chunk_reruns_alone_in_input_order(monkeypatch):
+    service = StubService()
+    executor = EnrichmentExecutor(service, workers=2, chunk_size=2)
+    pool = FakePool(fail_on='text 3')
+    monkeypatch.setattr(executor, '_get_pool', lambda: pool)
+
+    results = executor.analyze_articles(articles(6), tier='fast')
+
+    assert len(pool.submitted) == 3
+    # Only the failed chunk is analyzed again in process
+    assert service.calls == [[('text 2', 'title 2'), ('text 3', 'title 3')]]
+    assert [r['text'] for r in results] == [f'text {i}' for i in range(6)]
+    assert [r['where'] for r in results] == ['pool', 'pool', 'local', 'local', 'pool', 'pool']
+    assert all(r['tier'] == 'fast' for r in results)
@@ -0,0 +1,69 @@
+import threading
+
+from flask_caching.backends import SimpleCache
+
+from flask_app.utils.feed_cache import FeedCache
+
+
+def revalidate_and_wait(feed_cache, group, refresh):
+    done = threading.Event()
+
+    def wrapped():
+        try:
+            return refresh()
+        finally:
+            done.set()
+
+    started = feed_cache.revalidate(group, wrapped)
+    if started:
+        assert done.wait(5)
+        # Let the worker thread finish its bookkeeping after refresh() returns
+        for thread in threading.enumerate():
+            if thread.name == f'revalidate-{group}':
+                thread.join(5)
+    return started
+
+
+def test_set_group_marks_fresh():
+    feed_cache = FeedCache(SimpleCache(), soft_ttl=60, hard_ttl=600)
+    feed_cache.set_group('front_page', {'global_news': [1]})
+    assert feed_cache.is_fresh('front_page')
+    assert feed_cache.get('global_news') == [1]
+
+
+def test_successful_revalidation_clears_flag():
+    feed_cache = FeedCache(SimpleCache(), soft_ttl=60, hard_ttl=600)
+
+    def refresh():
+        feed_cache.set_group('front_page', {'global_news': [2]})
+        return True
+
+    assert revalidate_and_wait(feed_cache, 'front_page', refresh)
+    assert feed_cache.get('global_news') == [2]
+    assert feed_cache.is_fresh('front_page')
+    assert feed_cache.cache.get('front_page_refreshing') is None
+
+
+def test_failed_revalidation_keeps_stale_value_and_backs_off():
+    feed_cache = FeedCache(SimpleCache(), soft_ttl=60, hard_ttl=600)
+    feed_cache.set('global_news', [1])
+    calls = []
+
+    def refresh():
+        calls.append(1)
+        return False  # Nothing stored, e.g. the API returned no articles
+
+    assert revalidate_and_wait(feed_cache, 'front_page', refresh)
+    assert feed_cache.get('global_news') == [1]
+    assert not feed_cache.is_fresh('front_page')
+    # The flag expires on its own instead of letting every request retry at once
+    assert not revalidate_and_wait(feed_cache, 'front_page', refresh)
+    assert len(calls) == 1
+
+
+def test_set_group_not_fresh_keeps_values_stale():
+    feed_cache = FeedCache(SimpleCache(), soft_ttl=60, hard_ttl=600)
+    feed_cache.set_group('front_page', {'global_news': [1]})
+    feed_cache.set_group('front_page', {'global_news': [0]}, fresh=False)
+    assert not feed_cache.is_fresh('front_page')
+    assert feed_cache.get('global_news') == [0]
@@ -0,0 +1,116 @@
+import socket
+import threading
+
+import pytest
+
+import flask_app  # noqa: F401  (sets up the package before importing its modules)
+from flask_app.ai_service import AIService
+from flask_app.inference_server import (
+    InferenceClient, InferenceServer, MicroBatcher, _Job, recv_message, send_message
+)
+
+
+class StubService:
+    """Records every batch and tags each analysis with its text and tier."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.batches = []
+
+    def analyze_articles(self, articles, tier=None):
+        self.batches.append((tier, list(articles)))
+        if self.error:
+            raise self.error
+        return [{'text': text, 'tier': tier} for text, _ in articles]
+
+
+def test_messages_round_trip_over_a_socket():
+    left, right = socket.socketpair()
+    with left, right:
+        message = {'op': 'analyze', 'articles': [['text ' * 1000, 'title']], 'tier': 'full'}
+        send_message(left, message)
+        send_message(left, {'op': 'ping'})
+        assert recv_message(right) == message
+        assert recv_message(right) == {'op': 'ping'}
+        left.close()
+        assert recv_message(right) is None
+
+
+def test_batch_results_are_split_per_job_and_tier():
+    service = StubService()
+    batcher = MicroBatcher(service, window=0, max_batch=32)
+    first = _Job([('a', 'A'), ('b', 'B')], 'full')
+    second = _Job([('c', 'C')], 'full')
+    fast = _Job([('d', 'D')], 'fast')
+
+    batcher._run('full', [first, second])
+    batcher._run('fast', [fast])
+
+    assert [result['text'] for result in first.results] == ['a', 'b']
+    assert [result['text'] for result in second.results] == ['c']
+    assert fast.results == [{'text': 'd', 'tier': 'fast'}]
+    assert [tier for tier, _ in service.batches] == ['full', 'fast']
+    assert all(job.done.is_set() for job in (first, second, fast))
+
+
+def test_concurrent_requests_are_grouped_by_tier():
+    service = StubService()
+    batcher = MicroBatcher(service, window=0.2, max_batch=32)
+    results = {}
+
+    def analyze(name, tier):
+        results[name] = batcher.analyze([(name, name)], tier)
+
+    threads = [threading.Thread(target=analyze, args=(name, tier))
+               for name, tier in (('a', 'full'), ('b', 'fast'), ('c', 'full'))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert {name: result[0]['tier'] for name, result in results.items()} == {'a': 'full', 'b': 'fast', 'c': 'full'}
+    # No model batch mixes tiers
+    for tier, articles in service.batches:
+        assert all(results[text][0]['tier'] == tier for text, _ in articles)
+
+
+def test_failed_batch_reports_the_error_to_every_job():
+    error = RuntimeError("model crashed")
+    batcher = MicroBatcher(StubService(error=error), window=0, max_batch=32)
+    jobs = [_Job([('a', 'A')], 'full'), _Job([('b', 'B')], 'full')]
+
+    batcher._run('full', jobs)
+
+    assert all(job.error is error and job.results is None and job.done.is_set() for job in jobs)
+    with pytest.raises(RuntimeError):
+        batcher.analyze([('c', 'C')], 'full')
+
+
+def test_server_answers_a_client(tmp_path):
+    path = str(tmp_path / 'ai.sock')
+    service = StubService()
+    service.summarization = type('Summarization', (), {'stats': staticmethod(lambda: {})})()
+    server = InferenceServer(path, service, MicroBatcher(service, window=0))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        client = InferenceClient(path, timeout=5)
+        assert client.ping()
+        assert client.analyze([('a', 'A')], tier='full') == [{'text': 'a', 'tier': 'full'}]
+        # A second server must not take over a live socket
+        with pytest.raises(RuntimeError):
+            InferenceServer(path, service)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_client_mode_falls_back_to_fast_tier_when_server_is_missing(tmp_path):
+    service = AIService(inference_socket=str(tmp_path / 'missing.sock'))
+    results = service.analyze_articles(
+        [("The central bank kept interest rates unchanged. Markets rose after the decision.", "Rates held")],
+        tier='full'
+    )
+    assert len(results) == 1
+    assert results[0]['tier'] == 'fast'
+    assert results[0]['summary']
@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+
+from flask_app.utils.leader import LeaderElection
+
+
+def test_one_process_wins_the_lease(tmp_path):
+    path = str(tmp_path / 'scheduler.lock')
+    first = LeaderElection(path)
+    second = LeaderElection(path)
+
+    assert first.try_acquire()
+    assert first.is_leader
+    assert not second.try_acquire()
+    assert not second.is_leader
+    # Only a new acquisition returns True
+    assert not first.try_acquire()
+    assert open(path).read() == str(os.getpid())
+
+
+def test_takeover_after_release(tmp_path):
+    path = str(tmp_path / 'scheduler.lock')
+    first = LeaderElection(path)
+    second = LeaderElection(path)
+    first.try_acquire()
+
+    first.release()
+
+    assert not first.is_leader
+    assert second.try_acquire()
+    assert not first.try_acquire()
+
+
+def test_takeover_after_leader_closes_its_lease(tmp_path):
+    path = str(tmp_path / 'scheduler.lock')
+    first = LeaderElection(path)
+    second = LeaderElection(path)
+    first.try_acquire()
+
+    # What the operating system does when the leader process dies
+    first._file.close()
+
+    assert second.try_acquire()
+
+
+def test_takeover_after_leader_process_exits(tmp_path):
+    path = str(tmp_path / 'scheduler.lock')
+    holder = subprocess.Popen(
+        [sys.executable, '-c', (
+            'import sys; from flask_app.utils.leader import LeaderElection; '
+            'leader = LeaderElection(sys.argv[1]); print(leader.try_acquire(), flush=True); sys.stdin.read()'
+        ), path],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    try:
+        assert holder.stdout.readline().strip() == 'True'
+        election = LeaderElection(path)
+        assert not election.try_acquire()
+
+        holder.kill()
+        holder.wait(5)
+
+        assert election.try_acquire()
+    finally:
+        holder.kill()
+        holder.wait(5)
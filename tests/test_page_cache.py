@@ -0,0 +1,117 @@
+import threading
+import time
+
+import pytest
+from flask_caching.backends import SimpleCache
+
+from flask_app.utils.page_cache import PageCache
+from flask_app.utils.single_flight import SingleFlight
+
+
+def wait_for_prefetch(feed):
+    for thread in threading.enumerate():
+        if thread.name == f'prefetch-{feed}':
+            thread.join(5)
+
+
+def test_cached_page_is_served_without_fetching():
+    cache = SimpleCache()
+    pages = PageCache(cache)
+    pages.set_page('global', 'tok1', ['a', 'b'], 'tok2')
+
+    assert cache.get('page:global:tok1') == (['a', 'b'], 'tok2')
+    assert pages.get_page('global', 'tok1', lambda page: pytest.fail('fetched a cached page')) == (['a', 'b'], 'tok2')
+
+
+def test_miss_fetches_once_and_caches():
+    pages = PageCache(SimpleCache(), SingleFlight())
+    calls = []
+
+    def fetch(page):
+        calls.append(page)
+        return ['a'], 'tok2'
+
+    assert pages.get_page('global', 'tok1', fetch) == (['a'], 'tok2')
+    assert pages.get_page('global', 'tok1', fetch) == (['a'], 'tok2')
+    assert calls == ['tok1']
+
+
+def test_empty_page_is_not_cached():
+    pages = PageCache(SimpleCache(), SingleFlight())
+    calls = []
+
+    def fetch(page):
+        calls.append(page)
+        return [], None
+
+    pages.get_page('global', 'tok1', fetch)
+    pages.get_page('global', 'tok1', fetch)
+    assert calls == ['tok1', 'tok1']
+
+
+def test_concurrent_misses_share_one_fetch():
+    pages = PageCache(SimpleCache(), SingleFlight())
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch(page):
+        calls.append(page)
+        started.set()
+        release.wait(5)
+        return ['a'], 'tok2'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pages.get_page('global', 'tok1', fetch))) for _ in range(4)]
+    threads[0].start()
+    assert started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == ['tok1']
+    assert results == [(['a'], 'tok2')] * 4
+
+
+def test_prefetch_starts_once_per_page():
+    cache = SimpleCache()
+    pages = PageCache(cache, SingleFlight())
+    release = threading.Event()
+    calls = []
+
+    def fetch(page):
+        calls.append(page)
+        release.wait(5)
+        return ['c'], 'tok3'
+
+    assert pages.prefetch('global', 'tok2', fetch)
+    # Another request (or worker) while the prefetch runs loses the add guard
+    assert not pages.prefetch('global', 'tok2', fetch)
+    release.set()
+    wait_for_prefetch('global')
+
+    assert calls == ['tok2']
+    assert cache.get('page:global:tok2') == (['c'], 'tok3')
+    assert not cache.has('page:global:tok2:prefetching')
+    # Already cached, so nothing left to prefetch
+    assert not pages.prefetch('global', 'tok2', fetch)
+    assert not pages.prefetch('global', None, fetch)
+
+
+def test_failed_prefetch_can_be_retried():
+    cache = SimpleCache()
+    pages = PageCache(cache, SingleFlight())
+
+    def broken(page):
+        raise RuntimeError('upstream down')
+
+    assert pages.prefetch('global', 'tok2', broken)
+    wait_for_prefetch('global')
+
+    assert not cache.has('page:global:tok2')
+    assert pages.prefetch('global', 'tok2', lambda page: (['c'], None))
+    wait_for_prefetch('global')
+    assert cache.get('page:global:tok2') == (['c'], None)
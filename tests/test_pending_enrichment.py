@@ -0,0 +1,85 @@
+import sys
+
+import flask_app  # noqa: F401  (sets up the package before importing the module)
+
+news_service_module = sys.modules['flask_app.news_service']
+
+
+class StubCache:
+    def __init__(self, entries):
+        self.entries = entries
+
+    def get_many(self, hashes):
+        return {h: self.entries[h] for h in hashes if h in self.entries}
+
+
+class StubQueue:
+    running = True
+
+    def __init__(self):
+        self.submitted = {}
+
+    def submit(self, articles):
+        self.submitted.update(articles)
+        return len(articles)
+
+
+def formatted(title):
+    return {'title': title, 'description': f'{title} text', 'url': f'http://x/{title}', 'id': title,
+            'summary': None, 'sentiment': None, 'tags': [], 'enrichment_pending': True}
+
+
+def test_placeholders_are_independent():
+    first = news_service_module.pending_enrichment()
+    first['tags'].append('x')
+    assert news_service_module.pending_enrichment()['tags'] == []
+
+
+def test_fill_pending_resubmits_missing_and_fills_finished():
+    service = news_service_module.NewsService()
+    done, lost = formatted('done'), formatted('lost')
+    done_hash = news_service_module.EnrichmentCache.content_hash(done)
+    lost_hash = news_service_module.EnrichmentCache.content_hash(lost)
+    service.enrichment_cache = StubCache({done_hash: {'summary': 's', 'sentiment': 'POSITIVE', 'tags': ['t']}})
+    service.enrichment_queue = StubQueue()
+
+    assert service.fill_pending_enrichments([done, lost])
+    assert done['summary'] == 's' and not done.get('enrichment_pending')
+    assert lost.get('enrichment_pending')
+    assert list(service.enrichment_queue.submitted) == [lost_hash]
+    assert service.enrichment_queue.submitted[lost_hash]['link'] == 'http://x/lost'
+
+
+class UpgradeCache(StubCache):
+    def needs_upgrade(self, enrichment):
+        return enrichment.get('tier') == 'fast'
+
+
+def raw(title):
+    return {'title': title, 'description': f'{title} text', 'link': f'http://x/{title}'}
+
+
+def test_due_fast_tier_results_are_served_and_queued_for_upgrade():
+    service = news_service_module.NewsService()
+    fast, full = raw('fast'), raw('full')
+    hashes = [news_service_module.EnrichmentCache.content_hash(article) for article in (fast, full)]
+    service.enrichment_cache = UpgradeCache({
+        hashes[0]: {'summary': 'f', 'sentiment': 'NEUTRAL', 'tags': [], 'tier': 'fast'},
+        hashes[1]: {'summary': 'F', 'sentiment': 'NEUTRAL', 'tags': [], 'tier': 'full'},
+    })
+    service.enrichment_queue = StubQueue()
+    service.enrichment_queue.size = lambda: 0
+
+    results = service._process_articles_with_ai([fast, full], defer=True)
+    assert [result['summary'] for result in results] == ['f', 'F']
+    assert list(service.enrichment_queue.submitted) == [hashes[0]]
+
+
+def test_due_fast_tier_results_are_reanalyzed_inline():
+    service = news_service_module.NewsService()
+    fast = raw('fast')
+    content_hash = news_service_module.EnrichmentCache.content_hash(fast)
+    service.enrichment_cache = UpgradeCache({content_hash: {'summary': 'f', 'tags': [], 'tier': 'fast'}})
+    service._enrich_articles = lambda articles: {h: {'summary': 'F', 'tags': [], 'tier': 'full'} for h in articles}
+
+    assert service._process_articles_with_ai([fast], defer=False)[0]['summary'] == 'F'
@@ -0,0 +1,94 @@
+import sys
+
+import pytest
+from flask import Flask
+from flask_caching.backends import SimpleCache
+
+import flask_app  # sets up the package before importing its modules
+from flask_app.quota_manager import INTERACTIVE, PREFETCH, REFRESH, QuotaManager
+from flask_app.routes import main
+
+news_service_module = sys.modules['flask_app.news_service']
+
+
+class StubResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def manager(daily_credits=10, burst=100, keys=(('primary', 'k1'),)):
+    return QuotaManager(list(keys), daily_credits=daily_credits, burst=burst,
+                        reserves={INTERACTIVE: 0.0, PREFETCH: 0.2, REFRESH: 0.5}, store=SimpleCache())
+
+
+def test_acquire_spends_one_credit_per_request():
+    quota = manager()
+    assert quota.acquire(INTERACTIVE) == ('primary', 'k1')
+    assert quota.acquire(INTERACTIVE) == ('primary', 'k1')
+    assert quota.stats()['keys']['primary']['spent_today'] == 2
+
+
+def test_low_priority_is_shed_before_reserve():
+    quota = manager()
+    for _ in range(5):
+        assert quota.acquire(REFRESH)
+    # Half the budget is reserved from refreshes, the rest is still open to users
+    assert quota.acquire(REFRESH) is None
+    assert quota.acquire(INTERACTIVE)
+    stats = quota.stats()
+    assert stats['shed'][REFRESH] == 1
+    assert stats['granted'][INTERACTIVE] == 1
+
+
+def test_rate_limited_key_is_paused_and_next_key_used():
+    quota = manager(keys=(('primary', 'k1'), ('backup', 'k2')))
+    quota.record('primary', StubResponse(429, {'Retry-After': '60'}))
+    assert quota.acquire(INTERACTIVE) == ('backup', 'k2')
+
+
+def test_reported_remaining_lowers_budget():
+    quota = manager()
+    quota.record('primary', StubResponse(200, {'X-RateLimit-Remaining': '0'}))
+    assert quota.acquire(INTERACTIVE) is None
+
+
+def test_every_http_attempt_is_counted(monkeypatch):
+    service = news_service_module.NewsService()
+    service.quota = manager(keys=(('primary', 'k1'), ('backup', 'k2')))
+    calls = []
+
+    def fake_get(url, params=None, max_retries=None, **kwargs):
+        calls.append(max_retries)
+        return StubResponse(503 if len(calls) == 1 else 200)
+
+    monkeypatch.setattr(news_service_module.http_client, 'get', fake_get)
+    response = service._make_api_request({'q': 'x'})
+    assert response.status_code == 200
+    # The shared client must not retry paid requests behind the quota manager's back
+    assert calls == [0, 0]
+    keys = service.quota.stats()['keys']
+    assert keys['primary']['spent_today'] + keys['backup']['spent_today'] == len(calls)
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    # The endpoint reads the shared API probe result from the cache
+    flask_app.cache.init_app(app, config={'CACHE_TYPE': 'SimpleCache'})
+    app.register_blueprint(main)
+    return app.test_client()
+
+
+def test_quota_endpoint_requires_token(client, monkeypatch):
+    monkeypatch.delenv('MONITORING_TOKEN', raising=False)
+    assert client.get('/api/quota').status_code == 404
+
+    monkeypatch.setenv('MONITORING_TOKEN', 'secret')
+    assert client.get('/api/quota').status_code == 403
+    assert client.get('/api/quota', headers={'Authorization': 'Bearer wrong'}).status_code == 403
+    response = client.get('/api/quota', headers={'Authorization': 'Bearer secret'})
+    assert response.status_code == 200
+    assert 'keys' in response.get_json()
+    assert set(response.get_json()['caches']) == {'search', 'enrichment'}
+    assert response.get_json()['api_status'] is None
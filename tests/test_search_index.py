@@ -0,0 +1,43 @@
+import sqlite3
+
+import pytest
+
+from flask_app.search_index import SearchIndex
+
+
+@pytest.mark.parametrize('query, expression', [
+    ('climate change', '"climate" AND "change"'),
+    ('climate OR weather', '"climate" OR "weather"'),
+    ('climate NOT politics', '"climate" NOT "politics"'),
+    ('climate AND NOT politics', '"climate" NOT "politics"'),
+    ('(climate OR weather) AND india', '("climate" OR "weather") AND "india"'),
+    ('"rock and roll" OR jazz', '"rock and roll" OR "jazz"'),
+    ('rock or roll', '"rock" AND "or" AND "roll"'),
+    ('covid-19', '"covid 19"'),
+    ('NOT politics climate', '"climate"'),
+    ('OR climate AND', '"climate"'),
+    ('climate NEAR change', '"climate" AND "change"'),
+    ('(climate OR weather', '("climate" OR "weather")'),
+    ('climate) OR (weather', '"climate" OR ("weather")'),
+    ('() AND ***', ''),
+])
+def test_match_expression(query, expression):
+    assert SearchIndex.match_expression(query) == expression
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('cricket OR summit', {1, 2}),
+    ('climate NOT india', {1}),
+    ('(climate OR cricket) india', {2, 3}),
+    ('india', {2, 3}),
+])
+def test_expressions_run_in_fts5(query, expected):
+    connection = sqlite3.connect(':memory:')
+    connection.execute("CREATE VIRTUAL TABLE t USING fts5(title, description, tokenize='porter unicode61')")
+    connection.executemany("INSERT INTO t (rowid, title, description) VALUES (?, ?, ?)", [
+        (1, 'Climate summit opens', 'Leaders meet in Paris'),
+        (2, 'Cricket final', 'India win the cup'),
+        (3, 'Monsoon and climate', 'Rains reach India'),
+    ])
+    rows = connection.execute("SELECT rowid FROM t WHERE t MATCH ?", (SearchIndex.match_expression(query),))
+    assert {row[0] for row in rows} == expected
@@ -0,0 +1,36 @@
+from flask_app.utils.seen_set import SeenSet
+
+
+def test_add_reports_new_urls_only():
+    seen = SeenSet(capacity=10)
+    assert seen.add('http://x/1')
+    assert not seen.add('http://x/1')
+    assert 'http://x/1' in seen
+    assert 'http://x/2' not in seen
+
+
+def test_previous_generation_is_remembered_until_the_next_rotation():
+    seen = SeenSet(capacity=3)
+    seen.update(f'http://x/{i}' for i in range(3))
+    # The fourth URL starts a new generation; the first three are still known
+    seen.add('http://x/3')
+    assert all(f'http://x/{i}' in seen for i in range(4))
+
+    # Filling the new generation and rotating again forgets the oldest
+    seen.update(f'http://x/{i}' for i in range(4, 7))
+    assert 'http://x/0' not in seen
+    assert all(f'http://x/{i}' in seen for i in range(3, 7))
+
+
+def test_footprint_is_fixed():
+    seen = SeenSet(capacity=50)
+    size = len(seen.current) + len(seen.previous)
+    seen.update(f'http://x/{i}' for i in range(1000))
+    assert len(seen.current) + len(seen.previous) == size
+
+
+def test_false_positive_rate_within_bound():
+    seen = SeenSet(capacity=500, error_rate=0.01)
+    seen.update(f'http://seen/{i}' for i in range(500))
+    false_positives = sum(f'http://unseen/{i}' in seen for i in range(5000))
+    assert false_positives / 5000 < 0.03
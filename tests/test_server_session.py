@@ -0,0 +1,108 @@
+import cachelib.simple
+import pytest
+from flask import Flask, session
+from flask_caching.backends import SimpleCache
+
+from flask_app.routes import MAX_SEARCH_FEEDS, _save_feed_state
+from flask_app.utils.seen_set import SeenSet
+from flask_app.utils.server_session import SESSION_ID_PATTERN, ServerSessionInterface
+
+
+@pytest.fixture
+def store():
+    return SimpleCache()
+
+
+@pytest.fixture
+def app(store):
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    app.session_interface = ServerSessionInterface(store, ttl=60)
+
+    @app.route('/set/<value>')
+    def set_value(value):
+        session['value'] = value
+        return 'ok'
+
+    @app.route('/get')
+    def get_value():
+        return session.get('value', '')
+
+    @app.route('/search/<query>')
+    def search(query):
+        _save_feed_state(f'search:{query}', 'next', SeenSet(10))
+        return 'ok'
+
+    @app.route('/feeds')
+    def feeds():
+        return ','.join(session.get('feeds', {}))
+
+    @app.route('/logout')
+    def logout():
+        session.clear()
+        return 'ok'
+
+    return app
+
+
+def session_cookie(response):
+    cookies = [header for header in response.headers.getlist('Set-Cookie') if header.startswith('session=')]
+    assert len(cookies) == 1
+    return cookies[0].split(';')[0][len('session='):]
+
+
+def test_session_round_trips_through_the_store(app, store):
+    client = app.test_client()
+    sid = session_cookie(client.get('/set/hello'))
+
+    assert store.get(f'session:{sid}') == {'value': 'hello'}
+    assert client.get('/get').get_data(as_text=True) == 'hello'
+
+
+def test_cookie_carries_only_the_session_id(app):
+    client = app.test_client()
+    sid = session_cookie(client.get('/set/' + 'x' * 2000))
+
+    assert SESSION_ID_PATTERN.match(sid)
+    # Unchanged sessions are not re-sent
+    assert 'Set-Cookie' not in client.get('/get').headers
+
+
+def test_unknown_session_id_starts_a_new_session(app):
+    client = app.test_client()
+    client.set_cookie('session', 'A' * 32)
+    assert client.get('/get').get_data(as_text=True) == ''
+    assert session_cookie(client.get('/set/hello')) != 'A' * 32
+
+
+def test_only_the_latest_searches_are_kept(app):
+    client = app.test_client()
+    client.get('/set/keep')
+    for number in range(MAX_SEARCH_FEEDS + 2):
+        client.get(f'/search/q{number}')
+    # Searching again moves a query to the end
+    client.get('/search/q2')
+
+    feeds = client.get('/feeds').get_data(as_text=True).split(',')
+    assert feeds == ['search:q3', 'search:q4', 'search:q5', 'search:q6', 'search:q2']
+    assert client.get('/get').get_data(as_text=True) == 'keep'
+
+
+def test_session_expires_after_ttl(app, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cachelib.simple, 'time', lambda: now[0])
+    client = app.test_client()
+    client.get('/set/hello')
+
+    now[0] += 59
+    assert client.get('/get').get_data(as_text=True) == 'hello'
+    now[0] += 2
+    assert client.get('/get').get_data(as_text=True) == ''
+
+
+def test_emptied_session_is_deleted(app, store):
+    client = app.test_client()
+    sid = session_cookie(client.get('/set/hello'))
+    response = client.get('/logout')
+    assert store.get(f'session:{sid}') is None
+    assert session_cookie(response) == ''
@@ -0,0 +1,112 @@
+import hashlib
+import os
+import threading
+import time
+
+from flask_app.utils.single_flight import SingleFlight, _FileLock
+
+
+def lock_path(lock_dir, key):
+    return os.path.join(lock_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.lock')
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'articles'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do('feed', fetch))) for _ in range(5)]
+    threads[0].start()
+    assert started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.1)  # let the other callers reach the in-flight call
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results == ['articles'] * 5
+
+
+def test_error_reaches_every_waiter():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fetch():
+        started.set()
+        release.wait(5)
+        raise RuntimeError('upstream down')
+
+    errors = []
+
+    def call():
+        try:
+            flight.do('feed', fetch)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    threads[0].start()
+    assert started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert errors == ['upstream down'] * 3
+    # A failed call is not remembered
+    assert flight.do('feed', lambda: 'ok') == 'ok'
+
+
+def test_caller_behind_another_process_uses_recheck(tmp_path):
+    flight = SingleFlight(lock_dir=str(tmp_path), lock_timeout=5)
+    shared_cache = {}
+    calls = []
+
+    # Another worker holds the lock while it fetches and fills the cache
+    other_worker = _FileLock(lock_path(str(tmp_path), 'feed'), timeout=0)
+    other_worker.__enter__()
+
+    results = []
+    thread = threading.Thread(target=lambda: results.append(
+        flight.do('feed', lambda: calls.append(1) or 'fetched again', recheck=lambda: shared_cache.get('feed'))
+    ))
+    thread.start()
+    time.sleep(0.2)
+    assert results == []  # still waiting on the lock
+
+    shared_cache['feed'] = 'cached'
+    other_worker.__exit__(None, None, None)
+    thread.join(5)
+
+    assert results == ['cached']
+    assert calls == []
+
+
+def test_recheck_miss_runs_fn(tmp_path):
+    flight = SingleFlight(lock_dir=str(tmp_path))
+    assert flight.do('feed', lambda: 'fetched', recheck=lambda: None) == 'fetched'
+
+
+def test_lock_timeout_runs_fn_anyway(tmp_path):
+    flight = SingleFlight(lock_dir=str(tmp_path), lock_timeout=0.2)
+    held = _FileLock(lock_path(str(tmp_path), 'feed'), timeout=0)
+    held.__enter__()
+    try:
+        start = time.monotonic()
+        assert flight.do('feed', lambda: 'fetched') == 'fetched'
+        assert 0.2 <= time.monotonic() - start < 2
+    finally:
+        held.__exit__(None, None, None)
@@ -0,0 +1,73 @@
+import time
+
+import pytest
+
+from flask_app.utils.sqlite_cache import SQLiteCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() so expiry can be tested without sleeping."""
+    now = [time.time()]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+    return now
+
+
+def make_cache(tmp_path, **kwargs):
+    return SQLiteCache(str(tmp_path / 'cache.sqlite3'), **kwargs)
+
+
+def test_set_get_and_expiry(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    cache.set('a', {'x': 1}, timeout=60)
+    cache.set('b', 1, timeout=10)
+    assert cache.get('a') == {'x': 1}
+    clock[0] += 11
+    assert cache.get('b') is None
+    assert not cache.has('b')
+    assert cache.get('a') == {'x': 1}
+
+
+def test_add_only_when_missing_or_expired(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    assert cache.add('flag', True, timeout=10)
+    assert not cache.add('flag', True, timeout=60)
+    clock[0] += 11
+    assert cache.add('flag', True, timeout=60)
+
+
+def test_inc_keeps_expiry_of_live_key(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    cache.add('counter', 1, timeout=10)
+    assert cache.inc('counter') == 2
+    assert cache.get('counter') == 2
+    clock[0] += 11
+    assert cache.get('counter') is None
+
+
+def test_inc_after_expiry_starts_over_with_default_timeout(tmp_path, clock):
+    cache = make_cache(tmp_path, default_timeout=60)
+    cache.set('counter', 5, timeout=10)
+    clock[0] += 11
+    # The expired value is ignored and the new one is visible
+    assert cache.inc('counter') == 1
+    assert cache.get('counter') == 1
+    assert cache.inc('counter') == 2
+    clock[0] += 61
+    assert cache.get('counter') is None
+
+
+def test_inc_missing_key(tmp_path):
+    cache = make_cache(tmp_path)
+    assert cache.inc('new', 3) == 3
+    assert cache.dec('new') == 2
+    assert cache.get('new') == 2
+
+
+def test_prune_over_threshold(tmp_path):
+    cache = make_cache(tmp_path, threshold=5)
+    for i in range(10):
+        cache.set(f'k{i}', i, timeout=100 + i)
+    count = cache._connection().execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+    assert count <= 5
+    assert cache.get('k9') == 9
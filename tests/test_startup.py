@@ -0,0 +1,17 @@
+import os
+import statistics
+
+from benchmarks.startup_benchmark import run_once
+
+# CI runners are slower and noisier than a developer machine, so the budgets
+# are looser than the benchmark's defaults unless set explicitly
+IMPORT_BUDGET = float(os.getenv('STARTUP_IMPORT_BUDGET', 3.0))
+APP_BUDGET = float(os.getenv('STARTUP_APP_BUDGET', 5.0))
+
+
+def test_startup_is_fast_and_imports_no_heavy_modules():
+    results = [run_once() for _ in range(3)]
+    heavy = sorted({name for result in results for name in result['heavy']})
+    assert heavy == []
+    assert statistics.median(result['import'] for result in results) <= IMPORT_BUDGET
+    assert statistics.median(result['import'] + result['create_app'] for result in results) <= APP_BUDGET
@@ -0,0 +1,64 @@
+from flask_app.summarization import MapReduceSummarizer
+
+
+class StubSummarizer:
+    """Summarization pipeline stand-in that keeps the first three words of each input."""
+
+    tokenizer = None
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, max_length, min_length, do_sample):
+        self.calls.append(list(texts))
+        return [{'summary_text': ' '.join(text.split()[:3])} for text in texts]
+
+
+def sentences(count, words=10):
+    return ' '.join(f"Sentence {i} " + ' '.join(['word'] * (words - 3)) + '.' for i in range(count))
+
+
+def test_short_texts_bypass_the_model():
+    summarizer = MapReduceSummarizer(bypass_tokens=50, chunk_tokens=100)
+    model = StubSummarizer()
+    result = summarizer.summarize(model, ["Short   text ... [+1234 chars]"], [30], batch_size=4)
+    assert result == ["Short text ..."]
+    assert model.calls == []
+    assert summarizer.stats()['bypassed'] == 1
+
+
+def test_split_packs_sentences_up_to_the_chunk_limit():
+    summarizer = MapReduceSummarizer(bypass_tokens=10, chunk_tokens=30)
+    chunks = summarizer.split(sentences(6))
+    assert len(chunks) > 1
+    assert all(summarizer.count_tokens([chunk])[0] <= 30 for chunk in chunks)
+    assert ' '.join(chunks) == sentences(6)
+
+
+def test_oversized_sentence_is_cut_between_words():
+    summarizer = MapReduceSummarizer(bypass_tokens=10, chunk_tokens=20)
+    chunks = summarizer.split(' '.join(['word'] * 100) + '.')
+    assert len(chunks) > 1
+    assert sum(len(chunk.split()) for chunk in chunks) == 100
+
+
+def test_long_texts_are_mapped_in_one_batch_and_reduced():
+    summarizer = MapReduceSummarizer(bypass_tokens=10, chunk_tokens=30)
+    model = StubSummarizer()
+    texts = [sentences(6), sentences(6)]
+    results = summarizer.summarize(model, texts, [5, 5], batch_size=32)
+    # Map: the chunks of both texts share a call; reduce: a second pass over the joined partials
+    assert len(model.calls) == 2
+    assert len(model.calls[0]) > 2
+    assert results == ["Sentence 0 word", "Sentence 0 word"]
+    stats = summarizer.stats()
+    assert stats['texts'] == 2 and stats['bypassed'] == 0
+
+
+def test_model_failure_falls_back_to_truncation():
+    def broken(*args, **kwargs):
+        raise RuntimeError("model crashed")
+
+    summarizer = MapReduceSummarizer(bypass_tokens=5, chunk_tokens=500)
+    text = sentences(3)
+    assert summarizer.summarize(broken, [text], [20], batch_size=4) == [text[:20] + "..."]